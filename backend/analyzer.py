@@ -1,22 +1,24 @@
 import os
 import sys
-import json
 import warnings
 import re
 import threading
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 import pandas as pd
-import pandas_ta as ta
 import requests
-import feedparser
 from dotenv import load_dotenv
-from google import genai
+from core.cache import TTLCache
 from core.fetcher import MarketDataFetcher
 from core.indicators import (
     calculate_vwap, calculate_volume_profile, detect_divergences, 
     detect_smc_structure, detect_liquidity_sweep
 )
+from core.llm import GeminiBackend, LLMBudgetExceeded, LLMGateway, StubBackend
+from core.metrics import COMPUTE_TIME, EXCHANGE_LATENCY, timed
+from core.repository import SnapshotRepository
 
 # 경고 무시 및 인코딩 설정
 warnings.filterwarnings("ignore")
@@ -29,42 +31,73 @@ if sys.platform == "win32":
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-client = genai.Client(api_key=GEMINI_API_KEY)
+
+# LLM 호출 창구 (QUANT_LLM_STUB=1이면 로컬 스텁, 예산은 QUANT_LLM_QPS / QUANT_LLM_TPM, 0이면 무제한)
+# 저장된 응답은 QUANT_LLM_RESULT_TTL초(기본 7일) 뒤 만료
+# Gemini 클라이언트, ccxt 거래소, pandas_ta, feedparser는 첫 사용 시 로딩 (warm_up()으로 미리 로딩 가능)
+llm = LLMGateway(
+    StubBackend() if os.getenv("QUANT_LLM_STUB") == "1" else GeminiBackend(api_key=GEMINI_API_KEY),
+    qps=float(os.getenv("QUANT_LLM_QPS", "1")),
+    tokens_per_minute=int(os.getenv("QUANT_LLM_TPM", "250000")),
+    result_ttl=float(os.getenv("QUANT_LLM_RESULT_TTL", str(7 * 86400))),
+)
 
 SYMBOL = 'BTC/USDT'
+# 분석 대상 심볼 목록 (쉼표 구분, 기본 심볼은 항상 포함)
+SYMBOLS = list(dict.fromkeys([SYMBOL] + [s.strip().upper() for s in os.getenv("QUANT_SYMBOLS", "").split(",") if s.strip()]))
+SCAN_WORKERS = int(os.getenv("QUANT_SCAN_WORKERS", "16"))
 TIMEFRAMES = ['1h', '4h', '1d']
+BRIEF_LANGS = ['ko', 'en']
 LIMIT = 500
 
-# 글로벌 락 및 인 메모리 캐시 (동시 요청 방지)
-_locks = {
-    "news": threading.Lock(),
-    "brief": threading.Lock(),
-    "strategy": threading.Lock()
-}
-_mem_cache = {}
-
-def get_from_mem(key):
-    val = _mem_cache.get(key)
-    if val and val['expiry'] > datetime.now():
-        return val['data']
-    return None
-
-def set_to_mem(key, data, minutes=5):
-    _mem_cache[key] = {
-        "data": data,
-        "expiry": datetime.now() + timedelta(minutes=minutes)
-    }
+# 심볼·언어별 전략 생성 락 (중복 AI 호출 방지)
+_strategy_locks = {}
+
+# 캐시 (동시 미스는 한 번만 로딩, 만료 직후에는 이전 값을 반환하며 백그라운드 갱신)
+news_cache = TTLCache("news", ttl=3600, stale_ttl=3600, maxsize=8, persist=True)
+brief_cache = TTLCache("brief", ttl=3600, stale_ttl=3600, maxsize=8, persist=True)
+_scan_cache = TTLCache("scan", ttl=60, stale_ttl=60, maxsize=512)
+# 전체 심볼 스캔 결과 (스케줄러가 주기적으로 갱신, 요청 경로에서는 읽기만)
+scan_result_cache = TTLCache("market_scan", ttl=300, stale_ttl=3600, maxsize=1)
+sentiment_cache = TTLCache("sentiment", ttl=60, stale_ttl=240, maxsize=32)
+# 언어 무관 시장 스냅샷: 같은 갱신 주기의 모든 언어 리포트가 공유
+snapshot_cache = TTLCache("snapshot", ttl=300, maxsize=32)
 
 fetcher = MarketDataFetcher(SYMBOL)
+_fetchers = {SYMBOL: fetcher}
+
+def get_fetcher(symbol=SYMBOL):
+    """심볼별 Fetcher (거래소 객체는 공유)"""
+    f = _fetchers.get(symbol)
+    if f is None:
+        f = _fetchers.setdefault(symbol, MarketDataFetcher(symbol, exchange=fetcher.exchange))
+    return f
+
+def _strategy_lock(symbol, lang):
+    return _strategy_locks.setdefault((symbol, lang), threading.Lock())
+
+# 데이터 수집/분석 병렬 실행용 워커 풀 (거래소·뉴스 요청은 I/O 대기, 분석은 pandas/NumPy 연산)
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="analysis")
 
-def fetch_data(tf):
+def warm_up():
+    """첫 요청 전에 무거운 모듈 import와 클라이언트 생성을 끝내 둠 (서버 기동 후 백그라운드에서 호출)"""
+    import feedparser  # noqa: F401
+    import pandas_ta  # noqa: F401
+    fetcher.exchange
+    if isinstance(llm.backend, GeminiBackend):
+        llm.backend.client
+
+def fetch_data(tf, symbol=SYMBOL):
     """OHLCV 데이터 수집 (Core Fetcher 사용)"""
-    return fetcher.fetch_ohlcv(tf, LIMIT)
+    return get_fetcher(symbol).fetch_ohlcv(tf, LIMIT)
 
+@timed(COMPUTE_TIME, "analyze_data_advanced")
 def analyze_data_advanced(df):
     """고급 기술 분석 (Core Indicators 사용)"""
     if df.empty: return {}
     
+    import pandas_ta as ta
+
     df = df.copy()
     # 기본 지표 계산 (core에서 공통으로 쓰지 않는 파생 지표들)
     try:
@@ -106,13 +139,14 @@ def analyze_data_advanced(df):
         'lq_sweep': lq_sweep,
     }
 
-def fetch_market_info():
+def fetch_market_info(symbol=SYMBOL):
     """시장 컨텍스트 수집 (Core Fetcher 사용)"""
-    return fetcher.fetch_market_context()
+    return get_fetcher(symbol).fetch_market_context()
 
-def fetch_long_short_ratio():
+@timed(EXCHANGE_LATENCY, "long_short_ratio")
+def fetch_long_short_ratio(symbol=SYMBOL):
     """바이낸스 선물 롱/숏 비율 데이터 수집"""
-    symbol = SYMBOL.replace('/', '')
+    symbol = symbol.replace('/', '')
     periods = ['5m', '15m', '1h']
     endpoints = [
         "https://fapi.binance.com/futures/data/globalLongShortAccountRatio",
@@ -135,100 +169,87 @@ def fetch_long_short_ratio():
             except: continue
     return {"long": 51.4, "short": 48.6}
 
-def fetch_crypto_news(lang='ko', translate=True):
-    """실시간 뉴스 수집 (중복 요청 방지 및 최적화)"""
-    now = datetime.now()
-    cache_key = f"news_{lang}_{translate}"
-    
-    # 1. 인 메모리 캐시 확인
-    m_cache = get_from_mem(cache_key)
-    if m_cache: return m_cache
+def get_long_short_ratio(symbol=SYMBOL):
+    """롱/숏 비율 (1분 캐시)"""
+    return sentiment_cache.get_or_load(symbol, lambda: fetch_long_short_ratio(symbol))
 
-    # 2. 파일 캐시 확인
-    cache_file = f"news_cache_{lang}_{translate}.json"
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                c = json.load(f)
-                if datetime.fromisoformat(c['expiry']) > now:
-                    return c['data']
-        except: pass
-
-    # 3. 데이터 갱신 (락 사용)
-    with _locks["news"]:
-        # 락 대기 중 다른 스레드가 먼저 갱신했을 수 있으므로 다시 확인
-        m_cache = get_from_mem(cache_key)
-        if m_cache: return m_cache
-        
+def _translate_prompt(raw_news):
+    return f"Translate and summarize these 5 Bitcoin news titles into concise Korean (one line per news):\n{chr(10).join(raw_news)}"
+
+def _parse_translation(text, raw_news):
+    translated = [line.strip().replace('*','').replace('-','').strip() for line in text.strip().split('\n') if line.strip()]
+    return translated[:5] if len(translated) >= 3 else raw_news
+
+def _load_news(lang, translate):
+    if lang == 'ko' and translate:
+        # 원문은 영문 뉴스 캐시를 재사용하고 번역만 수행 (같은 헤드라인은 저장된 번역 사용)
+        raw_news = fetch_crypto_news(lang='en', translate=False)
+        if not raw_news: raise ValueError("No news")
         try:
-            feed = feedparser.parse("https://www.coindesk.com/arc/outboundfeeds/rss/")
-            raw_news = [e.title for e in feed.entries[:5]]
-            if not raw_news: raise ValueError("No news")
-            
-            final_news = raw_news
-            if lang == 'ko' and translate:
-                try:
-                    res = client.models.generate_content(
-                        model='gemini-flash-latest', 
-                        contents=f"Translate and summarize these 5 Bitcoin news titles into concise Korean (one line per news):\n{chr(10).join(raw_news)}"
-                    )
-                    translated = [line.strip().replace('*','').replace('-','').strip() for line in res.text.strip().split('\n') if line.strip()]
-                    final_news = translated[:5] if len(translated) >= 3 else raw_news
-                except Exception as e:
-                    print(f"[DEBUG] News Translation Fail: {e}")
-                    final_news = raw_news # 폴백
-            
-            # 결과 저장
-            set_to_mem(cache_key, final_news, minutes=60)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump({"data": final_news, "expiry": (now + timedelta(hours=1)).isoformat()}, f, ensure_ascii=False)
-            return final_news
+            return _parse_translation(llm.generate(_translate_prompt(raw_news)), raw_news)
         except Exception as e:
-            print(f"[ERROR] News fetch failed: {e}")
-            return []
+            print(f"[DEBUG] News Translation Fail: {e}")
+            return raw_news # 폴백
+
+    import feedparser
+
+    with EXCHANGE_LATENCY.time("news_rss"):
+        feed = feedparser.parse("https://www.coindesk.com/arc/outboundfeeds/rss/")
+    raw_news = [e.title for e in feed.entries[:5]]
+    if not raw_news: raise ValueError("No news")
+    return raw_news
+
+def fetch_crypto_news(lang='ko', translate=True):
+    """실시간 뉴스 수집 (1시간 캐시, 파일 저장)"""
+    key = f"{lang}_{translate}"
+    try:
+        return news_cache.get_or_load(key, lambda: _load_news(lang, translate))
+    except Exception as e:
+        print(f"[ERROR] News fetch failed: {e}")
+        return news_cache.peek(key, [])
+
+def refresh_crypto_news(lang='ko', translate=True):
+    """뉴스 캐시 선갱신 (스케줄러용, 실패 시 예외)"""
+    return news_cache.refresh(f"{lang}_{translate}", lambda: _load_news(lang, translate))
+
+def _brief_prompt(lang):
+    # 번역되지 않은 영문 뉴스를 사용하여 AI 처리 비용 절감
+    news = fetch_crypto_news(lang='en', translate=False)
+    sentiment = get_long_short_ratio()
+    events = get_economic_events(lang=lang)
+    return (
+        f"Write a 3-line Bitcoin briefing in {'Korean' if lang=='ko' else 'English'}. "
+        f"Input News: {news}. Sentiment: L {sentiment['long']}% vs S {sentiment['short']}%. Events: {events}. "
+        "Keep it under 40 chars per line, plain text only."
+    )
+
+def _parse_brief(text, lang):
+    result = [b.replace('*','').replace('-','').strip() for b in text.strip().split('\n') if b.strip()][:3]
+    if not result: result = ["시장 분석 데이터를 불러올 수 없습니다."] if lang=='ko' else ["Could not load briefing."]
+    return result
+
+def _load_brief(lang):
+    return _parse_brief(llm.generate(_brief_prompt(lang)), lang)
 
 def fetch_ai_daily_brief(lang='ko'):
-    """AI 뉴스 요약 (중복 요청 방지 및 최적화)"""
-    now = datetime.now()
-    cache_key = f"brief_{lang}"
-    m_cache = get_from_mem(cache_key)
-    if m_cache: return m_cache
-
-    cache_file = f"brief_cache_{lang}.json"
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                c = json.load(f)
-                if datetime.fromisoformat(c['expiry']) > now: return c['data']
-        except: pass
-
-    with _locks["brief"]:
-        m_cache = get_from_mem(cache_key)
-        if m_cache: return m_cache
-
-        # 번역되지 않은 영문 뉴스를 사용하여 AI 처리 비용 절감
-        news = fetch_crypto_news(lang='en', translate=False)
-        sentiment = fetch_long_short_ratio()
-        events = get_economic_events(lang=lang)
-        
-        prompt = (
-            f"Write a 3-line Bitcoin briefing in {'Korean' if lang=='ko' else 'English'}. "
-            f"Input News: {news}. Sentiment: L {sentiment['long']}% vs S {sentiment['short']}%. Events: {events}. "
-            "Keep it under 40 chars per line, plain text only."
-        )
+    """AI 뉴스 요약 (1시간 캐시, 파일 저장)"""
+    try:
+        return brief_cache.get_or_load(lang, lambda: _load_brief(lang))
+    except Exception as e:
+        print(f"[ERROR] Briefing failed: {e}")
+        return brief_cache.peek(lang, [])
 
-        try:
-            res = client.models.generate_content(model='gemini-flash-latest', contents=prompt)
-            result = [b.replace('*','').replace('-','').strip() for b in res.text.strip().split('\n') if b.strip()][:3]
-            if not result: result = ["시장 분석 데이터를 불러올 수 없습니다."] if lang=='ko' else ["Could not load briefing."]
-            
-            set_to_mem(cache_key, result, minutes=60)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump({"data": result, "expiry": (now + timedelta(hours=1)).isoformat()}, f, ensure_ascii=False)
-            return result
-        except Exception as e:
-            print(f"[ERROR] Briefing failed: {e}")
-            return []
+def refresh_ai_digest(langs=BRIEF_LANGS):
+    """한국어 뉴스 번역 + 언어별 브리핑을 한 번의 묶음 LLM 호출로 선갱신 (스케줄러용, 실패 시 예외)"""
+    raw_news = fetch_crypto_news(lang='en', translate=False)
+    if not raw_news: raise ValueError("No news")
+    tasks = {"news_ko": _translate_prompt(raw_news)}
+    tasks.update({f"brief_{lang}": _brief_prompt(lang) for lang in langs})
+    out = llm.generate_batch(tasks)
+    news_cache.set("ko_True", _parse_translation(out["news_ko"], raw_news))
+    for lang in langs:
+        brief_cache.set(lang, _parse_brief(out[f"brief_{lang}"], lang))
+    return out
 
 def get_economic_events(lang='ko'):
     """경제 일정 (하드코딩된 데이터 기반)"""
@@ -248,44 +269,150 @@ def get_economic_events(lang='ko'):
         res.append({"title": ev[lang] if lang in ev else ev['en'], "d_day": dday, "impact": ev['impact'], "date": ev['date']})
     return sorted(res, key=lambda x: x['date'])[:4]
 
-def get_ai_strategy(lang='ko'):
-    """종합 전략 리포트 (중복 요청 방지 및 최적화)"""
-    # Strategy는 main.py에서 DB 캐싱을 수행하므로 여기서는 중복 AI 호출 방지만 집중
-    with _locks["strategy"]:
-        fr, oi = fetch_market_info()
-        news = fetch_crypto_news(lang='en', translate=False) # 영문 원본 사용 (토큰 절약 및 속도)
-        events = get_economic_events(lang=lang)
-        
-        news_str = "\n".join([f"- {n}" for n in news])
-        event_str = "\n".join([f"- {e['title']} ({e['d_day']})" for e in events])
-
-        prompt = f"""
-        Act as QuantAI, a Bitcoin Expert Trader. Write a report in {'Korean' if lang=='ko' else 'English'}.
-        Data: Funding {fr:.4f}%, OI {oi:,}
-        News: {news_str}
-        Events: {event_str}
-        """
-
-        # OHLCV 데이터 추가
-        latest_price = 0.0
-        for tf in TIMEFRAMES:
-            df = fetch_data(tf)
-            if df.empty: continue
-            res = analyze_data_advanced(df)
-            latest_price = res['close']
-            prompt += f"\n[{tf}] Price:{res['close']} RSI:{res['rsi']:.1f} SMC:{res['smc']}"
-
-        prompt += f"""
-        \nFormat: 1.Summary(3 lines) 2.Strategy[LONG/SHORT/NEUTRAL] 3.Guide(Entry/TP/SL) 4.Rationale
-        End with: SIGNAL_JSON: ```json {{"side": "LONG/SHORT/NONE", "entry": 0.0, "tp": 0.0, "sl": 0.0}} ```
-        """
+def _timed(timings, name, fn, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+def _fetch_and_analyze(tf, timings, symbol=SYMBOL):
+    df = _timed(timings, f"fetch_{tf}", fetch_data, tf, symbol)
+    if df.empty: return {}
+    return _timed(timings, f"analyze_{tf}", analyze_data_advanced, df)
+
+def _build_snapshot(symbol):
+    """언어와 무관한 시장 스냅샷 생성: 펀딩/OI, 롱/숏 비율, 영문 뉴스, 타임프레임별 지표·SMC를 동시 수집 후 저장"""
+    timings = {}
+    start = time.perf_counter()
+    market_f = _pool.submit(_timed, timings, "market_info", fetch_market_info, symbol)
+    ls_f = _pool.submit(_timed, timings, "long_short", get_long_short_ratio, symbol)
+    news_f = _pool.submit(_timed, timings, "news", fetch_crypto_news, lang='en', translate=False)
+    tf_fs = {tf: _pool.submit(_fetch_and_analyze, tf, timings, symbol) for tf in TIMEFRAMES}
+
+    fr, oi = market_f.result()
+    analyses = {tf: f.result() for tf, f in tf_fs.items()}
+    latest_price = 0.0
+    for tf in TIMEFRAMES:
+        if analyses[tf]: latest_price = analyses[tf]['close']
+    timings["gather"] = round((time.perf_counter() - start) * 1000, 1)
+
+    snapshot = {
+        "symbol": symbol, "created_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "price": latest_price,
+        "funding_rate": fr, "open_interest": oi, "long_short": ls_f.result(), "news": news_f.result(),
+        "analyses": analyses, "timings": timings,
+    }
+    try:
+        snapshot["id"] = SnapshotRepository.add_snapshot(symbol, snapshot["created_at"], snapshot)
+    except Exception as e:
+        print(f"[Error] 스냅샷 저장 실패 ({symbol}): {e}")
+        snapshot["id"] = None
+    return snapshot
+
+def get_market_snapshot(symbol=SYMBOL):
+    """시장 스냅샷 (5분 캐시, 동시 요청은 한 번만 생성)"""
+    return snapshot_cache.get_or_load(symbol, lambda: _build_snapshot(symbol))
+
+def _scan_one(symbol, tf):
+    return _scan_cache.get_or_load((symbol, tf), lambda: _fetch_and_analyze(tf, {}, symbol))
+
+def scan_symbols(symbols=None, timeframes=None, max_workers=SCAN_WORKERS):
+    """여러 심볼 일괄 분석: (심볼, 타임프레임) 단위 작업을 제한된 워커 풀에서 수집+분석 (심볼·타임프레임별 1분 캐시)
+
+    바이낸스 klines는 요청당 한 심볼만 받으므로 여러 심볼을 한 요청으로 묶을 수 없다. 대신 로컬 캔들 저장소 덕분에
+    각 요청은 마지막 저장봉 이후만 받는 증분 요청(보통 1~2개 봉)이고, 거래소 객체(속도 제한)는 심볼 간에 공유한다.
+    """
+    symbols, timeframes = symbols or SYMBOLS, timeframes or TIMEFRAMES
+    start = time.perf_counter()
+    results = {s: {} for s in symbols}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan") as pool:
+        futures = {pool.submit(_scan_one, s, tf): (s, tf) for s in symbols for tf in timeframes}
+        for f, (s, tf) in futures.items():
+            try:
+                results[s][tf] = f.result()
+            except Exception as e:
+                print(f"[ERROR] Scan failed ({s} {tf}): {e}")
+                results[s][tf] = {}
+    return {"results": results, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+def refresh_market_scan():
+    """등록된 전체 심볼 스캔 후 저장 (스케줄러에서 실행)"""
+    scan = scan_symbols()
+    scan["scanned_at"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    scan_result_cache.set("all", scan)
+    return scan
+
+def _strategy_request(lang, symbol):
+    """스냅샷 기반 전략 프롬프트와 응답 공통 필드"""
+    snapshot = get_market_snapshot(symbol)
+    fr, oi, news = snapshot["funding_rate"], snapshot["open_interest"], snapshot["news"]
+    events = get_economic_events(lang=lang)
+    
+    news_str = "\n".join([f"- {n}" for n in news])
+    event_str = "\n".join([f"- {e['title']} ({e['d_day']})" for e in events])
+
+    prompt = f"""
+    Act as QuantAI, a {symbol.split('/')[0]} Expert Trader. Write a report in {'Korean' if lang=='ko' else 'English'}.
+    Data: Funding {fr:.4f}%, OI {oi:,}
+    News: {news_str}
+    Events: {event_str}
+    """
+
+    # OHLCV 데이터 추가
+    for tf in TIMEFRAMES:
+        res = snapshot["analyses"][tf]
+        if not res: continue
+        prompt += f"\n[{tf}] Price:{res['close']} RSI:{res['rsi']:.1f} SMC:{res['smc']}"
+
+    prompt += f"""
+    \nFormat: 1.Summary(3 lines) 2.Strategy[LONG/SHORT/NEUTRAL] 3.Guide(Entry/TP/SL) 4.Rationale
+    End with: SIGNAL_JSON: ```json {{"side": "LONG/SHORT/NONE", "entry": 0.0, "tp": 0.0, "sl": 0.0}} ```
+    """
+
+    base = {
+        "price": snapshot["price"], "funding_rate": fr, "open_interest": oi, "news": news, "events": events,
+        "timings": dict(snapshot["timings"]), "symbol": symbol, "snapshot_id": snapshot["id"],
+    }
+    return prompt, base
+
+def _strategy_result(base, text=None, error=None):
+    generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if error is None:
+        return dict(base, strategy=text, generated_at=generated_at)
+    msg = "할당량 초과" if isinstance(error, LLMBudgetExceeded) or "429" in str(error) else f"Error: {error}"
+    return dict(base, strategy=msg, generated_at=generated_at, news=[], events=[], error=True)
+
+def get_ai_strategy(lang='ko', symbol=SYMBOL):
+    """종합 전략 리포트 (공유 스냅샷 + 언어별 LLM 생성)"""
+    # Strategy는 main.py에서 DB 캐싱을 수행하므로 여기서는 심볼·언어별 중복 AI 호출 방지만 집중
+    with _strategy_lock(symbol, lang):
+        prompt, base = _strategy_request(lang, symbol)
+        try:
+            text = _timed(base["timings"], "llm", llm.generate, prompt)
+        except Exception as e:
+            return _strategy_result(base, error=e)
+        return _strategy_result(base, text)
+
+def stream_ai_strategy(lang='ko', symbol=SYMBOL, reuse=None):
+    """전략 리포트 스트리밍: 생성되는 텍스트 조각을 yield 하고 마지막에 get_ai_strategy와 같은 결과 dict를 반환
 
+    reuse: 잠금을 얻은 뒤 호출해 저장된 전략(행)을 돌려주면 새로 생성하지 않고 그 행을 전달
+    (기다리는 동안 다른 요청/스케줄러가 이미 생성한 경우)
+    """
+    with _strategy_lock(symbol, lang):
+        row = reuse() if reuse else None
+        if row:
+            yield row['strategy']
+            return row
+        prompt, base = _strategy_request(lang, symbol)
+        start, parts = time.perf_counter(), []
         try:
-            res = client.models.generate_content(model='gemini-flash-latest', contents=prompt)
-            return {
-                "price": latest_price, "strategy": res.text, "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                "funding_rate": fr, "open_interest": oi, "news": news, "events": events
-            }
+            for chunk in llm.generate_stream(prompt):
+                if not parts: base["timings"]["llm_first_chunk"] = round((time.perf_counter() - start) * 1000, 1)
+                parts.append(chunk)
+                yield chunk
         except Exception as e:
-            msg = "할당량 초과" if "429" in str(e) else f"Error: {e}"
-            return {"price": latest_price, "strategy": msg, "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "funding_rate": fr, "open_interest": oi, "news": [], "events": []}
+            return _strategy_result(base, error=e)
+        finally:
+            base["timings"]["llm"] = round((time.perf_counter() - start) * 1000, 1)
+        return _strategy_result(base, "".join(parts))
@@ -0,0 +1,55 @@
+"""백테스트 처리량 벤치마크 (합성 1분봉 수년치 + 신호 수천 개)
+
+    python benchmarks/bench_backtest.py [--years 2] [--signals 5000] [--intrabar worst]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+import pandas as pd
+
+from core.backtest import run_backtest
+
+def synthetic(bars, signals, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 60000 * np.exp(np.cumsum(rng.normal(0, 0.0008, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = close * rng.exponential(0.0005, bars)
+    candles = pd.DataFrame({
+        'open': open_, 'close': close,
+        'high': np.maximum(open_, close) + spread, 'low': np.minimum(open_, close) - spread,
+    }, index=pd.date_range('2024-01-01', periods=bars, freq='1min'))
+
+    idx = np.sort(rng.integers(0, bars, signals))
+    side = rng.choice(['LONG', 'SHORT'], signals)
+    sign = np.where(side == 'LONG', 1, -1)
+    entry = close[idx] * (1 - sign * rng.uniform(0, 0.01, signals))
+    signals = pd.DataFrame({
+        'time': candles.index[idx], 'side': side, 'entry': entry,
+        'tp': entry * (1 + sign * rng.uniform(0.005, 0.03, signals)),
+        'sl': entry * (1 - sign * rng.uniform(0.005, 0.02, signals)),
+    })
+    return candles, signals
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--years', type=float, default=2)
+    parser.add_argument('--signals', type=int, default=5000)
+    parser.add_argument('--intrabar', default='worst')
+    args = parser.parse_args()
+
+    bars = int(args.years * 365 * 24 * 60)
+    candles, signals = synthetic(bars, args.signals)
+    for exclusive in (False, True):
+        started = time.perf_counter()
+        _, stats = run_backtest(candles, signals, intrabar=args.intrabar, exclusive=exclusive)
+        elapsed = time.perf_counter() - started
+        print(f"bars={bars:,} signals={args.signals:,} exclusive={exclusive}: {elapsed:.2f}s")
+        print(f"  {stats}")
+
+if __name__ == "__main__":
+    main()
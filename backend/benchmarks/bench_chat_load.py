@@ -0,0 +1,113 @@
+"""/api/chat/send 부하 테스트 (SSE 구독자 N명 연결 상태에서 전송 지연 p50/p95/p99 측정)
+
+    python benchmarks/bench_chat_load.py [--subscribers 200] [--sends 500] [--concurrency 20]
+
+외부 연결 없이 실행되도록 임시 DB와 빈 시세 재생 파일을 사용하고 선계산 스케줄러를 끄며, 채팅 전송 속도 제한은 해제한다.
+서버는 별도 프로세스로 띄우며 클라이언트에 httpx가 필요하다.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import subprocess
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import httpx
+import uvicorn
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+def serve(workdir, port):
+    """벤치마크 대상 서버 (별도 프로세스에서 실행해 클라이언트와 GIL을 공유하지 않음)"""
+    replay = os.path.join(workdir, 'replay.jsonl')
+    open(replay, 'w').close()
+    os.environ['MARKET_REPLAY_FILE'] = replay
+    os.environ.setdefault('GEMINI_API_KEY', 'bench')
+    os.environ['QUANT_SCHEDULER'] = '0'
+    os.environ['QUANT_RATE_CHAT_SEND'] = '0'  # 속도 제한 해제
+
+    import core.database as database
+    database.DB_NAME = os.path.join(workdir, 'bench.db')
+    import main
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+def start_server(workdir, port):
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', workdir, '--port', str(port)])
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+async def subscriber(client, url, ready, received):
+    async with client.stream("GET", url) as resp:
+        ready.release()
+        async for line in resp.aiter_lines():
+            if line.startswith("data:"):
+                received[0] += 1
+
+async def run_load(base, subscribers, sends, concurrency):
+    limits = httpx.Limits(max_connections=subscribers + concurrency + 10)
+    async with httpx.AsyncClient(base_url=base, timeout=30, limits=limits) as client:
+        ready, received = asyncio.Semaphore(0), [0]
+        subs = [asyncio.create_task(subscriber(client, "/api/chat/stream", ready, received)) for _ in range(subscribers)]
+        for _ in range(subscribers):
+            await ready.acquire()
+
+        latencies, errors = [], 0
+        sem = asyncio.Semaphore(concurrency)
+
+        async def send(i):
+            nonlocal errors
+            async with sem:
+                start = time.perf_counter()
+                resp = await client.post("/api/chat/send", json={"sender": "bench", "text": f"m{i}", "timestamp": "00:00"})
+                latencies.append((time.perf_counter() - start) * 1000)
+                if resp.status_code != 200: errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send(i) for i in range(sends)))
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0.5)
+        for t in subs: t.cancel()
+        await asyncio.gather(*subs, return_exceptions=True)
+        return latencies, errors, elapsed, received[0]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--subscribers', type=int, default=200)
+    parser.add_argument('--sends', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--serve', metavar='WORKDIR', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.serve, args.port)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = start_server(workdir, args.port)
+        try:
+            latencies, errors, elapsed, received = asyncio.run(
+                run_load(f"http://127.0.0.1:{args.port}", args.subscribers, args.sends, args.concurrency)
+            )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    print(f"subscribers={args.subscribers} sends={args.sends} concurrency={args.concurrency} errors={errors}")
+    print(f"throughput={args.sends / elapsed:,.0f} req/s, delivered events={received:,}")
+    print(f"latency ms: p50={statistics.median(latencies):.1f} p95={percentile(latencies, 95):.1f} "
+          f"p99={percentile(latencies, 99):.1f} max={max(latencies):.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""klines 응답 → DataFrame 변환 벤치마크 (기존 튜플 목록 + pandas 변환 vs Candles 배열)
+
+    python benchmarks/bench_klines.py [--bars 500,1500] [--symbols 20] [--repeat 20]
+
+심볼 × 3개 타임프레임(analyzer 1회 실행분)을 거래소 응답 경로와 DB 행 경로로 각각 변환하는 시간을 잰다.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd
+
+from bench_suite import synthetic_klines
+from core.candles import Candles
+
+def legacy_rows(klines):
+    return [(int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]), float(k[9])) for k in klines]
+
+def legacy_frame(rows):
+    # 변경 전 MarketDataFetcher._to_frame
+    cols = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'taker_buy_vol']
+    df = pd.DataFrame(rows, columns=cols)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    df.sort_index(inplace=True)
+    df['taker_sell_vol'] = df['volume'] - df['taker_buy_vol']
+    df['delta'] = df['taker_buy_vol'] - df['taker_sell_vol']
+    return df
+
+PATHS = {
+    'exchange': (lambda k, r: legacy_frame(legacy_rows(k)), lambda k, r: Candles.from_klines(k).to_frame()),
+    'store': (lambda k, r: legacy_frame(r), lambda k, r: Candles.from_rows(r).to_frame()),
+}
+
+def best(fn, inputs, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for klines, rows in inputs:
+            fn(klines, rows)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bars', default='500,1500')
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'path':<10}{'bars':>7}{'before ms':>12}{'after ms':>12}{'speedup':>10}   ({args.symbols} symbols x 3 tf)")
+    for bars in (int(b) for b in args.bars.split(',')):
+        inputs = []
+        for i in range(args.symbols * 3):
+            klines = synthetic_klines(bars, seed=i)
+            inputs.append((klines, legacy_rows(klines)))
+        for path, (before_fn, after_fn) in PATHS.items():
+            pd.testing.assert_frame_equal(before_fn(*inputs[0]), after_fn(*inputs[0]))
+            before, after = best(before_fn, inputs, args.repeat), best(after_fn, inputs, args.repeat)
+            print(f"{path:<10}{bars:>7}{before * 1000:>12.1f}{after * 1000:>12.1f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""속도 제한 메모리 벤치마크 (서로 다른 키 수백만 개 유입 시 기존 dict vs RateLimiter)
+
+    python benchmarks/bench_rate_limiter.py [--keys 2000000] [--arrivals 1000]
+
+가상 시계로 초당 --arrivals개의 새 키(IP)가 들어오는 상황을 재현하고, 구간별 추적 메모리(tracemalloc)와
+보관 중인 키 수를 출력한다. 마지막에 추적 없이 처리량을 잰다.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.rate_limit import MemoryBucketStore, RateLimiter, RateLimitPolicy
+
+class Clock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+class LegacyLimiter:
+    """변경 전 방식: IP별 dict를 지우지 않고, 충전량을 정수로 버림"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.rate_limits = {}
+
+    def check(self, ip):
+        now = self.clock()
+        if ip not in self.rate_limits:
+            self.rate_limits[ip] = {"tokens": 5, "last_update": now}
+        limit = self.rate_limits[ip]
+        limit["tokens"] = min(5, limit["tokens"] + int((now - limit["last_update"]) / 10))
+        limit["last_update"] = now
+        if limit["tokens"] <= 0: return 1
+        limit["tokens"] -= 1
+        return 0
+
+    def size(self):
+        return len(self.rate_limits)
+
+class Current:
+    def __init__(self, clock):
+        self.store = MemoryBucketStore(clock=clock)
+        self.limiter = RateLimiter("chat_send", RateLimitPolicy(5, 10), self.store)
+        self.check = self.limiter.check
+
+    def size(self):
+        return self.store.size()
+
+def ip(i):
+    return f"{(i >> 24) & 255}.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+def run(factory, keys, arrivals, checkpoints=8, trace=True):
+    clock = Clock()
+    limiter = factory(clock)
+    step = max(1, keys // checkpoints)
+    rows = []
+    if trace: tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(keys):
+        clock.now = i / arrivals
+        limiter.check(ip(i))
+        if trace and (i + 1) % step == 0:
+            rows.append((i + 1, limiter.size(), tracemalloc.get_traced_memory()[0] / 1e6))
+    elapsed = time.perf_counter() - started
+    if trace: tracemalloc.stop()
+    return rows, keys / elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keys', type=int, default=2_000_000)
+    parser.add_argument('--arrivals', type=float, default=1000.0, help='초당 새 키 수 (가상 시계)')
+    args = parser.parse_args()
+
+    for name, factory in (("legacy dict", LegacyLimiter), ("RateLimiter", Current)):
+        rows, _ = run(factory, args.keys, args.arrivals)
+        _, throughput = run(factory, args.keys, args.arrivals, trace=False)
+        print(f"{name}: {throughput:,.0f} checks/s")
+        for seen, size, mb in rows:
+            print(f"  keys seen={seen:>10,}  retained={size:>10,}  traced={mb:8.1f} MB")
+
+if __name__ == "__main__":
+    main()
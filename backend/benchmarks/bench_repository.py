@@ -0,0 +1,81 @@
+"""Repository 처리량 마이크로 벤치마크 (연결 매번 생성 vs 스레드별 재사용 + WAL)
+
+    python benchmarks/bench_repository.py [--ops 2000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import core.database as database
+import core.repository as repository
+from core.repository import MessageRepository, StrategyRepository, TradeRepository
+
+@contextmanager
+def legacy_get_db():
+    # 변경 전 방식: 호출마다 새 커넥션, 기본(rollback) 저널
+    conn = sqlite3.connect(database.DB_NAME, timeout=database.DB_TIMEOUT)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+@contextmanager
+def legacy_write_tx():
+    with legacy_get_db() as conn:
+        yield conn
+        conn.commit()
+
+OPERATIONS = {
+    'add_message': lambda i: MessageRepository.add_message('bench', f'msg {i}', '00:00'),
+    'get_recent_messages': lambda i: MessageRepository.get_recent_messages(50),
+    'add_strategy': lambda i: StrategyRepository.add_strategy(1.0, 'text', '2026-01-01 00:00:00', 0.01, 1.0, 'ko'),
+    'get_latest_strategy': lambda i: StrategyRepository.get_latest_strategy('ko'),
+    'upsert_pending_trade': lambda i: TradeRepository.upsert_pending_trade('LONG', 100.0 + i, 110.0, 90.0),
+    'get_stats': lambda i: TradeRepository.get_stats(),
+}
+
+def run(ops):
+    results = {}
+    for name, fn in OPERATIONS.items():
+        start = time.perf_counter()
+        for i in range(ops):
+            fn(i)
+        results[name] = ops / (time.perf_counter() - start)
+    return results
+
+def bench(mode, ops, workdir):
+    database.DB_NAME = os.path.join(workdir, f'{mode}.db')
+    if mode == 'legacy':
+        repository.get_db, repository.write_tx = legacy_get_db, legacy_write_tx
+    else:
+        repository.get_db, repository.write_tx = database.get_db, database.write_tx
+    database.init_db()
+    if mode == 'legacy':
+        database.close_db()
+        with legacy_get_db() as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+    return run(ops)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ops', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        before = bench('legacy', args.ops, workdir)
+        after = bench('pooled', args.ops, workdir)
+        database.close_db()
+
+    print(f"{'operation':<24}{'before ops/s':>14}{'after ops/s':>14}{'speedup':>10}")
+    for name in OPERATIONS:
+        print(f"{name:<24}{before[name]:>14,.0f}{after[name]:>14,.0f}{after[name] / before[name]:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""합성 데이터 기반 오프라인 벤치마크 묶음 (지표 함수 / Repository 처리량 / API 응답 지연)
+
+    python benchmarks/bench_suite.py [--sizes 500,5000,100000,1000000] [--only indicators,repository,api]
+                                     [--output results.json] [--compare 이전결과.json]
+
+시드 고정 랜덤 워크로 OHLCV(+ taker 매수량)를 만들어 같은 입력으로 반복 측정하고, 결과를 JSON으로 저장한다
+(기본: benchmarks/results/bench-<시각>.json). --compare를 주면 이전 결과 대비 변화율을 출력한다.
+API는 프로세스 안에서 ASGI로 호출하며 거래소(ccxt)·Gemini·RSS·외부 HTTP는 가짜 응답으로 바꾸고,
+DB와 캐시 파일은 임시 디렉터리에 둔다. 네트워크 연결이 없어도 실행된다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+os.environ.setdefault('GEMINI_API_KEY', 'bench')
+os.environ['QUANT_LLM_STUB'] = '1'
+os.environ['QUANT_LLM_QPS'] = '1000'
+os.environ['QUANT_SCHEDULER'] = '0'
+os.environ['QUANT_RATE_CHAT_SEND'] = '0'
+
+import numpy as np
+import pandas as pd
+
+import core.database as database
+from core.candles import Candles
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+PRIMARY = {'indicators': ('best_ms', False), 'repository': ('ops_per_s', True), 'api': ('p50_ms', False)}
+
+# ---------------------------------------------------------------- 합성 데이터
+
+def synthetic_klines(n, seed=42, tf_ms=3_600_000, end_ms=None):
+    """바이낸스 선물 klines 응답과 같은 형식(문자열 12필드)의 시드 고정 캔들 n개 (마지막 봉 = end_ms)"""
+    rng = np.random.default_rng(seed)
+    # 변동성 국면이 바뀌는 로그 랜덤 워크 (추세/횡보가 섞여야 다이버전스·OB·FVG가 생김)
+    vol = 0.004 * np.exp(np.cumsum(rng.normal(0, 0.05, n)).clip(-1.5, 1.5))
+    close = 60000 * np.exp(np.cumsum(rng.normal(0, 1, n) * vol))
+    open_ = np.concatenate([[close[0]], close[:-1]]) * (1 + rng.normal(0, 0.0005, n))
+    high = np.maximum(open_, close) * (1 + rng.exponential(vol / 2))
+    low = np.minimum(open_, close) * (1 - rng.exponential(vol / 2))
+    volume = rng.lognormal(4.5, 0.6, n) * (1 + 50 * np.abs(close / open_ - 1))
+    taker_buy = volume * np.clip(0.5 + 20 * (close / open_ - 1) + rng.normal(0, 0.08, n), 0.05, 0.95)
+    end_ms = end_ms if end_ms is not None else int(time.time() * 1000) // tf_ms * tf_ms
+    times = end_ms - (n - 1 - np.arange(n)) * tf_ms
+    return [
+        [int(t), f"{o:.2f}", f"{h:.2f}", f"{l:.2f}", f"{c:.2f}", f"{v:.3f}", int(t + tf_ms - 1),
+         f"{v * c:.2f}", 100, f"{b:.3f}", f"{b * c:.2f}", "0"]
+        for t, o, h, l, c, v, b in zip(times, open_, high, low, close, volume, taker_buy)
+    ]
+
+def synthetic_frame(n, seed=42):
+    """fetch_ohlcv와 같은 컬럼(taker_sell_vol, delta 포함)의 DataFrame"""
+    return Candles.from_klines(synthetic_klines(n, seed)).to_frame()
+
+class FakeExchange:
+    """MarketDataFetcher가 쓰는 ccxt 메서드만 흉내 (startTime/endTime/limit 의미는 바이낸스와 같음)"""
+
+    TIMEFRAMES = {'1m': 60, '5m': 300, '15m': 900, '1h': 3600, '4h': 14400, '1d': 86400}
+
+    def __init__(self, bars=3000):
+        self.bars = bars
+        self._klines = {}
+        self.calls = 0
+
+    def parse_timeframe(self, tf):
+        return self.TIMEFRAMES[tf]
+
+    def fapiPublicGetKlines(self, params):
+        self.calls += 1
+        key = (params['symbol'], params['interval'])
+        if key not in self._klines:
+            rows = synthetic_klines(self.bars, seed=zlib.crc32(':'.join(key).encode()), tf_ms=self.parse_timeframe(key[1]) * 1000)
+            self._klines[key] = (np.array([r[0] for r in rows]), rows)
+        times, rows = self._klines[key]
+        limit = int(params.get('limit', 500))
+        if 'startTime' in params:
+            lo = int(np.searchsorted(times, params['startTime'], side='left'))
+            return rows[lo:lo + limit]
+        hi = int(np.searchsorted(times, params['endTime'], side='right')) if 'endTime' in params else len(rows)
+        return rows[max(0, hi - limit):hi]
+
+    def fetch_funding_rate(self, symbol):
+        return {'fundingRate': 0.0001}
+
+    def fapiPublicGetOpenInterest(self, params):
+        return {'openInterest': '81234.5'}
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+def fake_http_get(url, params=None, timeout=None, **kwargs):
+    if 'alternative.me' in url:
+        return FakeResponse({'data': [{'value': '55', 'value_classification': 'Greed'}]})
+    return FakeResponse([{'longAccount': '0.52', 'shortAccount': '0.48'}])
+
+class FakeFeed:
+    entries = [type('Entry', (), {'title': f"Bitcoin headline {i}"})() for i in range(10)]
+
+# ---------------------------------------------------------------- 측정 도구
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+def time_call(fn, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return {'best_ms': round(min(durations) * 1000, 3), 'mean_ms': round(statistics.mean(durations) * 1000, 3),
+            'runs': repeat}
+
+# ---------------------------------------------------------------- 지표 함수
+
+def bench_indicators(sizes, repeat):
+    import pandas_ta as ta
+
+    import analyzer
+    from core import indicators
+
+    funcs = {
+        'calculate_vwap': indicators.calculate_vwap,
+        'calculate_volume_profile': indicators.calculate_volume_profile,
+        'detect_divergences': indicators.detect_divergences,
+        'detect_smc_structure': indicators.detect_smc_structure,
+        'detect_liquidity_sweep': indicators.detect_liquidity_sweep,
+        'analyze_data_advanced': analyzer.analyze_data_advanced,
+    }
+    results = {}
+    for n in sizes:
+        base = synthetic_frame(n)
+        # analyze_data_advanced 이외 함수는 analyzer가 미리 붙여 두는 cvd/rsi/atr 컬럼을 기대
+        prepared = base.copy()
+        prepared['cvd'] = prepared['delta'].cumsum()
+        prepared['rsi'] = ta.rsi(prepared['close'], length=14)
+        prepared['atr'] = ta.atr(prepared['high'], prepared['low'], prepared['close'], length=14)
+        runs = repeat if n <= 100_000 else 1
+        for name, fn in funcs.items():
+            df = base if name == 'analyze_data_advanced' else prepared
+            fn(df)  # 워밍업 (import/JIT 캐시 등)
+            results[f"indicators/{name}/{n}"] = time_call(lambda: fn(df), runs)
+            print(f"  {name:<26}{n:>9,} bars  {results[f'indicators/{name}/{n}']['best_ms']:>10.2f} ms")
+    return results
+
+# ---------------------------------------------------------------- Repository
+
+def bench_repository(ops):
+    from bench_repository import OPERATIONS
+    from core.repository import CandleRepository
+
+    rows = Candles.from_klines(synthetic_klines(ops)).rows()
+    operations = dict(OPERATIONS)
+    operations['upsert_candles(500)'] = lambda i: CandleRepository.upsert_candles('BENCH/USDT', '1h', rows[i % max(1, len(rows) - 500):][:500])
+    operations['get_candles(500)'] = lambda i: CandleRepository.get_candles('BENCH/USDT', '1h', 500)
+
+    database.init_db()
+    results = {}
+    for name, fn in operations.items():
+        count = ops if '(500)' not in name else max(1, ops // 10)
+        start = time.perf_counter()
+        for i in range(count):
+            fn(i)
+        rate = count / (time.perf_counter() - start)
+        results[f"repository/{name}"] = {'ops_per_s': round(rate, 1), 'ops': count}
+        print(f"  {name:<26}{rate:>12,.0f} ops/s")
+    return results
+
+# ---------------------------------------------------------------- API
+
+API_ENDPOINTS = [
+    '/api/strategy?lang=ko', '/api/trades/stats', '/api/fear_greed', '/api/sentiment',
+    '/api/news?lang=en', '/api/news?lang=ko', '/api/daily_brief?lang=ko', '/api/events',
+    '/api/market/scan', '/api/cache/stats', '/api/scheduler/status', '/api/metrics',
+]
+
+async def _bench_api(requests_per_endpoint, concurrency):
+    import feedparser
+    import httpx
+
+    import analyzer
+    import main
+
+    # 외부 호출 → 가짜 응답 (모든 심볼 Fetcher가 같은 거래소 객체를 공유)
+    exchange = FakeExchange()
+    analyzer.fetcher.exchange = exchange
+    analyzer._fetchers.clear()
+    analyzer._fetchers[analyzer.SYMBOL] = analyzer.fetcher
+    feedparser.parse = lambda url: FakeFeed
+    analyzer.requests.get = fake_http_get
+    main.requests.get = fake_http_get
+
+    # startup 대신 필요한 초기화만 (시세 스트림/스케줄러는 띄우지 않음)
+    database.init_db()
+    for book in main.order_books.values():
+        book.load()
+    results = {}
+    start = time.perf_counter()
+    await main.refresh_strategy('ko', analyzer.SYMBOL)
+    results['api/pipeline/refresh_strategy'] = {'p50_ms': round((time.perf_counter() - start) * 1000, 3), 'count': 1}
+    start = time.perf_counter()
+    await asyncio.to_thread(analyzer.refresh_market_scan)
+    results['api/pipeline/refresh_market_scan'] = {'p50_ms': round((time.perf_counter() - start) * 1000, 3), 'count': 1}
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        for path in API_ENDPOINTS:
+            start = time.perf_counter()
+            first = await client.get(path)
+            cold = time.perf_counter() - start
+            if first.status_code != 200:
+                print(f"[Error] {path}: HTTP {first.status_code}")
+                continue
+            sem = asyncio.Semaphore(concurrency)
+            latencies = []
+
+            async def one():
+                async with sem:
+                    t = time.perf_counter()
+                    await client.get(path)
+                    latencies.append(time.perf_counter() - t)
+
+            await asyncio.gather(*(one() for _ in range(requests_per_endpoint)))
+            ms = [v * 1000 for v in latencies]
+            results[f"api/GET {path}"] = {
+                'cold_ms': round(cold * 1000, 3), 'p50_ms': round(percentile(ms, 50), 3),
+                'p95_ms': round(percentile(ms, 95), 3), 'p99_ms': round(percentile(ms, 99), 3),
+                'mean_ms': round(statistics.mean(ms), 3), 'count': len(ms),
+            }
+            r = results[f"api/GET {path}"]
+            print(f"  {path:<28} cold {r['cold_ms']:>9.2f}  p50 {r['p50_ms']:>7.2f}  p95 {r['p95_ms']:>7.2f}  p99 {r['p99_ms']:>7.2f} ms")
+    return results
+
+def bench_api(requests_per_endpoint, concurrency):
+    return asyncio.run(_bench_api(requests_per_endpoint, concurrency))
+
+# ---------------------------------------------------------------- 결과 저장/비교
+
+def metadata(args):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+        'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+        'numpy': np.__version__, 'pandas': pd.__version__, 'args': vars(args),
+    }
+
+def compare(current, previous):
+    """같은 키끼리 주 지표(지연은 낮을수록, 처리량은 높을수록 좋음) 비교"""
+    print(f"\n{'benchmark':<52}{'before':>12}{'after':>12}{'change':>9}")
+    for key, result in current.items():
+        old = previous.get(key)
+        field, higher_is_better = PRIMARY[key.split('/')[0]]
+        if not old or field not in old or not old[field]:
+            continue
+        change = (result[field] / old[field] - 1) * 100
+        better = change > 0 if higher_is_better else change < 0
+        print(f"{key[:51]:<52}{old[field]:>12,.2f}{result[field]:>12,.2f}{change:>+8.1f}%{' ✓' if better else ''}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='500,5000,100000,1000000', help='지표 측정 봉 수 (쉼표 구분)')
+    parser.add_argument('--repeat', type=int, default=5, help='크기별 반복 횟수 (10만 봉 초과는 1회)')
+    parser.add_argument('--ops', type=int, default=2000, help='Repository 작업별 호출 수')
+    parser.add_argument('--requests', type=int, default=200, help='엔드포인트별 요청 수')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--only', default='indicators,repository,api')
+    parser.add_argument('--output', help='결과 JSON 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+    sections = set(args.only.split(','))
+    # 작업 디렉터리를 임시 디렉터리로 바꾸기 전에 상대 경로를 확정
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"))
+    previous = os.path.abspath(args.compare) if args.compare else None
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # DB와 캐시 파일(persist)을 임시 디렉터리에 둠
+        database.DB_NAME = os.path.join(workdir, 'bench.db')
+        os.chdir(workdir)
+        try:
+            _run_sections(args, sections, results)
+        finally:
+            database.close_db()
+            os.chdir(cwd)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': metadata(args), 'results': results}, f, indent=2, ensure_ascii=False)
+    print(f"\n결과 저장: {output}")
+
+    if previous:
+        with open(previous, encoding='utf-8') as f:
+            compare(results, json.load(f)['results'])
+
+def _run_sections(args, sections, results):
+    if 'indicators' in sections:
+        print("[indicators]")
+        results.update(bench_indicators([int(s) for s in args.sizes.split(',')], args.repeat))
+    if 'repository' in sections:
+        print("[repository]")
+        results.update(bench_repository(args.ops))
+    if 'api' in sections:
+        print("[api]")
+        results.update(bench_api(args.requests, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""지표 파라미터 스윕 벤치마크 (같은 그리드를 순차 실행 vs 프로세스 풀 + 공유 메모리)
+
+    python benchmarks/bench_sweep.py [--bars 4000] [--step 12] [--workers 4]
+
+합성 1시간봉으로 실행하며 상위 설정 5개를 출력한다.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+import pandas as pd
+
+from core.sweep import expand_grid, run_sweep
+
+GRID = {
+    "vp_bins": [30, 50],
+    "va_ratio": [0.6, 0.7],
+    "ob_atr": [1.5, 1.8],
+    "sweep_window": [20, 30],
+    "sl_atr": [1.0, 1.5],
+}
+
+def synthetic(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 60000 + np.cumsum(rng.normal(0, 120, bars))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    volume = rng.exponential(500, bars)
+    return pd.DataFrame({
+        'open': open_, 'close': close,
+        'high': np.maximum(open_, close) + rng.exponential(60, bars),
+        'low': np.minimum(open_, close) - rng.exponential(60, bars),
+        'volume': volume, 'taker_buy_vol': volume * rng.uniform(0.3, 0.7, bars),
+    }, index=pd.date_range('2025-01-01', periods=bars, freq='1h'))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bars', type=int, default=4000)
+    parser.add_argument('--step', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    candles = synthetic(args.bars)
+    print(f"configs={len(expand_grid(GRID))} bars={args.bars:,} step={args.step}")
+    for workers in (1, args.workers):
+        started = time.perf_counter()
+        table = run_sweep(candles, GRID, step=args.step, workers=workers)
+        print(f"workers={workers}: {time.perf_counter() - started:.1f}s")
+    cols = list(GRID) + ['wins', 'losses', 'win_rate', 'total_return_pct', 'max_drawdown_pct']
+    print(table[cols].head(5).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
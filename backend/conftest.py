@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+def _make_candles(n=600, seed=7):
+    """시드 고정 랜덤 워크 1시간봉 (fetch_ohlcv와 같은 컬럼)"""
+    rng = np.random.default_rng(seed)
+    close = 60000 + np.cumsum(rng.normal(0, 80, n))
+    open_ = close + rng.normal(0, 40, n)
+    high = np.maximum(open_, close) + rng.exponential(30, n)
+    low = np.minimum(open_, close) - rng.exponential(30, n)
+    volume = rng.exponential(120, n)
+    df = pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+         'taker_buy_vol': volume * rng.uniform(0.2, 0.8, n)},
+        index=pd.date_range('2026-01-01', periods=n, freq='1h'),
+    )
+    df['taker_sell_vol'] = df['volume'] - df['taker_buy_vol']
+    df['delta'] = df['taker_buy_vol'] - df['taker_sell_vol']
+    return df
+
+@pytest.fixture
+def make_candles():
+    return _make_candles
@@ -0,0 +1,38 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import DB_CALL_TIME, timed
+from .repository import CandleRepository, MessageRepository, SnapshotRepository, StrategyRepository, TradeRepository
+
+DB_EXECUTOR_WORKERS = 4
+
+# DB 전용 스레드 풀 (스레드별 커넥션 재사용, 이벤트 루프는 I/O 대기 없이 진행)
+_db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+async def run_db(fn, *args, **kwargs):
+    """동기 DB 작업을 DB 전용 스레드에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(fn, *args, **kwargs))
+
+def _async_repository(repo_cls):
+    """Repository 클래스의 staticmethod를 같은 이름의 async 메서드로 감싼 클래스 생성"""
+    def wrap(fn):
+        @timed(DB_CALL_TIME, f"{repo_cls.__name__}.{fn.__name__}")
+        @functools.wraps(fn)
+        async def method(*args, **kwargs):
+            return await run_db(fn, *args, **kwargs)
+        return staticmethod(method)
+
+    methods = {
+        name: wrap(getattr(repo_cls, name))
+        for name, attr in vars(repo_cls).items()
+        if isinstance(attr, staticmethod)
+    }
+    return type(f"Async{repo_cls.__name__}", (), methods)
+
+AsyncMessageRepository = _async_repository(MessageRepository)
+AsyncStrategyRepository = _async_repository(StrategyRepository)
+AsyncSnapshotRepository = _async_repository(SnapshotRepository)
+AsyncTradeRepository = _async_repository(TradeRepository)
+AsyncCandleRepository = _async_repository(CandleRepository)
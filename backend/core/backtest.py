@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from .candles import Candles
+from .repository import CandleRepository
+
+SIDES = {'LONG': 1, 'SHORT': -1, 'NONE': 0}
+INTRABAR_POLICIES = ('worst', 'best', 'ohlc')
+
+def _ns(values):
+    return np.asarray(pd.to_datetime(values), dtype='datetime64[ns]').view('int64')
+
+def load_candles(symbol, timeframe, limit=-1):
+    """저장된 캔들 → 백테스트용 DataFrame (limit=-1이면 전체)"""
+    return Candles.from_rows(CandleRepository.get_candles(symbol, timeframe, limit)).to_frame()
+
+def _bar_times(times, idx, ok):
+    """봉 인덱스 → 시각 (ok가 아니면 NaT)"""
+    picked = times[np.minimum(idx, len(times) - 1)]
+    return pd.to_datetime(np.where(ok, picked, np.iinfo(np.int64).min).view('datetime64[ns]'))
+
+def first_cross(values, starts, levels, below, block=None, chunk=2048):
+    """각 (start, level)마다 start 이후 처음으로 values <= level (below) / >= level인 인덱스 (없으면 len)
+
+    배열을 sqrt(n) 크기 블록으로 나눠 블록 최소/최대값으로 후보 블록을 찾은 뒤 그 블록 안만 비교한다.
+    신호 chunk개씩 묶어 한 번에 계산하므로 메모리는 chunk * (블록 크기 + 블록 수)에 비례.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+    levels = np.asarray(levels, dtype=np.float64)
+    n = len(values)
+    result = np.full(len(starts), n, dtype=np.int64)
+    if n == 0 or len(starts) == 0:
+        return result
+    block = block or max(16, int(np.sqrt(n)))
+    nb = -(-n // block)
+    padded = np.full(nb * block, np.inf if below else -np.inf)
+    padded[:n] = values
+    blocks = padded.reshape(nb, block)
+    extreme = blocks.min(axis=1) if below else blocks.max(axis=1)
+    hit = np.less_equal if below else np.greater_equal
+    cols, block_ids = np.arange(block), np.arange(nb)
+
+    for lo in range(0, len(starts), chunk):
+        s, lv = starts[lo:lo + chunk], levels[lo:lo + chunk, None]
+        valid = s < n
+        s = np.minimum(s, n - 1)
+        b0 = s // block
+        # 1. 시작 블록 안 (start 이전 칸 제외)
+        mask = hit(blocks[b0], lv) & (cols >= (s % block)[:, None])
+        found = mask.any(axis=1)
+        idx = b0 * block + mask.argmax(axis=1)
+        # 2. 이후 블록 중 처음으로 조건을 만족하는 블록 → 그 블록 안에서 위치
+        bmask = hit(extreme, lv) & (block_ids > b0[:, None])
+        bfound = bmask.any(axis=1)
+        b1 = bmask.argmax(axis=1)
+        idx2 = b1 * block + hit(blocks[b1], lv).argmax(axis=1)
+        out = np.where(found, idx, np.where(bfound, idx2, n))
+        result[lo:lo + chunk] = np.where(valid, out, n)
+    return result
+
+def _path_exit(side, entry, tp, sl, o, h, l, c):
+    """OHLC 경로(양봉 O→L→H→C, 음봉 O→H→L→C)에서 체결 이후 처음 닿는 TP/SL (1=WIN, -1=LOSS, 0=없음)"""
+    bullish = c >= o
+    long_ = side == 1
+    # 체결 시점 이후 남은 경로 지점 (체결 전 지나간 고점/저점은 제외)
+    filled_at_open = np.where(long_, o <= entry, o >= entry)
+    first = np.where(bullish, l, h)
+    second = np.where(bullish, h, l)
+    # 시가 체결이 아니면: 롱은 하락 구간, 숏은 상승 구간에서 체결
+    skip_first = ~filled_at_open & np.where(long_, ~bullish, bullish)
+    points = [np.where(skip_first, second, first), np.where(skip_first, c, second), c]
+    status = np.zeros(len(side), dtype=np.int8)
+    for p in points:
+        win = np.where(long_, p >= tp, p <= tp)
+        loss = np.where(long_, p <= sl, p >= sl)
+        status = np.where(status != 0, status, np.where(loss, -1, np.where(win, 1, 0)))
+    return status
+
+def run_backtest(candles, signals, intrabar='worst', fee=0.0, exclusive=True):
+    """저장된 캔들로 SIGNAL_JSON 신호(PENDING → OPEN → WIN/LOSS) 일괄 재현
+
+    candles: open/high/low/close 컬럼과 시각 인덱스를 가진 DataFrame
+    signals: time, side(LONG/SHORT/NONE), entry, tp, sl 컬럼 (선택: expires) DataFrame
+    체결/청산 규칙은 VirtualOrderBook과 같다 (롱: 가격 <= entry 체결, >= tp 승, <= sl 패 / 숏은 반대).
+    신호는 발생 시각 이후 첫 봉부터 평가하며, 한 봉에서 TP와 SL이 모두 닿으면 intrabar 정책으로 결정:
+      worst - SL 우선 (체결 봉에서는 SL만 인정), best - TP 우선 (체결 봉에서는 TP만 인정),
+      ohlc  - 양봉 O→L→H→C, 음봉 O→H→L→C 경로를 따라 먼저 닿는 쪽
+    exclusive=True면 실시간과 같이 다음 신호가 대기 주문을 대체하고, 포지션 보유 중 신호는 무시한다.
+    반환: (신호별 결과 DataFrame, TradeRepository.get_stats와 같은 승/패/승률 + 손익/낙폭 통계)
+    """
+    if intrabar not in INTRABAR_POLICIES:
+        raise ValueError(f"intrabar must be one of {INTRABAR_POLICIES}")
+    times = _ns(candles.index)
+    o, h, l, c = (candles[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close'))
+    n = len(times)
+
+    signals = signals.sort_values('time', kind='stable').reset_index(drop=True)
+    side = signals['side'].map(SIDES).fillna(0).to_numpy(dtype=np.int8)
+    entry, tp, sl = (signals[col].to_numpy(dtype=np.float64) for col in ('entry', 'tp', 'sl'))
+    start = np.searchsorted(times, _ns(signals['time']), side='left')
+    expiry = np.full(len(signals), n, dtype=np.int64)
+    if 'expires' in signals:
+        has = signals['expires'].notna().to_numpy()
+        expiry[has] = np.searchsorted(times, _ns(signals['expires'][has]), side='left')
+    if exclusive and len(signals) > 1:
+        # 새 신호(NONE 포함)가 들어오면 이전 대기 주문은 교체/삭제됨
+        expiry[:-1] = np.minimum(expiry[:-1], start[1:])
+
+    long_ = side == 1
+    active = side != 0
+    # 1. 체결 봉: 롱은 저가 <= entry, 숏은 고가 >= entry
+    fill = np.full(len(signals), n, dtype=np.int64)
+    for mask, series, below in ((long_, l, True), (side == -1, h, False)):
+        if mask.any():
+            fill[mask] = first_cross(series, start[mask], entry[mask], below)
+    filled = active & (fill < np.minimum(expiry, n))
+
+    # 2. 체결 봉 안에서의 청산
+    fi = np.minimum(fill, n - 1)
+    tp_touch = np.where(long_, h[fi] >= tp, l[fi] <= tp)
+    sl_touch = np.where(long_, l[fi] <= sl, h[fi] >= sl)
+    if intrabar == 'worst':
+        in_bar = np.where(sl_touch, -1, 0)
+    elif intrabar == 'best':
+        in_bar = np.where(tp_touch, 1, 0)
+    else:
+        in_bar = _path_exit(side, entry, tp, sl, o[fi], h[fi], l[fi], c[fi])
+    in_bar = np.where(filled, in_bar, 0)
+
+    # 3. 이후 봉에서 처음 TP/SL에 닿는 봉
+    tp_bar = np.full(len(signals), n, dtype=np.int64)
+    sl_bar = np.full(len(signals), n, dtype=np.int64)
+    rest = filled & (in_bar == 0)
+    for is_long, below_tp in ((True, False), (False, True)):
+        mask = rest & (long_ == is_long) & active
+        if not mask.any(): continue
+        tp_bar[mask] = first_cross(h if is_long else l, fill[mask] + 1, tp[mask], below_tp)
+        sl_bar[mask] = first_cross(l if is_long else h, fill[mask] + 1, sl[mask], not below_tp)
+    exit_bar = np.where(in_bar != 0, fill, np.minimum(tp_bar, sl_bar))
+    both = rest & (tp_bar == sl_bar) & (tp_bar < n)
+    if intrabar == 'worst':
+        tie = -1
+    elif intrabar == 'best':
+        tie = 1
+    else:
+        # 양봉은 저가를 먼저, 음봉은 고가를 먼저 지남
+        bi = np.minimum(tp_bar, n - 1)
+        low_first = c[bi] >= o[bi]
+        tie = np.where(long_ == low_first, -1, 1)
+    outcome = np.where(in_bar != 0, in_bar,
+                       np.where(both, tie, np.where(tp_bar < sl_bar, 1, np.where(sl_bar < tp_bar, -1, 0))))
+    outcome = np.where(filled & (exit_bar < n), outcome, 0)
+
+    status = np.where(~active, 'NONE',
+             np.where(outcome == 1, 'WIN',
+             np.where(outcome == -1, 'LOSS',
+             np.where(filled, 'OPEN',
+             np.where(expiry < n, 'EXPIRED', 'PENDING'))))).astype(object)
+
+    if exclusive:
+        # 포지션 보유 중(체결 ~ 청산)에 들어온 신호는 실시간에서도 무시됨 (신호 수만큼의 단순 순회)
+        busy_until = -1
+        for i in range(len(signals)):
+            if not active[i]: continue
+            if start[i] <= busy_until:
+                status[i] = 'SKIPPED'
+                continue
+            if status[i] in ('WIN', 'LOSS'):
+                busy_until = exit_bar[i]
+            elif status[i] == 'OPEN':
+                busy_until = n
+
+    closed = np.isin(status, ['WIN', 'LOSS'])
+    exit_price = np.where(status == 'WIN', tp, np.where(status == 'LOSS', sl, np.nan))
+    pnl = np.where(long_, exit_price - entry, entry - exit_price) / entry - 2 * fee
+    trades = pd.DataFrame({
+        'time': signals['time'], 'side': signals['side'], 'entry': entry, 'tp': tp, 'sl': sl,
+        'status': status,
+        'fill_time': _bar_times(times, fill, filled & (status != 'SKIPPED')),
+        'exit_time': _bar_times(times, exit_bar, closed),
+        'exit_price': np.where(closed, exit_price, np.nan),
+        'pnl_pct': np.where(closed, pnl * 100, np.nan),
+    })
+    return trades, summarize(trades)
+
+def summarize(trades):
+    """승/패/승률 (TradeRepository.get_stats와 같은 방식) + 누적 수익률, 최대 낙폭, 손익비"""
+    closed = trades[trades['status'].isin(['WIN', 'LOSS'])].sort_values('exit_time', kind='stable')
+    wins = int((closed['status'] == 'WIN').sum())
+    losses = len(closed) - wins
+    total = wins + losses
+    win_rate = (wins / total * 100) if total > 0 else 0
+    pnl = closed['pnl_pct'].to_numpy() / 100
+    equity = np.cumprod(1 + pnl) if len(pnl) else np.ones(1)
+    peak = np.maximum.accumulate(np.concatenate([[1.0], equity]))[1:]
+    gains, pains = pnl[pnl > 0].sum(), -pnl[pnl < 0].sum()
+    counts = trades['status'].value_counts()
+    return {
+        "wins": wins, "losses": losses, "win_rate": round(win_rate, 1),
+        "open": int(counts.get('OPEN', 0)), "pending": int(counts.get('PENDING', 0)),
+        "expired": int(counts.get('EXPIRED', 0)), "skipped": int(counts.get('SKIPPED', 0)),
+        "total_return_pct": round(float(equity[-1] - 1) * 100, 2),
+        "max_drawdown_pct": round(float(np.max(1 - equity / peak)) * 100, 2) if len(pnl) else 0.0,
+        "avg_pnl_pct": round(float(pnl.mean()) * 100, 3) if len(pnl) else 0.0,
+        "profit_factor": round(float(gains / pains), 2) if pains > 0 else None,
+    }
@@ -0,0 +1,350 @@
+import asyncio
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from .async_repository import run_db
+from .repository import CacheRepository
+
+# 백그라운드 갱신(stale-while-revalidate) 전용 워커
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+# 이름별 캐시 레지스트리 (통계 조회용)
+_registry = {}
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until", "synced_at")
+
+    def __init__(self, value, fresh_until, stale_until, synced_at=0.0):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.synced_at = synced_at  # 공유 저장소와 마지막으로 맞춘 시각
+
+class SQLiteCacheStore:
+    """워커 간 공유 캐시 저장소 (DB cache_entries 테이블, 값은 JSON)"""
+
+    def get(self, name, key):
+        row = CacheRepository.get(name, str(key))
+        return (json.loads(row[0]), row[1], row[2]) if row else None
+
+    def put(self, name, key, value, fresh_until, stale_until):
+        CacheRepository.put(name, str(key), json.dumps(value, ensure_ascii=False), fresh_until, stale_until)
+
+    def delete(self, name, key=None):
+        CacheRepository.delete(name, None if key is None else str(key))
+
+class TTLCache:
+    """키별 TTL + LRU 축출 + 단일 비행(single-flight) + stale-while-revalidate 캐시
+
+    - fresh: TTL 이내, 바로 반환
+    - stale: TTL 경과 후 stale_ttl 이내, 기존 값을 바로 반환하고 백그라운드에서 한 번만 갱신
+    - 만료/미스: 동시 요청 중 하나만 로더를 호출하고 나머지(스레드/코루틴)는 그 결과를 기다림
+    만료된 값도 축출 전까지 남겨 두므로 갱신 실패 시 peek()으로 마지막 값을 쓸 수 있다.
+    persist=True면 '{name}_cache_{key}.json' 파일에도 저장해 재시작 후에도 재사용한다.
+    store를 지정하면 값/무효화를 다른 워커와 공유하며, 메모리 값은 sync_interval초마다 저장소와 다시 맞춘다.
+    저장소 조회/저장은 캐시 잠금 밖에서 하고, 비동기 경로(aget_or_load/ainvalidate)에서는 DB 스레드에서 실행한다.
+    """
+
+    def __init__(self, name, ttl, stale_ttl=0.0, maxsize=256, persist=False, clock=time.time,
+                 store=None, sync_interval=1.0):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.persist = persist
+        self.clock = clock
+        self.store = store
+        self.sync_interval = sync_interval
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._generation = 0
+        self._tasks = set()
+        self._lock = threading.RLock()
+        self.hits = self.stale_hits = self.misses = 0
+        self.loads = self.load_errors = self.evictions = 0
+        self.load_time_total = self.load_time_max = 0.0
+        _registry[name] = self
+
+    # --- 저장소 ---
+    def _path(self, key):
+        return f"{self.name}_cache_{key}.json"
+
+    def _read_file(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                c = json.load(f)
+            fresh_until = datetime.fromisoformat(c['expiry']).timestamp()
+            return _Entry(c['data'], fresh_until, fresh_until + self.stale_ttl)
+        except Exception:
+            return None
+
+    def _write_file(self, key, value, fresh_until):
+        try:
+            with open(self._path(key), 'w', encoding='utf-8') as f:
+                json.dump({"data": value, "expiry": datetime.fromtimestamp(fresh_until).isoformat()}, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"[Error] 캐시 파일 저장 실패 ({self.name}/{key}): {e}")
+
+    def _needs_sync(self, key):
+        if self.store is None:
+            return False
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is None or self.clock() - entry.synced_at >= self.sync_interval
+
+    def _sync(self, key):
+        """공유 저장소 값을 메모리에 반영 (동기화 주기가 지났을 때만, 저장소 조회는 잠금 밖에서)"""
+        if not self._needs_sync(key):
+            return
+        with self._lock:
+            generation, started = self._generation, self.clock()
+        try:
+            row = self.store.get(self.name, key)
+        except Exception as e:
+            print(f"[Error] 공유 캐시 조회 실패 ({self.name}/{key}): {e}")
+            return
+        with self._lock:
+            current = self._entries.get(key)
+            if generation != self._generation or (current is not None and current.synced_at > started):
+                return  # 조회하는 동안 이 워커에서 무효화/저장됨
+            if row is None:
+                self._entries.pop(key, None)  # 다른 워커가 무효화했거나 아직 없음
+            else:
+                value, fresh_until, stale_until = row
+                self._store(key, _Entry(value, fresh_until, stale_until, self.clock()))
+
+    async def _async_sync(self, key):
+        if self._needs_sync(key):
+            await run_db(self._sync, key)
+
+    def _write_shared(self, key, entry):
+        try:
+            self.store.put(self.name, key, entry.value, entry.fresh_until, entry.stale_until)
+        except Exception as e:
+            print(f"[Error] 공유 캐시 저장 실패 ({self.name}/{key}): {e}")
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None and self.persist:
+            entry = self._read_file(key)
+            if entry is not None:
+                entry.synced_at = self.clock()
+                self._store(key, entry)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _put(self, key, value, ttl=None):
+        now = self.clock()
+        fresh_until = now + (self.ttl if ttl is None else ttl)
+        entry = _Entry(value, fresh_until, fresh_until + self.stale_ttl, now)
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def _persist(self, key, entry):
+        """공유 저장소/파일에 기록 (잠금 밖에서)"""
+        if self.store is not None:
+            self._write_shared(key, entry)
+        if self.persist:
+            self._write_file(key, entry.value, entry.fresh_until)
+
+    def set(self, key, value, ttl=None):
+        self._persist(key, self._put(key, value, ttl))
+
+    def get(self, key):
+        """TTL 이내 값만 반환 (없으면 None)"""
+        self._sync(key)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and entry.fresh_until > self.clock():
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            return None
+
+    def peek(self, key, default=None):
+        """만료 여부와 상관없이 마지막 값 반환 (통계 미반영)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else default
+
+    async def apeek(self, key, default=None):
+        """이벤트 루프용 peek (공유 저장소와의 동기화는 DB 스레드에서)"""
+        await self._async_sync(key)
+        return self.peek(key, default)
+
+    def expires_in(self, key):
+        """TTL 만료까지 남은 초 (값이 없으면 0)"""
+        self._sync(key)
+        with self._lock:
+            entry = self._lookup(key)
+            return max(0.0, entry.fresh_until - self.clock()) if entry is not None else 0.0
+
+    def _invalidate_local(self, key):
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _invalidate_shared(self, key):
+        try:
+            self.store.delete(self.name, key)
+        except Exception as e:
+            print(f"[Error] 공유 캐시 무효화 실패 ({self.name}/{key}): {e}")
+
+    def invalidate(self, key=None):
+        """키(또는 전체) 무효화: 진행 중인 로딩 결과도 저장하지 않음"""
+        self._invalidate_local(key)
+        if self.store is not None:
+            self._invalidate_shared(key)
+
+    async def ainvalidate(self, key=None):
+        """이벤트 루프용 invalidate (공유 저장소 삭제는 DB 스레드에서)"""
+        self._invalidate_local(key)
+        if self.store is not None:
+            await run_db(self._invalidate_shared, key)
+
+    # --- 로딩 ---
+    def _begin(self, key, now):
+        """(상태, 값, 진행 중 Future, 이 호출이 로딩 담당인지)"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and entry.fresh_until > now:
+                self.hits += 1
+                return 'fresh', entry.value, None, False
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight[key] = Future()
+            if entry is not None and entry.stale_until > now:
+                self.stale_hits += 1
+                return 'stale', entry.value, inflight, owner
+            self.misses += 1
+            return 'miss', None, inflight, owner
+
+    def _finish(self, key, future, generation, started, value=None, error=None, ttl=None):
+        """로딩 결과를 메모리에 반영하고 대기자에게 전달 (저장소에 기록할 항목 반환)"""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.loads += 1
+            self.load_time_total += elapsed
+            self.load_time_max = max(self.load_time_max, elapsed)
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if error is not None:
+                self.load_errors += 1
+            store = error is None and generation == self._generation
+        entry = self._put(key, value, ttl) if store else None
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+        return entry if self.store is not None or self.persist else None
+
+    def _run_sync(self, key, loader, future, ttl):
+        generation, started = self._generation, time.perf_counter()
+        try:
+            value = loader()
+        except Exception as e:
+            self._finish(key, future, generation, started, error=e)
+            return
+        entry = self._finish(key, future, generation, started, value=value, ttl=ttl)
+        if entry is not None:
+            self._persist(key, entry)
+
+    async def _run_async(self, key, loader, future, ttl):
+        generation, started = self._generation, time.perf_counter()
+        try:
+            value = await loader()
+        except BaseException as e:
+            # 취소도 대기 중인 호출자에게 전달해 진행 중 표시가 남지 않게 함
+            self._finish(key, future, generation, started, error=e)
+            if not isinstance(e, Exception): raise
+        else:
+            entry = self._finish(key, future, generation, started, value=value, ttl=ttl)
+            if entry is not None:
+                await run_db(self._persist, key, entry)
+
+    def get_or_load(self, key, loader, ttl=None):
+        """동기 로더용 (스레드 안전)"""
+        self._sync(key)
+        state, value, future, owner = self._begin(key, self.clock())
+        if state == 'fresh':
+            return value
+        if state == 'stale':
+            if owner:
+                _refresh_pool.submit(self._run_sync, key, loader, future, ttl)
+            return value
+        if owner:
+            self._run_sync(key, loader, future, ttl)
+        return future.result()
+
+    def refresh(self, key, loader, ttl=None):
+        """신선도와 상관없이 다시 로딩해 저장 (진행 중인 로딩이 있으면 그 결과를 공유, 실패 시 예외)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if owner:
+            self._run_sync(key, loader, future, ttl)
+        return future.result()
+
+    async def aget_or_load(self, key, loader, ttl=None):
+        """비동기 로더(코루틴 함수) 또는 동기 로더(스레드에서 실행)용"""
+        if not inspect.iscoroutinefunction(loader):
+            sync_loader = loader
+            loader = lambda: asyncio.to_thread(sync_loader)
+        await self._async_sync(key)
+        state, value, future, owner = self._begin(key, self.clock())
+        if state == 'fresh':
+            return value
+        if owner:
+            task = asyncio.create_task(self._run_async(key, loader, future, ttl))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if state == 'stale':
+                return value
+            # 요청이 취소돼도 다른 대기자를 위해 로딩은 계속 진행
+            await asyncio.shield(task)
+        elif state == 'stale':
+            return value
+        return await asyncio.wrap_future(future)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries), "hits": self.hits, "stale_hits": self.stale_hits,
+                "misses": self.misses, "loads": self.loads, "load_errors": self.load_errors,
+                "evictions": self.evictions,
+                "load_ms_avg": round(self.load_time_total / self.loads * 1000, 1) if self.loads else 0.0,
+                "load_ms_max": round(self.load_time_max * 1000, 1),
+            }
+
+def share_caches(store, names):
+    """이름으로 등록된 캐시들이 store를 공유하도록 설정 (여러 워커 실행 모드)"""
+    for name in names:
+        _registry[name].store = store
+
+def cache_stats():
+    """등록된 모든 캐시의 통계"""
+    return {name: cache.stats() for name, cache in _registry.items()}
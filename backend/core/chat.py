@@ -0,0 +1,255 @@
+import asyncio
+import bisect
+import json
+import os
+import socket
+import time
+import uuid
+from collections import deque
+
+from .async_repository import run_db
+from .metrics import QUEUE_DROPS
+from .repository import LeaseRepository, MessageRepository
+
+# 메시지 id 비트 배치: 밀리초 << 10 | 워커 노드(4비트) << 6 | 같은 밀리초 안 순번(6비트)
+# 2^53 미만이라 브라우저(JS Number)에서도 정확히 다룰 수 있음
+NODE_BITS = 4
+SEQ_BITS = 6
+NODE_LEASE_TTL = 60.0
+
+class LocalPubSub:
+    """단일 프로세스용 (발행 즉시 같은 프로세스의 브로커에 전달)"""
+
+    async def start(self, on_message):
+        self.on_message = on_message
+
+    async def publish(self, msg):
+        self.on_message(msg)
+
+    async def stop(self):
+        pass
+
+class UnixSocketPubSub:
+    """같은 서버의 여러 워커 간 전달 (디렉터리 안의 워커별 유닉스 데이터그램 소켓)
+
+    발행 시 디렉터리의 다른 소켓 전부에 보내고, 응답 없는(종료된) 워커의 소켓 파일은 지운다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, f"chat-{os.getpid()}.sock")
+        self.sock = None
+        self.send_failures = 0
+
+    async def start(self, on_message):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path): os.unlink(self.path)
+        self.on_message = on_message
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self.sock.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        while True:
+            try:
+                raw = self.sock.recv(65536)
+            except BlockingIOError:
+                return
+            try:
+                self.on_message(json.loads(raw))
+            except Exception as e:
+                print(f"[CHAT ERROR] 잘못된 메시지 수신: {e}")
+
+    def _peers(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        paths = (os.path.join(self.directory, n) for n in names if n.startswith("chat-") and n.endswith(".sock"))
+        return [p for p in paths if p != self.path]
+
+    async def publish(self, msg):
+        raw = json.dumps(msg).encode('utf-8')
+        for peer in self._peers():
+            try:
+                self.sock.sendto(raw, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.unlink(peer)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                # 상대 워커의 수신 버퍼가 가득 참 (해당 워커 구독자는 재접속 시 DB에서 보충)
+                self.send_failures += 1
+        self.on_message(msg)
+
+    async def stop(self):
+        if self.sock is None: return
+        asyncio.get_running_loop().remove_reader(self.sock.fileno())
+        self.sock.close()
+        self.sock = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+class ChatBroker:
+    """채팅 발행/구독 중계
+
+    - 최근 메시지를 메모리 링 버퍼(history개)에 보관해 접속 시 DB 조회 없이 바로 재전송
+    - 메시지 id는 시간순 정수 (밀리초 + 워커 노드 + 순번)라 Last-Event-ID 이후만 이어서 전송 가능
+      노드 번호는 DB 리스로 워커마다 겹치지 않게 할당해 워커 간 id 충돌이 없음
+    - DB 저장은 flush_interval마다 모아서 한 번에 (발행한 워커만 저장)
+    - 구독자 큐가 가득 차면(느린 소비자) 연결을 끊어 클라이언트가 Last-Event-ID로 재접속하게 함
+    - 워커 간 전달은 pubsub 백엔드에 위임 (기본: 프로세스 내부)
+    """
+
+    def __init__(self, pubsub=None, history=500, queue_size=256, flush_interval=0.2):
+        self.pubsub = pubsub or LocalPubSub()
+        self.history = deque(maxlen=history)
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.node = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._node_renewed = 0.0
+        self._seq = 0
+        self._subscribers = set()
+        self._pending = []
+        self._last_id = 0
+        self._flush_task = None
+        self.published = self.persisted = self.dropped_subscribers = 0
+
+    def _claim_node(self):
+        """비어 있는(또는 만료된) 노드 리스 하나를 차지"""
+        now = time.time()
+        for node in range(1 << NODE_BITS):
+            if LeaseRepository.acquire(f"chat-node-{node}", self.owner, now, NODE_LEASE_TTL):
+                self.node, self._node_renewed = node, now
+                return node
+        raise RuntimeError(f"채팅 노드 번호 소진 (워커 {1 << NODE_BITS}개 초과)")
+
+    async def _renew_node(self):
+        now = time.time()
+        if now - self._node_renewed < NODE_LEASE_TTL / 3: return
+        try:
+            if await run_db(LeaseRepository.acquire, f"chat-node-{self.node}", self.owner, now, NODE_LEASE_TTL):
+                self._node_renewed = now
+            else:
+                # 리스를 놓친 사이 다른 워커가 가져감: 새 번호로 교체
+                print(f"[CHAT ERROR] 노드 {self.node} 리스 상실, 재할당")
+                await run_db(self._claim_node)
+        except Exception as e:
+            print(f"[Error] 채팅 노드 리스 갱신 실패: {e}")
+
+    async def start(self):
+        await run_db(self._claim_node)
+        for msg in await run_db(MessageRepository.get_recent_messages, self.history.maxlen):
+            self.history.append(msg)
+        if self.history:
+            self._last_id = self.history[-1]['id']
+        await self.pubsub.start(self._deliver)
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await self.pubsub.stop()
+        if self.node is not None:
+            await run_db(LeaseRepository.release, f"chat-node-{self.node}", self.owner)
+
+    def next_id(self):
+        ms = time.time_ns() // 1_000_000
+        last_ms = self._last_id >> (NODE_BITS + SEQ_BITS)
+        if ms > last_ms:
+            self._seq = 0
+        elif self._seq < (1 << SEQ_BITS) - 1:
+            ms, self._seq = last_ms, self._seq + 1
+        else:
+            # 같은 밀리초 순번 소진(또는 시계 역행): 다음 밀리초 번호를 미리 사용
+            ms, self._seq = last_ms + 1, 0
+        self._last_id = (ms << (NODE_BITS + SEQ_BITS)) | (self.node << SEQ_BITS) | self._seq
+        return self._last_id
+
+    async def publish(self, sender, text, timestamp):
+        msg = {"id": self.next_id(), "sender": sender, "text": text, "timestamp": timestamp}
+        self._pending.append(msg)
+        self.published += 1
+        await self.pubsub.publish(msg)
+        return msg
+
+    def _deliver(self, msg):
+        """pubsub에서 받은 메시지를 링 버퍼에 넣고 구독자에게 전송 (JSON 인코딩은 한 번만)"""
+        if self.history and msg['id'] <= self.history[-1]['id']:
+            # 다른 워커에서 늦게 도착한 메시지는 id 순서 유지
+            ids = [m['id'] for m in self.history]
+            pos = bisect.bisect_left(ids, msg['id'])
+            if pos < len(ids) and ids[pos] == msg['id']: return
+            if len(self.history) == self.history.maxlen:
+                if pos == 0: return
+                self.history.popleft()
+                pos -= 1
+            self.history.insert(pos, msg)
+        else:
+            self.history.append(msg)
+        item = (msg['id'], json.dumps(msg))
+        for q in list(self._subscribers):
+            if q.full():
+                self._drop(q)
+            else:
+                q.put_nowait(item)
+
+    def _drop(self, q):
+        """느린 구독자: 밀린 메시지를 버리고 종료 신호(None) 전달"""
+        self._subscribers.discard(q)
+        self.dropped_subscribers += 1
+        QUEUE_DROPS.inc("chat", amount=q.qsize())
+        while not q.empty():
+            q.get_nowait()
+        q.put_nowait(None)
+
+    def subscribe(self):
+        q = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        self._subscribers.discard(q)
+
+    async def replay(self, last_id=None, limit=50):
+        """재전송할 메시지 (last_id 없으면 최근 limit개, 링 버퍼보다 오래된 id면 DB에서 최대 1000개 보충)"""
+        if last_id is None:
+            return list(self.history)[-limit:]
+        if not self.history or last_id >= self.history[0]['id'] or len(self.history) < self.history.maxlen:
+            # 링 버퍼가 가득 차지 않았으면 저장된 메시지 전체를 담고 있음
+            return [m for m in self.history if m['id'] > last_id]
+        await self.flush()
+        return await run_db(MessageRepository.get_messages_after, last_id, max(self.history.maxlen, 1000))
+
+    async def flush(self):
+        if not self._pending: return
+        batch, self._pending = self._pending, []
+        try:
+            await run_db(MessageRepository.add_messages, batch)
+            self.persisted += len(batch)
+        except Exception as e:
+            print(f"[Error] 채팅 메시지 저장 실패 ({len(batch)}건): {e}")
+            self._pending[:0] = batch
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            await self._renew_node()
+
+    def stats(self):
+        return {
+            "node": self.node, "subscribers": len(self._subscribers), "history": len(self.history),
+            "published": self.published, "persisted": self.persisted,
+            "pending": len(self._pending), "dropped_subscribers": self.dropped_subscribers,
+        }
@@ -1,20 +1,235 @@
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 
+from .metrics import DB_LOCK_WAIT
+
 DB_NAME = "quant_v2.db"
 DB_TIMEOUT = 10.0
+DB_CACHE_KIB = 8192
+DB_STATEMENT_CACHE = 256
+DEFAULT_SYMBOL = "BTC/USDT"
+
+# 스레드별 커넥션 재사용 (DB 경로별), 커넥션마다 prepared statement 캐시 유지
+_local = threading.local()
+
+def _connect(path):
+    conn = sqlite3.connect(
+        path, timeout=DB_TIMEOUT, isolation_level=None, cached_statements=DB_STATEMENT_CACHE
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA cache_size=-{DB_CACHE_KIB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+def _thread_conn():
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(DB_NAME)
+    if conn is None:
+        conn = conns[DB_NAME] = _connect(DB_NAME)
+    return conn
 
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(DB_NAME, timeout=DB_TIMEOUT)
-    conn.row_factory = sqlite3.Row
+    """현재 스레드의 재사용 커넥션 (autocommit 읽기용)"""
+    conn = _thread_conn()
     try:
         yield conn
     finally:
+        if conn.in_transaction:
+            conn.rollback()
+
+@contextmanager
+def write_tx():
+    """쓰기 트랜잭션 (BEGIN IMMEDIATE로 쓰기 락을 먼저 잡고 블록 종료 시 커밋, 예외 시 롤백)"""
+    conn = _thread_conn()
+    start = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    DB_LOCK_WAIT.observe(time.perf_counter() - start)
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+def close_db():
+    """현재 스레드의 커넥션 정리"""
+    for conn in getattr(_local, 'conns', {}).values():
         conn.close()
+    _local.conns = {}
+
+# 스키마 마이그레이션 (PRAGMA user_version 기준으로 순서대로 1회 적용)
+MIGRATIONS = [
+    # 1. 상태/언어별 조회 인덱스
+    [
+        "CREATE INDEX IF NOT EXISTS idx_virtual_trades_status ON virtual_trades(status)",
+        "CREATE INDEX IF NOT EXISTS idx_strategy_history_lang_id ON strategy_history(lang, id)",
+    ],
+    # 2. 상태별 매매 건수 요약 테이블 (트리거로 상태 변경과 같은 트랜잭션에서 갱신)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS trade_summary (
+            status TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_virtual_trades_insert AFTER INSERT ON virtual_trades
+        BEGIN
+            INSERT INTO trade_summary (status, count) VALUES (NEW.status, 1)
+                ON CONFLICT(status) DO UPDATE SET count = count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_virtual_trades_update AFTER UPDATE OF status ON virtual_trades
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            UPDATE trade_summary SET count = count - 1 WHERE status = OLD.status;
+            INSERT INTO trade_summary (status, count) VALUES (NEW.status, 1)
+                ON CONFLICT(status) DO UPDATE SET count = count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_virtual_trades_delete AFTER DELETE ON virtual_trades
+        BEGIN
+            UPDATE trade_summary SET count = count - 1 WHERE status = OLD.status;
+        END
+        """,
+        "DELETE FROM trade_summary",
+        "INSERT INTO trade_summary (status, count) SELECT status, COUNT(*) FROM virtual_trades WHERE status IS NOT NULL GROUP BY status",
+    ],
+    # 3. 심볼별 분리: 전략/매매에 symbol 컬럼, 요약 테이블을 (symbol, status) 단위로 재구성
+    [
+        f"ALTER TABLE strategy_history ADD COLUMN symbol TEXT DEFAULT '{DEFAULT_SYMBOL}'",
+        f"ALTER TABLE virtual_trades ADD COLUMN symbol TEXT DEFAULT '{DEFAULT_SYMBOL}'",
+        "DROP INDEX IF EXISTS idx_strategy_history_lang_id",
+        "CREATE INDEX IF NOT EXISTS idx_strategy_history_symbol_lang_id ON strategy_history(symbol, lang, id)",
+        "CREATE INDEX IF NOT EXISTS idx_virtual_trades_symbol_status ON virtual_trades(symbol, status)",
+        "DROP TRIGGER IF EXISTS trg_virtual_trades_insert",
+        "DROP TRIGGER IF EXISTS trg_virtual_trades_update",
+        "DROP TRIGGER IF EXISTS trg_virtual_trades_delete",
+        "DROP TABLE IF EXISTS trade_summary",
+        """
+        CREATE TABLE trade_summary (
+            symbol TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (symbol, status)
+        )
+        """,
+        """
+        CREATE TRIGGER trg_virtual_trades_insert AFTER INSERT ON virtual_trades
+        BEGIN
+            INSERT INTO trade_summary (symbol, status, count) VALUES (NEW.symbol, NEW.status, 1)
+                ON CONFLICT(symbol, status) DO UPDATE SET count = count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_virtual_trades_update AFTER UPDATE OF status ON virtual_trades
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            UPDATE trade_summary SET count = count - 1 WHERE symbol = OLD.symbol AND status = OLD.status;
+            INSERT INTO trade_summary (symbol, status, count) VALUES (NEW.symbol, NEW.status, 1)
+                ON CONFLICT(symbol, status) DO UPDATE SET count = count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_virtual_trades_delete AFTER DELETE ON virtual_trades
+        BEGIN
+            UPDATE trade_summary SET count = count - 1 WHERE symbol = OLD.symbol AND status = OLD.status;
+        END
+        """,
+        "INSERT INTO trade_summary (symbol, status, count) SELECT symbol, status, COUNT(*) FROM virtual_trades "
+        "WHERE symbol IS NOT NULL AND status IS NOT NULL GROUP BY symbol, status",
+    ],
+    # 4. 언어 무관 시장 스냅샷 (지표/SMC/컨텍스트 JSON), 전략은 생성에 쓴 스냅샷을 참조
+    [
+        """
+        CREATE TABLE IF NOT EXISTS market_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            data TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_market_snapshots_symbol_id ON market_snapshots(symbol, id)",
+        "ALTER TABLE strategy_history ADD COLUMN snapshot_id INTEGER",
+    ],
+    # 5. LLM 응답 저장소 (정규화 프롬프트 해시 기준)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS llm_results (
+            prompt_hash TEXT PRIMARY KEY,
+            model TEXT,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+    ],
+    # 6. 워커 간 공유 속도 제한 버킷
+    [
+        """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_rate_limits_updated ON rate_limits(updated)",
+    ],
+    # 7. 여러 워커 실행: 백그라운드 작업 리더 리스, 워커 간 공유 캐시
+    [
+        """
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            name TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            fresh_until REAL NOT NULL,
+            stale_until REAL NOT NULL,
+            PRIMARY KEY (name, key)
+        ) WITHOUT ROWID
+        """,
+    ],
+    # 8. 채팅 id를 2^53 미만 (밀리초 << 10 | 노드 << 6 | 순번)으로 변환 (기존: 마이크로초 * 16 + 노드)
+    [
+        """
+        CREATE TEMP TABLE message_id_map AS
+        SELECT id AS old_id,
+               ((id / 16 / 1000) << 10) | ((id % 16) << 6)
+               | (ROW_NUMBER() OVER (PARTITION BY id / 16 / 1000, id % 16 ORDER BY id) - 1) AS new_id
+        FROM messages WHERE id >= 9007199254740992
+        """,
+        "UPDATE messages SET id = (SELECT new_id FROM message_id_map WHERE old_id = messages.id) "
+        "WHERE id >= 9007199254740992",
+        "DROP TABLE message_id_map",
+        "UPDATE sqlite_sequence SET seq = (SELECT COALESCE(MAX(id), 0) FROM messages) WHERE name = 'messages'",
+    ],
+]
+
+def migrate(conn):
+    """미적용 마이그레이션 실행 (호출자 트랜잭션 안에서)"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+        for sql in statements:
+            conn.execute(sql)
+        conn.execute(f"PRAGMA user_version = {target}")
 
 def init_db():
-    with get_db() as conn:
+    with write_tx() as conn:
         c = conn.cursor()
         # 채팅 메시지 테이블
         c.execute("""
@@ -53,4 +268,21 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        conn.commit()
+
+        # OHLCV 캔들 저장소 (심볼/타임프레임/시가 시각 기준)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS ohlcv (
+                symbol TEXT,
+                timeframe TEXT,
+                open_time INTEGER,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume REAL,
+                taker_buy_vol REAL,
+                PRIMARY KEY (symbol, timeframe, open_time)
+            ) WITHOUT ROWID
+        """)
+
+        migrate(conn)
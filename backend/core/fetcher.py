@@ -1,41 +1,98 @@
-import ccxt
+import threading
+import time
+
 import pandas as pd
 from datetime import datetime
 
+from .candles import Candles
+from .database import init_db
+from .metrics import COMPUTE_TIME, EXCHANGE_LATENCY, timed
+from .repository import CandleRepository
+
+KLINE_PAGE_LIMIT = 1500  # 바이낸스 선물 klines 요청당 최대 개수
+
 class MarketDataFetcher:
-    def __init__(self, symbol='BTC/USDT'):
+    def __init__(self, symbol='BTC/USDT', use_store=True, exchange=None):
         self.symbol = symbol
-        self.exchange = ccxt.binance({'options': {'defaultType': 'future'}})
+        # 여러 심볼이 하나의 거래소 객체(마켓 메타데이터, 요청 속도 제한)를 공유할 수 있음
+        self._exchange = exchange
+        self._exchange_lock = threading.Lock()
+        self.use_store = use_store
+        self._store_ready = False
+
+    @property
+    def exchange(self):
+        """ccxt 거래소 객체 (import와 생성이 무거워 첫 사용 시점에 생성)"""
+        if self._exchange is None:
+            with self._exchange_lock:
+                if self._exchange is None:
+                    import ccxt
+                    self._exchange = ccxt.binance({'options': {'defaultType': 'future'}})
+        return self._exchange
+
+    @exchange.setter
+    def exchange(self, exchange):
+        self._exchange = exchange
+
+    @timed(EXCHANGE_LATENCY, "klines")
+    def _get_klines(self, tf, limit, start_time=None, end_time=None):
+        params = {'symbol': self.symbol.replace('/', ''), 'interval': tf, 'limit': limit}
+        if start_time is not None: params['startTime'] = int(start_time)
+        if end_time is not None: params['endTime'] = int(end_time)
+        return Candles.from_klines(self.exchange.fapiPublicGetKlines(params))
+
+    def _sync_store(self, tf, limit):
+        """로컬 캔들 저장소를 최신 상태로 맞춤 (마지막 저장봉 이후만 요청, 부족하면 과거 백필)"""
+        tf_ms = self.exchange.parse_timeframe(tf) * 1000
+        first, last, count = CandleRepository.get_bounds(self.symbol, tf)
+        now_ms = int(time.time() * 1000)
+
+        if last is None or (now_ms - last) // tf_ms >= limit:
+            # 콜드 스타트 또는 공백이 너무 큼: 최신 구간부터 새로 받고 이어지지 않는 이전 캔들은 버림
+            # (남겨 두면 백필이 그 앞에서 시작해 중간에 빈 구간이 생김)
+            candles = self._get_klines(tf, min(limit, KLINE_PAGE_LIMIT))
+            CandleRepository.upsert_candles(self.symbol, tf, candles.rows())
+            if len(candles):
+                CandleRepository.delete_candles_before(self.symbol, tf, int(candles.open_time[0]))
+            first, last, count = CandleRepository.get_bounds(self.symbol, tf)
+        else:
+            # 마지막 저장봉(미확정일 수 있음)부터 다시 받아 병합
+            since = last
+            while True:
+                candles = self._get_klines(tf, KLINE_PAGE_LIMIT, start_time=since)
+                CandleRepository.upsert_candles(self.symbol, tf, candles.rows())
+                if len(candles) < KLINE_PAGE_LIMIT or candles.open_time[-1] <= since:
+                    break
+                since = int(candles.open_time[-1])
+
+        # 요청 길이가 저장분보다 길면 과거 방향으로 백필
+        while first is not None and count < limit:
+            candles = self._get_klines(tf, min(limit - count, KLINE_PAGE_LIMIT), end_time=first - 1)
+            if not len(candles) or candles.open_time[0] >= first:
+                break
+            CandleRepository.upsert_candles(self.symbol, tf, candles.rows())
+            first, _, count = CandleRepository.get_bounds(self.symbol, tf)
 
+    @timed(COMPUTE_TIME, "fetch_ohlcv")
     def fetch_ohlcv(self, tf, limit=500):
-        """실시간 OHLCV 및 Taker Volume 수집"""
+        """실시간 OHLCV 및 Taker Volume 수집 (로컬 캔들 저장소 + 증분 요청)"""
         try:
-            params = {'symbol': self.symbol.replace('/', ''), 'interval': tf, 'limit': limit}
-            ohlcv = self.exchange.fapiPublicGetKlines(params)
-            cols = [
-                'timestamp', 'open', 'high', 'low', 'close', 'volume', 
-                'close_time', 'q_vol', 'trades', 'taker_buy_vol', 'taker_buy_quote_vol', 'ignore'
-            ]
-            df = pd.DataFrame(ohlcv, columns=cols)
-            
-            # 수치 데이터 변환
-            cols_numeric = ['open', 'high', 'low', 'close', 'volume', 'taker_buy_vol']
-            for c in cols_numeric:
-                df[c] = pd.to_numeric(df[c], errors='coerce')
-                
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
-            
-            # CVD 계산을 위한 기본 필드
-            df['taker_sell_vol'] = df['volume'] - df['taker_buy_vol']
-            df['delta'] = df['taker_buy_vol'] - df['taker_sell_vol']
-            
-            return df
+            if not self.use_store:
+                return self._get_klines(tf, limit).to_frame()
+            if not self._store_ready:
+                init_db()
+                self._store_ready = True
+            try:
+                self._sync_store(tf, limit)
+            except Exception as e:
+                # 거래소 요청 실패 시 저장된 캔들로 응답
+                print(f"[Error] OHLCV 동기화 실패 ({tf}): {e}")
+            return Candles.from_rows(CandleRepository.get_candles(self.symbol, tf, limit)).to_frame()
         except Exception as e:
             print(f"[Error] OHLCV 수집 실패 ({tf}): {e}")
             return pd.DataFrame()
 
+    @timed(EXCHANGE_LATENCY, "market_context")
     def fetch_market_context(self):
         """실시간 미결제약정(OI) 및 펀딩비 수집"""
         try:
@@ -0,0 +1,226 @@
+import bisect
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .indicators import _value_area
+
+NAN = float('nan')
+DAY_MS = 86_400_000
+
+class _Rma:
+    """Wilder 평활(RMA) 1-스텝 갱신기 (pandas_ta.rma = ewm(alpha=1/n, adjust=True)와 동일한 점화식)"""
+    __slots__ = ('length', 'decay', 'weighted', 'old_wt', 'nobs')
+
+    def __init__(self, length):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.weighted = NAN
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def clone(self):
+        c = _Rma.__new__(_Rma)
+        c.length, c.decay, c.weighted, c.old_wt, c.nobs = self.length, self.decay, self.weighted, self.old_wt, self.nobs
+        return c
+
+    def step(self, x):
+        is_obs = x == x
+        self.nobs += is_obs
+        if self.weighted == self.weighted:
+            self.old_wt *= self.decay
+            if is_obs:
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + x) / (self.old_wt + 1.0)
+                self.old_wt += 1.0
+        elif is_obs:
+            self.weighted = x
+        return self.weighted if self.nobs >= self.length else NAN
+
+class _BarState:
+    """확정봉까지 누적된 지표 상태 (진행 중인 봉은 복제본 위에서 계산)"""
+    __slots__ = (
+        'prev_close', 'prev_high', 'prev_low',
+        'rsi_pos', 'rsi_neg', 'tr', 'dm_pos', 'dm_neg', 'dx',
+        'session', 'cum_pv', 'cum_vol', 'cum_delta',
+        'values',
+    )
+
+    def __init__(self, length):
+        self.prev_close = self.prev_high = self.prev_low = NAN
+        self.rsi_pos, self.rsi_neg = _Rma(length), _Rma(length)
+        self.tr = _Rma(length)
+        self.dm_pos, self.dm_neg, self.dx = _Rma(length), _Rma(length), _Rma(length)
+        self.session = None
+        self.cum_pv = self.cum_vol = self.cum_delta = 0.0
+        self.values = {}
+
+    def clone(self):
+        c = _BarState.__new__(_BarState)
+        c.prev_close, c.prev_high, c.prev_low = self.prev_close, self.prev_high, self.prev_low
+        c.rsi_pos, c.rsi_neg, c.tr = self.rsi_pos.clone(), self.rsi_neg.clone(), self.tr.clone()
+        c.dm_pos, c.dm_neg, c.dx = self.dm_pos.clone(), self.dm_neg.clone(), self.dx.clone()
+        c.session, c.cum_pv, c.cum_vol, c.cum_delta = self.session, self.cum_pv, self.cum_vol, self.cum_delta
+        c.values = self.values
+        return c
+
+    def apply(self, ts, o, h, l, c, v, tb):
+        pc, ph, pl = self.prev_close, self.prev_high, self.prev_low
+
+        # RSI (pandas_ta.rsi)
+        diff = c - pc
+        rsi_pa = self.rsi_pos.step(max(diff, 0.0) if diff == diff else NAN)
+        rsi_na = self.rsi_neg.step(min(diff, 0.0) if diff == diff else NAN)
+        rsi = 100.0 * rsi_pa / (rsi_pa + abs(rsi_na)) if rsi_pa + abs(rsi_na) != 0 else NAN
+
+        # ATR (pandas_ta.atr, 첫 봉의 TR은 NaN)
+        tr = max(h - l, abs(h - pc), abs(l - pc)) if pc == pc else NAN
+        atr = self.tr.step(tr)
+
+        # ADX (pandas_ta.adx)
+        up, dn = h - ph, pl - l
+        pos = (up if (up > dn and up > 0) else 0.0) if up == up else NAN
+        neg = (dn if (dn > up and dn > 0) else 0.0) if dn == dn else NAN
+        k = 100.0 / atr if atr == atr and atr != 0 else NAN
+        dmp, dmn = k * self.dm_pos.step(pos), k * self.dm_neg.step(neg)
+        dx = 100.0 * abs(dmp - dmn) / (dmp + dmn) if dmp + dmn != 0 else NAN
+        adx = self.dx.step(dx)
+
+        # 세션(일간) VWAP
+        session = ts // DAY_MS
+        if session != self.session:
+            self.session, self.cum_pv, self.cum_vol = session, 0.0, 0.0
+        pv = (h + l + c) / 3 * v
+        if pv == pv: self.cum_pv += pv
+        if v == v: self.cum_vol += v
+        vwap = self.cum_pv / self.cum_vol if self.cum_vol != 0 else NAN
+
+        # CVD (누적 델타)
+        delta = tb - (v - tb)
+        if delta == delta: self.cum_delta += delta
+
+        self.prev_close, self.prev_high, self.prev_low = c, h, l
+        self.values = {
+            'close': c, 'rsi': rsi, 'atr': atr, 'adx': adx,
+            'vwap': vwap if pv == pv else NAN, 'cvd': self.cum_delta if delta == delta else NAN,
+        }
+
+class _VolumeProfileWindow:
+    """최근 N봉 매물대 히스토그램 (가격 범위가 그대로면 증분 갱신, 바뀌면 재구성)"""
+
+    def __init__(self, bins=50, lookback=300):
+        self.bins, self.lookback = bins, lookback
+        self.closes, self.volumes = deque(maxlen=lookback), deque(maxlen=lookback)
+        self.sorted = []
+        self.hist = self.edges = None
+        self.range = None
+        self.dirty_ops = 0
+
+    def push(self, c, v):
+        if len(self.closes) == self.lookback:
+            self._remove(self.closes[0], self.volumes[0])
+        self.closes.append(c); self.volumes.append(v)
+        self._add(c, v)
+
+    def replace_last(self, c, v):
+        old_c, old_v = self.closes[-1], self.volumes[-1]
+        self.closes[-1], self.volumes[-1] = c, v
+        self._remove(old_c, old_v)
+        self._add(c, v)
+
+    def _add(self, c, v):
+        bisect.insort(self.sorted, c)
+        self._patch(c, v)
+
+    def _remove(self, c, v):
+        del self.sorted[bisect.bisect_left(self.sorted, c)]
+        self._patch(c, -v)
+
+    def _patch(self, c, v):
+        # 범위가 바뀌었거나 부동소수 오차가 쌓였으면 다음 조회 시 재구성
+        if self.hist is None or not self.sorted or self.range != (self.sorted[0], self.sorted[-1]) or self.dirty_ops >= self.lookback:
+            self.hist = None
+            return
+        self.hist[self._bin(c)] += v
+        self.dirty_ops += 1
+
+    def _bin(self, x):
+        # np.histogram의 균등 구간 인덱스 계산과 동일
+        edges, first, last = self.edges, self.edges[0], self.edges[-1]
+        i = int((x - first) * (self.bins / (last - first)))
+        if i == self.bins: i -= 1
+        if x < edges[i]: i -= 1
+        elif x >= edges[i + 1] and i != self.bins - 1: i += 1
+        return i
+
+    def profile(self):
+        if len(self.closes) < 20:
+            return {'poc': 0.0, 'vah': 0.0, 'val': 0.0, 'lookback': 0}
+        if self.hist is None:
+            self.hist, self.edges = np.histogram(
+                np.fromiter(self.closes, float, len(self.closes)), bins=self.bins,
+                weights=np.fromiter(self.volumes, float, len(self.volumes))
+            )
+            self.hist = self.hist.astype(np.float64)
+            self.range = (self.sorted[0], self.sorted[-1])
+            self.dirty_ops = 0
+        vp = _value_area(self.hist, self.edges)
+        vp['lookback'] = len(self.closes)
+        return vp
+
+def _to_ms(ts):
+    if isinstance(ts, (int, np.integer)):
+        return int(ts)
+    return pd.Timestamp(ts).value // 1_000_000
+
+class IncrementalIndicators:
+    """(심볼, 타임프레임)별 상태형 지표 엔진: 캔들 1개당 O(1)로 RSI/ATR/ADX/VWAP/CVD/매물대 갱신"""
+
+    def __init__(self, length=14, vp_bins=50, vp_lookback=300):
+        self.length = length
+        self._committed = _BarState(length)
+        self._live = None
+        self._live_ts = None
+        self._live_in_vp = False
+        self._vp = _VolumeProfileWindow(vp_bins, vp_lookback)
+        self._lock = threading.Lock()
+
+    @property
+    def last_timestamp(self):
+        return self._live_ts
+
+    def update(self, ts, open, high, low, close, volume, taker_buy_vol=NAN):
+        """새 캔들 또는 진행 중인 캔들 갱신 반영 (같은 timestamp면 덮어쓰기, 과거 캔들은 무시)"""
+        ts = _to_ms(ts)
+        with self._lock:
+            if self._live_ts is not None and ts < self._live_ts:
+                return False
+            replace = ts == self._live_ts
+            if not replace and self._live is not None:
+                self._committed = self._live
+            c, v = float(close), float(volume)
+            live = self._committed.clone()
+            live.apply(ts, float(open), float(high), float(low), c, v, float(taker_buy_vol))
+            self._live, self._live_ts = live, ts
+            if c == c:
+                if replace and self._live_in_vp: self._vp.replace_last(c, v)
+                else: self._vp.push(c, v)
+            self._live_in_vp = c == c or (replace and self._live_in_vp)
+            return True
+
+    def ingest_frame(self, df):
+        """fetch_ohlcv 형식의 DataFrame을 순서대로 반영 (초기 워밍업용)"""
+        tb = df['taker_buy_vol'] if 'taker_buy_vol' in df.columns else pd.Series(NAN, index=df.index)
+        for row in zip(df.index, df['open'], df['high'], df['low'], df['close'], df['volume'], tb):
+            self.update(*row)
+
+    def snapshot(self):
+        """최신 캔들 기준 지표 값 (analyze_data_advanced와 같은 키 사용)"""
+        with self._lock:
+            if self._live is None:
+                return {}
+            vals = dict(self._live.values)
+            vals['vp'] = self._vp.profile()
+        return vals
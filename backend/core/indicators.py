@@ -1,7 +1,9 @@
 import numpy as np
 import pandas as pd
-import pandas_ta as ta
 
+from .metrics import COMPUTE_TIME, timed
+
+@timed(COMPUTE_TIME, "calculate_vwap")
 def calculate_vwap(df):
     """지수/세션별 VWAP 계산"""
     # 일간 VWAP (session-based)
@@ -14,7 +16,8 @@ def calculate_vwap(df):
     groups = df.groupby('date', group_keys=False)
     return groups['pv'].cumsum() / groups['volume'].cumsum()
 
-def calculate_volume_profile(df, bins=50, lookback=300):
+@timed(COMPUTE_TIME, "calculate_volume_profile")
+def calculate_volume_profile(df, bins=50, lookback=300, va_ratio=0.7):
     """매물대 분석 (AVP/Volume Profile)"""
     sliced_df = df.tail(lookback)
     if len(sliced_df) < 20:
@@ -22,12 +25,17 @@ def calculate_volume_profile(df, bins=50, lookback=300):
         
     price, volume = sliced_df['close'].values, sliced_df['volume'].values
     hist, bin_edges = np.histogram(price, bins=bins, weights=volume)
-    
+    vp = _value_area(hist, bin_edges, va_ratio)
+    vp['lookback'] = len(sliced_df)
+    return vp
+
+def _value_area(hist, bin_edges, va_ratio=0.7):
+    """히스토그램에서 POC 및 Value Area(VAH/VAL) 도출"""
     max_idx = np.argmax(hist)
     poc = (bin_edges[max_idx] + bin_edges[max_idx + 1]) / 2
     
     total_vol = np.sum(hist)
-    target_vol = total_vol * 0.7
+    target_vol = total_vol * va_ratio
     current_vol, l_idx, u_idx = hist[max_idx], max_idx, max_idx
     
     while current_vol < target_vol and (l_idx > 0 or u_idx < len(hist) - 1):
@@ -44,9 +52,9 @@ def calculate_volume_profile(df, bins=50, lookback=300):
         'poc': float(poc),
         'vah': float(bin_edges[u_idx + 1]),
         'val': float(bin_edges[l_idx]),
-        'lookback': len(sliced_df)
     }
 
+@timed(COMPUTE_TIME, "detect_divergences")
 def detect_divergences(df, window=10):
     """RSI 및 CVD 다이버전스 감지"""
     if len(df) < window * 2:
@@ -71,61 +79,95 @@ def detect_divergences(df, window=10):
             
     return cvd_div, rsi_div
 
-def detect_smc_structure(df, lookback=200):
+def _f64(s):
+    return np.asarray(s, dtype=np.float64)
+
+def _scan_smc_arrays(high, low, open_, close, volume, atr, vol_sma, fvg_atr=0.5, ob_atr=1.8, ob_volume=1.5):
+    """NumPy 배열 기반 FVG/OB 스캐너 (시프트 마스크 + 역방향 누적 최소/최대로 미완화 판정)
+
+    fvg_atr: FVG 최소 갭(ATR 배수), ob_atr/ob_volume: OB 기준 강한 캔들의 몸통(ATR 배수)과 거래량(20봉 평균 배수)
+    """
+    n = len(close)
+    idx = np.arange(2, n - 1)
+    if len(idx) == 0:
+        return [], []
+
+    # 1. FVG (Fair Value Gap): c1 = i-2, c3 = i
+    c1_h, c1_l = high[idx - 2], low[idx - 2]
+    c3_h, c3_l = high[idx], low[idx]
+    atr_i = atr[idx]
+    with np.errstate(invalid='ignore'):
+        gap = np.where(c1_h < c3_l, np.abs(c1_h - c3_l), np.abs(c1_l - c3_h))
+        bull_fvg = (c1_h < c3_l) & (gap > atr_i * fvg_atr)
+        bear_fvg = ~bull_fvg & (c1_l > c3_h) & (gap > atr_i * fvg_atr)
+
+        # 2. OB (Order Block) - 강한 캔들 직전(최대 4봉)의 반대 색 캔들
+        body = np.abs(close[idx] - open_[idx])
+        strong = (body > atr_i * ob_atr) & (volume[idx] > vol_sma[idx] * ob_volume)
+        up_candle = close > open_
+        down_candle = close < open_
+    strong_bull = strong & up_candle[idx]
+    strong_bear = strong & ~up_candle[idx]
+
+    ob_j = np.full(len(idx), -1)
+    ob_bull = np.zeros(len(idx), dtype=bool)
+    # 가까운 캔들부터 찾아야 하므로 먼 오프셋부터 덮어쓴다
+    for k in range(4, 0, -1):
+        j = idx - k
+        valid = j >= 1
+        jc = np.where(valid, j, 0)
+        hit_bull = strong_bull & valid & down_candle[jc]
+        hit_bear = strong_bear & valid & up_candle[jc]
+        ob_j = np.where(hit_bull | hit_bear, j, ob_j)
+        ob_bull = np.where(hit_bull | hit_bear, hit_bull, ob_bull)
+
+    # 미완화(Mitigation) 체크: 이후 구간의 최저가/최고가 (NaN 무시)
+    fut_low = np.append(np.fmin.accumulate(low[::-1])[::-1], np.nan)
+    fut_high = np.append(np.fmax.accumulate(high[::-1])[::-1], np.nan)
+
+    fvg_top = np.where(bull_fvg, c3_l, c1_l)
+    fvg_bottom = np.where(bull_fvg, c1_h, c3_h)
+    with np.errstate(invalid='ignore'):
+        fvg_keep = np.where(bull_fvg, ~(fut_low[idx + 1] < fvg_bottom), ~(fut_high[idx + 1] > fvg_top))
+    fvg_sel = np.flatnonzero((bull_fvg | bear_fvg) & fvg_keep)[-2:]
+    v_fvgs = [
+        {'type': 'BullFVG' if bull_fvg[s] else 'BearFVG', 'top': fvg_top[s], 'bottom': fvg_bottom[s], 'idx': int(idx[s])}
+        for s in fvg_sel
+    ]
+
+    has_ob = ob_j >= 0
+    oj = np.where(has_ob, ob_j, 0)
+    ob_top, ob_bottom = high[oj], low[oj]
+    with np.errstate(invalid='ignore'):
+        ob_keep = np.where(ob_bull, ~(fut_low[oj + 1] < ob_bottom), ~(fut_high[oj + 1] > ob_top))
+    ob_sel = np.flatnonzero(has_ob & ob_keep)[-2:]
+    v_obs = [
+        {'type': 'BullOB' if ob_bull[s] else 'BearOB', 'top': ob_top[s], 'bottom': ob_bottom[s], 'idx': int(oj[s])}
+        for s in ob_sel
+    ]
+    return v_fvgs, v_obs
+
+@timed(COMPUTE_TIME, "detect_smc_structure")
+def detect_smc_structure(df, lookback=200, fvg_atr=0.5, ob_atr=1.8, ob_volume=1.5):
     """SMC(Smart Money Concept) 구조물 감지 (OB, FVG)"""
-    df_recent = df.iloc[-lookback:].copy()
+    df_recent = df.iloc[-lookback:]
     if len(df_recent) < 20:
         return [], []
     
     # 보조 지표 필요 (ATR, Volume SMA)
-    if 'atr' not in df_recent.columns:
-        df_recent['atr'] = ta.atr(df_recent['high'], df_recent['low'], df_recent['close'], length=14)
-    df_recent['vol_sma'] = df_recent['volume'].rolling(20).mean()
-    
-    unmit_fvgs, unmit_obs = [], []
-    
-    for i in range(2, len(df_recent) - 1):
-        # 1. FVG (Fair Value Gap)
-        c1_h, c1_l = df_recent['high'].iloc[i-2], df_recent['low'].iloc[i-2]
-        c3_h, c3_l = df_recent['high'].iloc[i], df_recent['low'].iloc[i]
-        gap = abs(c1_h - c3_l) if c1_h < c3_l else abs(c1_l - c3_h)
-        atr_i = df_recent['atr'].iloc[i]
-        
-        if c1_h < c3_l and gap > atr_i * 0.5:
-            unmit_fvgs.append({'type': 'BullFVG', 'top': c3_l, 'bottom': c1_h, 'idx': i})
-        elif c1_l > c3_h and gap > atr_i * 0.5:
-            unmit_fvgs.append({'type': 'BearFVG', 'top': c1_l, 'bottom': c3_h, 'idx': i})
-            
-        # 2. OB (Order Block) - 강한 캔들 기준
-        body = abs(df_recent['close'].iloc[i] - df_recent['open'].iloc[i])
-        if body > (atr_i * 1.8) and df_recent['volume'].iloc[i] > (df_recent['vol_sma'].iloc[i] * 1.5):
-            if df_recent['close'].iloc[i] > df_recent['open'].iloc[i]: # 강세
-                for j in range(i-1, max(0, i-5), -1):
-                    if df_recent['close'].iloc[j] < df_recent['open'].iloc[j]:
-                        unmit_obs.append({'type': 'BullOB', 'top': df_recent['high'].iloc[j], 'bottom': df_recent['low'].iloc[j], 'idx': j})
-                        break
-            else: # 약세
-                for j in range(i-1, max(0, i-5), -1):
-                    if df_recent['close'].iloc[j] > df_recent['open'].iloc[j]:
-                        unmit_obs.append({'type': 'BearOB', 'top': df_recent['high'].iloc[j], 'bottom': df_recent['low'].iloc[j], 'idx': j})
-                        break
-                        
-    # 미완화(Mitigation) 체크
-    v_fvgs, v_obs = [], []
-    for f in unmit_fvgs:
-        sub = df_recent.iloc[f['idx']+1:]
-        if f['type'] == 'BullFVG' and sub['low'].min() < f['bottom']: continue
-        if f['type'] == 'BearFVG' and sub['high'].max() > f['top']: continue
-        v_fvgs.append(f)
-        
-    for o in unmit_obs:
-        sub = df_recent.iloc[o['idx']+1:]
-        if o['type'] == 'BullOB' and sub['low'].min() < o['bottom']: continue
-        if o['type'] == 'BearOB' and sub['high'].max() > o['top']: continue
-        v_obs.append(o)
-        
-    return v_fvgs[-2:], v_obs[-2:]
+    if 'atr' in df_recent.columns:
+        atr = df_recent['atr']
+    else:
+        import pandas_ta as ta
+        atr = ta.atr(df_recent['high'], df_recent['low'], df_recent['close'], length=14)
+    vol_sma = df_recent['volume'].rolling(20).mean()
+
+    return _scan_smc_arrays(
+        _f64(df_recent['high']), _f64(df_recent['low']), _f64(df_recent['open']), _f64(df_recent['close']),
+        _f64(df_recent['volume']), _f64(atr), _f64(vol_sma), fvg_atr, ob_atr, ob_volume
+    )
 
+@timed(COMPUTE_TIME, "detect_liquidity_sweep")
 def detect_liquidity_sweep(df, window=30):
     """리퀴디티 휩소(Sweep) 감지"""
     if len(df) < window + 5:
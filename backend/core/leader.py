@@ -0,0 +1,73 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+
+from .async_repository import run_db
+from .repository import LeaseRepository
+
+class LeaderElection:
+    """여러 워커 중 하나만 백그라운드 작업(가상 매매 감시, 선계산)을 실행하도록 DB 리스로 리더 선출
+
+    리더는 ttl/3마다 리스를 연장하고, 연장이 끊기면(프로세스 종료 등) ttl 뒤 다른 워커가 넘겨받는다.
+    리스 갱신에 실패하면 두 워커가 동시에 리더가 되지 않도록 바로 물러난다.
+    """
+
+    def __init__(self, name, on_elected, on_demoted, ttl=15.0, owner=None, clock=time.time):
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.clock = clock
+        self.is_leader = False
+        self.elections = 0
+        self._task = None
+
+    async def step(self):
+        """리스 획득/연장을 한 번 시도하고 리더 여부가 바뀌면 콜백 실행"""
+        try:
+            acquired = await run_db(LeaseRepository.acquire, self.name, self.owner, self.clock(), self.ttl)
+        except Exception as e:
+            print(f"[Error] 리더 리스 갱신 실패 ({self.name}): {e}")
+            acquired = False
+        if acquired and not self.is_leader:
+            self.is_leader = True
+            self.elections += 1
+            print(f"[LEADER] {self.owner} elected for {self.name}")
+            await self.on_elected()
+        elif not acquired and self.is_leader:
+            self.is_leader = False
+            print(f"[LEADER] {self.owner} lost {self.name}")
+            await self.on_demoted()
+        return self.is_leader
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Error] 리더 전환 처리 실패 ({self.name}): {e}")
+            await asyncio.sleep(self.ttl / 3)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """선출 중단 (리더였으면 작업을 멈추고 리스를 바로 반납해 다른 워커가 기다리지 않게 함)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.is_leader:
+            self.is_leader = False
+            await self.on_demoted()
+            await run_db(LeaseRepository.release, self.name, self.owner)
+
+    def status(self):
+        return {"name": self.name, "owner": self.owner, "is_leader": self.is_leader, "elections": self.elections,
+                "lease": LeaseRepository.get(self.name)}
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import re
+import threading
+import time
+
+from .cache import TTLCache
+from .metrics import LLM_ERRORS, LLM_LATENCY
+from .repository import LLMResultRepository
+
+class LLMBudgetExceeded(Exception):
+    """요청/토큰 예산 부족으로 대기 한도 안에 호출할 수 없음"""
+
+class GeminiBackend:
+    """google-genai 클라이언트 호출 (client를 주지 않으면 첫 호출 시 api_key로 생성)"""
+
+    def __init__(self, client=None, api_key=None):
+        self._client = client
+        self.api_key = api_key
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from google import genai  # import만 수백 ms 걸려 기동 시점에서 제외
+                    self._client = genai.Client(api_key=self.api_key)
+        return self._client
+
+    def generate(self, model, prompt, json_mode=False):
+        config = {'response_mime_type': 'application/json'} if json_mode else None
+        return self.client.models.generate_content(model=model, contents=prompt, config=config).text
+
+    def stream(self, model, prompt):
+        for chunk in self.client.models.generate_content_stream(model=model, contents=prompt):
+            if chunk.text: yield chunk.text
+
+class StubBackend:
+    """로컬 스텁 (테스트/개발용): responder(prompt, json_mode) 결과 또는 고정 문구 반환
+
+    stream()은 같은 결과를 chunk_size 글자씩 chunk_delay 간격으로 나눠 내보내는 가짜 생성기
+    """
+
+    def __init__(self, responder=None, chunk_size=16, chunk_delay=0.0):
+        self.responder = responder
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.calls = []
+
+    def generate(self, model, prompt, json_mode=False):
+        self.calls.append(prompt)
+        if self.responder:
+            return self.responder(prompt, json_mode)
+        return "{}" if json_mode else f"[stub] {prompt[:80]}"
+
+    def stream(self, model, prompt):
+        text = self.generate(model, prompt)
+        for i in range(0, len(text), self.chunk_size):
+            if self.chunk_delay: time.sleep(self.chunk_delay)
+            yield text[i:i + self.chunk_size]
+
+class _Budget:
+    """초당 요청 수(QPS)와 분당 토큰 수(TPM) 토큰 버킷 (0이면 해당 한도 없음)"""
+
+    def __init__(self, qps, tokens_per_minute, burst=1.0):
+        if qps < 0 or tokens_per_minute < 0:
+            raise ValueError(f"LLM 예산은 0(무제한) 이상이어야 함: qps={qps}, tpm={tokens_per_minute}")
+        self.qps = qps
+        self.tpm = tokens_per_minute
+        self.req_capacity = max(1.0, burst)
+        self.requests = self.req_capacity
+        self.tokens = float(tokens_per_minute)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed, self.last = now - self.last, now
+        self.requests = min(self.req_capacity, self.requests + elapsed * self.qps) if self.qps else self.req_capacity
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60) if self.tpm else 0.0
+
+    def acquire(self, cost, timeout):
+        cost = min(cost, self.tpm) if self.tpm else 0
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.requests >= 1 and self.tokens >= cost:
+                    self.requests -= 1
+                    self.tokens -= cost
+                    return
+                wait = max((1 - self.requests) / self.qps if self.qps else 0.0,
+                           (cost - self.tokens) * 60 / self.tpm if self.tpm else 0.0, 0.01)
+            if now + wait > deadline:
+                raise LLMBudgetExceeded(f"LLM budget exceeded (429): retry in {wait:.1f}s")
+            time.sleep(wait)
+
+def normalize_prompt(prompt):
+    """줄 앞뒤 공백·빈 줄·연속 공백 제거 (들여쓴 f-string 프롬프트도 같은 키로)"""
+    lines = (re.sub(r'[ \t]+', ' ', line).strip() for line in prompt.strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+def prompt_hash(model, prompt):
+    return hashlib.sha256(f"{model}\0{prompt}".encode('utf-8')).hexdigest()
+
+class LLMGateway:
+    """LLM 호출 창구
+
+    - 정규화한 프롬프트의 해시로 결과를 DB(llm_results)에 저장해 같은 입력은 다시 호출하지 않음
+    - 동시에 들어온 같은 요청은 한 번만 호출 (메모리 TTLCache 단일 비행)
+    - 여러 작은 작업을 JSON 한 번의 호출로 묶어 처리 (결과는 작업별 해시로 저장)
+    - QPS/TPM 예산을 넘으면 max_wait까지 대기 후 LLMBudgetExceeded
+    - 저장된 결과는 result_ttl초 뒤 만료 (purge_results로 정리, None이면 영구 보관)
+    """
+
+    def __init__(self, backend, model='gemini-flash-latest', qps=1.0, tokens_per_minute=250000,
+                 max_wait=30.0, output_tokens=512, result_ttl=7 * 86400):
+        self.backend = backend
+        self.model = model
+        self.budget = _Budget(qps, tokens_per_minute)
+        self.max_wait = max_wait
+        self.output_tokens = output_tokens
+        self.result_ttl = result_ttl
+        self._memory = TTLCache("llm", ttl=3600, maxsize=256)
+        self.requests = self.store_hits = self.backend_calls = 0
+        self.batched_tasks = self.budget_rejections = self.estimated_tokens = 0
+        self._lock = threading.Lock()
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _acquire(self, prompt):
+        cost = len(prompt) // 4 + self.output_tokens
+        try:
+            self.budget.acquire(cost, self.max_wait)
+        except LLMBudgetExceeded:
+            self._count(budget_rejections=1)
+            raise
+        self._count(backend_calls=1, estimated_tokens=cost)
+
+    def _call(self, prompt, json_mode=False):
+        self._acquire(prompt)
+        mode = "json" if json_mode else "text"
+        start = time.perf_counter()
+        try:
+            return self.backend.generate(self.model, prompt, json_mode)
+        except Exception:
+            LLM_ERRORS.inc(mode)
+            raise
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - start, mode)
+
+    def _lookup(self, key):
+        try:
+            row = LLMResultRepository.get_result(key, self.result_ttl)
+        except Exception as e:
+            print(f"[Error] LLM 결과 조회 실패: {e}")
+            return None
+        if row is not None:
+            self._count(store_hits=1)
+        return row
+
+    def purge_results(self):
+        """result_ttl이 지난 저장 결과 삭제 (삭제 건수)"""
+        if self.result_ttl is None:
+            return 0
+        return LLMResultRepository.purge(time.time() - self.result_ttl)
+
+    def _save(self, key, response):
+        try:
+            LLMResultRepository.save_result(key, self.model, response)
+        except Exception as e:
+            print(f"[Error] LLM 결과 저장 실패: {e}")
+
+    def generate(self, prompt, cache=True):
+        """단일 프롬프트 생성 (cache=False면 저장소를 거치지 않고 매번 호출)"""
+        prompt = normalize_prompt(prompt)
+        self._count(requests=1)
+        if not cache:
+            return self._call(prompt)
+        key = prompt_hash(self.model, prompt)
+
+        def load():
+            stored = self._lookup(key)
+            if stored is not None:
+                return stored
+            response = self._call(prompt)
+            self._save(key, response)
+            return response
+        return self._memory.get_or_load(key, load)
+
+    def generate_stream(self, prompt):
+        """생성되는 텍스트 조각을 순서대로 yield (저장된 결과가 있으면 한 번에, 완료 후 전체 응답 저장)"""
+        prompt = normalize_prompt(prompt)
+        self._count(requests=1)
+        key = prompt_hash(self.model, prompt)
+        stored = self._memory.get(key) or self._lookup(key)
+        if stored is not None:
+            yield stored
+            return
+        self._acquire(prompt)
+        parts = []
+        start = time.perf_counter()
+        try:
+            for chunk in self.backend.stream(self.model, prompt):
+                if not parts: LLM_LATENCY.observe(time.perf_counter() - start, "stream_first_chunk")
+                parts.append(chunk)
+                yield chunk
+        except Exception:
+            LLM_ERRORS.inc("stream")
+            raise
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - start, "stream")
+        response = "".join(parts)
+        self._save(key, response)
+        self._memory.set(key, response)
+
+    def generate_batch(self, tasks):
+        """{이름: 프롬프트} 작업 묶음을 한 번의 JSON 출력 호출로 처리해 {이름: 응답} 반환
+
+        이미 저장된 작업은 건너뛰고, 묶음 응답에서 빠진 작업은 개별 호출로 보완한다.
+        """
+        prompts = {name: normalize_prompt(p) for name, p in tasks.items()}
+        keys = {name: prompt_hash(self.model, p) for name, p in prompts.items()}
+        self._count(requests=len(tasks))
+        results = {}
+        for name, key in keys.items():
+            cached = self._memory.get(key)
+            results[name] = cached if cached is not None else self._lookup(key)
+        pending = [name for name in tasks if results[name] is None]
+
+        if len(pending) > 1:
+            body = "\n\n".join(f"### {name}\n{prompts[name]}" for name in pending)
+            combined = (
+                "Complete each task below independently. Return only a JSON object whose keys are the task names "
+                f"({', '.join(pending)}) and whose values are the plain-text answers.\n\n{body}"
+            )
+            self._count(batched_tasks=len(pending))
+            try:
+                answers = json.loads(self._call(combined, json_mode=True))
+            except LLMBudgetExceeded:
+                raise
+            except Exception as e:
+                print(f"[DEBUG] LLM 묶음 응답 해석 실패: {e}")
+                answers = {}
+            for name in pending:
+                answer = answers.get(name) if isinstance(answers, dict) else None
+                if isinstance(answer, str) and answer.strip():
+                    results[name] = answer
+                    self._save(keys[name], answer)
+                    self._memory.set(keys[name], answer)
+
+        for name in tasks:
+            if results[name] is None:
+                results[name] = self.generate(prompts[name])
+                self._count(requests=-1)  # 위에서 이미 집계
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests, "store_hits": self.store_hits, "backend_calls": self.backend_calls,
+                "batched_tasks": self.batched_tasks, "budget_rejections": self.budget_rejections,
+                "estimated_tokens": self.estimated_tokens, "memory": self._memory.stats(),
+            }
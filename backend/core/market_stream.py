@@ -0,0 +1,148 @@
+import asyncio
+import json
+import time
+
+from .metrics import QUEUE_DROPS
+
+BINANCE_WS_URL = "wss://fstream.binance.com/stream?streams="
+
+class BinanceStreamSource:
+    """바이낸스 선물 웹소켓 (심볼별 aggTrade 시세 + 기준 심볼의 타임프레임별 kline) 소스"""
+    live = True
+
+    def __init__(self, symbol='BTC/USDT', timeframes=('1m', '5m', '15m', '1h', '4h', '1d'), price_symbols=None):
+        self.symbol = symbol
+        self.timeframes = list(timeframes)
+        # 체결 시세를 받을 심볼 목록 (기준 심볼 포함)
+        self.price_symbols = list(dict.fromkeys([symbol, *(price_symbols or [])]))
+        self._by_stream_id = {s.replace('/', ''): s for s in self.price_symbols}
+
+    def _url(self):
+        base = self.symbol.replace('/', '').lower()
+        streams = [f"{s.replace('/', '').lower()}@aggTrade" for s in self.price_symbols]
+        streams += [f"{base}@kline_{tf}" for tf in self.timeframes]
+        return BINANCE_WS_URL + "/".join(streams)
+
+    async def stream(self):
+        import websockets
+        async with websockets.connect(self._url(), ping_interval=20, ping_timeout=20) as ws:
+            async for raw in ws:
+                event = self.parse(json.loads(raw).get('data', {}))
+                if event: yield event
+
+    def parse(self, data):
+        symbol = self._by_stream_id.get(data.get('s'), self.symbol)
+        if data.get('e') == 'aggTrade':
+            return {'type': 'price', 'symbol': symbol, 'price': float(data['p']), 'ts': data['T']}
+        if data.get('e') == 'kline':
+            k = data['k']
+            return {
+                'type': 'kline', 'symbol': symbol, 'tf': k['i'], 't': k['t'],
+                'o': float(k['o']), 'h': float(k['h']), 'l': float(k['l']), 'c': float(k['c']),
+                'v': float(k['v']), 'tb': float(k['V']), 'closed': k['x'],
+            }
+        return None
+
+class ReplaySource:
+    """로컬 재생 소스 (테스트/개발용): 이벤트 목록 또는 JSONL 파일을 순서대로 방출"""
+    live = False
+
+    def __init__(self, events, interval=0.0):
+        self.events = events
+        self.interval = interval
+
+    @classmethod
+    def from_file(cls, path, interval=0.0):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls([json.loads(line) for line in f if line.strip()], interval)
+
+    async def stream(self):
+        for event in self.events:
+            yield event
+            await asyncio.sleep(self.interval)
+
+class MarketDataHub:
+    """단일 시세 스트림을 유지하고 구독자(매매 감시, SSE 클라이언트)에게 팬아웃"""
+
+    def __init__(self, source, price_interval=0.25, max_backoff=30.0):
+        self.source = source
+        self.price_interval = price_interval
+        self.max_backoff = max_backoff
+        self.last_price = None
+        self.last_prices = {}  # 심볼별 최신 체결가
+        self.last_klines = {}
+        self.connected = False
+        self._subscribers = {}
+        self._last_price_pub = {}  # 심볼별 마지막 시세 발행 시각
+        self._task = None
+
+    def subscribe(self, kinds=None, throttled=True, maxsize=100):
+        """이벤트 큐 등록 (kinds: 수신할 종류 {'price', 'kline'}, throttled: 체결 시세를 price_interval 간격으로만 수신)"""
+        q = asyncio.Queue(maxsize=maxsize)
+        self._subscribers[q] = (set(kinds) if kinds else None, throttled)
+        return q
+
+    def unsubscribe(self, q):
+        self._subscribers.pop(q, None)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self):
+        """스트림 수신 루프 (연결 실패/종료 시 지수 백오프로 재연결)"""
+        backoff = min(1.0, self.max_backoff)
+        while True:
+            try:
+                async for event in self.source.stream():
+                    self.connected = True
+                    backoff = min(1.0, self.max_backoff)
+                    self.handle(event)
+                if not self.source.live:
+                    break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[MARKET STREAM ERROR] {e}")
+            self.connected = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+        self.connected = False
+
+    def handle(self, event):
+        throttle_ok = True
+        if event['type'] == 'kline':
+            self.last_klines[event['tf']] = event
+        elif event['type'] == 'price':
+            self.last_price = self.last_prices[event['symbol']] = event['price']
+            now, last_pub = time.monotonic(), self._last_price_pub.get(event['symbol'])
+            throttle_ok = last_pub is None or now - last_pub >= self.price_interval
+            if throttle_ok: self._last_price_pub[event['symbol']] = now
+        self.publish(event, throttle_ok)
+
+    def publish(self, event, throttle_ok=True):
+        for q, (kinds, throttled) in list(self._subscribers.items()):
+            if kinds is not None and event['type'] not in kinds:
+                continue
+            if throttled and not throttle_ok:
+                continue
+            if q.full():
+                # 느린 구독자는 가장 오래된 이벤트를 버림
+                try:
+                    q.get_nowait()
+                    QUEUE_DROPS.inc("market")
+                except asyncio.QueueEmpty:
+                    pass
+            q.put_nowait(event)
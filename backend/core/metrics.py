@@ -0,0 +1,194 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+
+# 초 단위 지연 버킷 (1ms ~ 30s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = {}
+_collectors = []
+_registry_lock = threading.Lock()
+
+def _label_text(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def _number(value):
+    if value == float('inf'): return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """단조 증가 카운터 (라벨 값은 위치 인자 순서대로)"""
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labels, k)} {_number(v)}" for k, v in items]
+
+class Histogram:
+    """누적 버킷 히스토그램 (관측 1회 = 이분 탐색 + 잠금 아래 정수 증가)"""
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # 라벨 값 → [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return series[-1] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), series):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, ('le', _number(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {series[-1]}")
+        return lines
+
+def _register(cls, name, help, labels, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help, labels, **kwargs)
+        return metric
+
+def counter(name, help, labels=()):
+    """이름별로 하나만 생성 (모듈이 다시 import되어도 같은 객체)"""
+    return _register(Counter, name, help, labels)
+
+def histogram(name, help, labels=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram, name, help, labels, buckets=buckets)
+
+def register_collector(fn):
+    """조회 시점에 값을 읽어오는 지표 등록: fn() → [(이름, 종류, 설명, 라벨 이름, {라벨 값 튜플: 값})]"""
+    _collectors.append(fn)
+    return fn
+
+def unregister_collector(fn):
+    """register_collector로 등록한 함수 제거 (없으면 무시)"""
+    try:
+        _collectors.remove(fn)
+    except ValueError:
+        pass
+
+def timed(metric, *label_values):
+    """함수 실행 시간을 히스토그램에 기록하는 데코레이터 (동기/코루틴 함수)"""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    metric.observe(time.perf_counter() - start, *label_values)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - start, *label_values)
+        return wrapper
+    return decorator
+
+class HttpMetricsMiddleware:
+    """요청 수신부터 응답 헤더 전송까지의 시간을 라우트 템플릿별로 기록하는 ASGI 미들웨어
+
+    본문 전송 완료가 아니라 http.response.start 시점에 기록하므로 SSE 스트림도 연결 지연만 잡힌다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                route = getattr(scope.get("route"), "path", "unmatched")
+                HTTP_LATENCY.observe(time.perf_counter() - start, scope["method"], route, str(message["status"]))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+def render():
+    """Prometheus 텍스트 형식 (version 0.0.4)"""
+    lines = []
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    for collect in _collectors:
+        try:
+            groups = collect()
+        except Exception as e:
+            print(f"[Error] 지표 수집 실패 ({getattr(collect, '__name__', collect)}): {e}")
+            continue
+        for name, kind, help, labels, values in groups:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in sorted(values.items()):
+                if value is None: continue
+                lines.append(f"{name}{_label_text(labels, key)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+# 공용 지표 (여러 모듈에서 기록)
+EXCHANGE_LATENCY = histogram("quant_exchange_request_seconds", "거래소/외부 데이터 요청 지연", ("endpoint",))
+COMPUTE_TIME = histogram("quant_compute_seconds", "캔들 수집·지표·분석 함수 실행 시간", ("fn",))
+DB_CALL_TIME = histogram("quant_db_call_seconds", "비동기 Repository 호출 시간 (DB 스레드 대기 포함)", ("method",))
+DB_LOCK_WAIT = histogram("quant_db_lock_wait_seconds", "쓰기 트랜잭션 락(BEGIN IMMEDIATE) 대기 시간")
+LLM_LATENCY = histogram("quant_llm_request_seconds", "LLM 백엔드 호출 시간", ("mode",))
+LLM_ERRORS = counter("quant_llm_errors_total", "LLM 백엔드 호출 실패", ("mode",))
+QUEUE_DROPS = counter("quant_stream_queue_drops_total", "느린 구독자로 인해 버려진 스트림 이벤트", ("stream",))
+HTTP_LATENCY = histogram("quant_http_request_seconds", "HTTP 요청 수신 ~ 응답 시작 시간", ("method", "route", "status"))
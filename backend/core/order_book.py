@@ -0,0 +1,130 @@
+import bisect
+import threading
+
+from .database import DEFAULT_SYMBOL
+from .repository import TradeRepository
+
+def _resolve(trade, price):
+    """monitor_trades와 동일한 체결/청산 규칙 (해당 없으면 None)"""
+    side, status = trade['side'], trade['status']
+    if status == 'PENDING':
+        if side == 'LONG' and price <= trade['entry']: return 'OPEN'
+        if side == 'SHORT' and price >= trade['entry']: return 'OPEN'
+    elif status == 'OPEN':
+        if side == 'LONG':
+            if price >= trade['tp']: return 'WIN'
+            if price <= trade['sl']: return 'LOSS'
+        elif side == 'SHORT':
+            if price <= trade['tp']: return 'WIN'
+            if price >= trade['sl']: return 'LOSS'
+    return None
+
+class VirtualOrderBook:
+    """가상 매매 인메모리 트리거 인덱스
+
+    진입/TP/SL 가격을 '가격 이하 시 발동'(below)과 '가격 이상 시 발동'(above) 두 정렬 목록으로 관리하고,
+    틱마다 현재가를 이분 탐색해 넘어선 레벨만 꺼내 평가한다. 상태 전이는 한 트랜잭션으로 DB에 반영.
+    """
+
+    def __init__(self, symbol=DEFAULT_SYMBOL):
+        self.symbol = symbol
+        self._trades = {}
+        self._below = []  # (level, id): price <= level 이면 발동
+        self._above = []  # (level, id): price >= level 이면 발동
+        self._lock = threading.Lock()
+
+    def load(self):
+        """virtual_trades에서 해당 심볼의 PENDING/OPEN 매매로 인덱스 재구성"""
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        self._trades, self._below, self._above = {}, [], []
+        for t in TradeRepository.get_active_trades(self.symbol):
+            self._add(t)
+
+    def _levels(self, trade):
+        side, status = trade['side'], trade['status']
+        if status == 'PENDING':
+            if side == 'LONG': return [(self._below, trade['entry'])]
+            if side == 'SHORT': return [(self._above, trade['entry'])]
+        if status == 'OPEN':
+            if side == 'LONG':
+                return [(self._above, trade['tp']), (self._below, trade['sl'])]
+            if side == 'SHORT':
+                return [(self._below, trade['tp']), (self._above, trade['sl'])]
+        return []
+
+    def _add(self, trade):
+        self._trades[trade['id']] = trade
+        for book, level in self._levels(trade):
+            if level is not None:
+                bisect.insort(book, (level, trade['id']))
+
+    def _remove(self, trade_id):
+        trade = self._trades.pop(trade_id, None)
+        if trade is None:
+            return
+        for book, level in self._levels(trade):
+            if level is None: continue
+            i = bisect.bisect_left(book, (level, trade_id))
+            if i < len(book) and book[i] == (level, trade_id):
+                del book[i]
+
+    def _crossed(self, price):
+        """현재가로 발동 조건을 만족한 레벨의 매매 id (정렬 목록 양 끝에서만 탐색)"""
+        hit = set()
+        i = bisect.bisect_left(self._below, (price, -1))
+        hit.update(tid for _, tid in self._below[i:])
+        j = bisect.bisect_right(self._above, (price, float('inf')))
+        hit.update(tid for _, tid in self._above[:j])
+        return hit
+
+    def on_price(self, price):
+        """현재가 반영 후 상태 전이 목록 [(id, status, close_price)] 반환 (DB 일괄 반영 포함)"""
+        if price != price:
+            return []
+        with self._lock:
+            transitions = []
+            # A. PENDING 체결 (체결된 매매는 같은 가격으로 곧바로 OPEN 평가)
+            for tid in sorted(self._crossed(price)):
+                trade = self._trades[tid]
+                if trade['status'] == 'PENDING' and _resolve(trade, price) == 'OPEN':
+                    self._remove(tid)
+                    self._add(dict(trade, status='OPEN'))
+                    transitions.append((tid, 'OPEN', None))
+
+            # B. OPEN 승패 판정
+            for tid in sorted(self._crossed(price)):
+                trade = self._trades[tid]
+                status = _resolve(trade, price) if trade['status'] == 'OPEN' else None
+                if status:
+                    self._remove(tid)
+                    transitions.append((tid, status, price))
+
+            if transitions:
+                try:
+                    TradeRepository.apply_transitions(transitions)
+                except Exception:
+                    # DB 반영 실패 시 인덱스를 DB 기준으로 되돌림
+                    self._reload()
+                    raise
+            return transitions
+
+    def has_open(self):
+        with self._lock:
+            return any(t['status'] == 'OPEN' for t in self._trades.values())
+
+    def upsert_pending(self, side, entry, tp, sl):
+        """PENDING 주문 생성/갱신 후 인덱스 반영"""
+        with self._lock:
+            trade_id = TradeRepository.upsert_pending_trade(side, entry, tp, sl, self.symbol)
+            self._remove(trade_id)
+            self._add({'id': trade_id, 'side': side, 'entry': entry, 'tp': tp, 'sl': sl, 'status': 'PENDING'})
+            return trade_id
+
+    def delete_pending(self):
+        with self._lock:
+            TradeRepository.delete_pending_trades(self.symbol)
+            for tid in [tid for tid, t in self._trades.items() if t['status'] == 'PENDING']:
+                self._remove(tid)
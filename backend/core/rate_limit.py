@@ -0,0 +1,110 @@
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from .repository import RateLimitRepository
+
+class RateLimitPolicy:
+    """토큰 버킷 정책: 최대 capacity개, per초마다 한 개씩 (소수 단위로) 충전"""
+
+    def __init__(self, capacity, per):
+        self.capacity = float(capacity)
+        self.per = float(per)
+        self.rate = 1.0 / self.per
+
+    @property
+    def idle_ttl(self):
+        """이 시간 이상 안 쓰인 버킷은 가득 찬 상태라 새 버킷과 같음 (삭제 가능)"""
+        return self.capacity * self.per
+
+    @classmethod
+    def parse(cls, spec):
+        """'5/10' → 최대 5개, 10초마다 1개 ('0'이면 제한 없음 → None)"""
+        if spec.strip() == "0": return None
+        capacity, per = spec.split("/")
+        return cls(float(capacity), float(per))
+
+class MemoryBucketStore:
+    """프로세스 내부 버킷 저장소
+
+    키 해시로 나눈 샤드마다 잠금과 LRU(OrderedDict)를 두고, 접근할 때 가장 오래 안 쓰인 버킷부터
+    idle_ttl이 지난 것을 지운다. 샤드당 max_keys/shards개를 넘으면 가장 오래된 버킷을 버린다.
+    """
+
+    blocking = False
+
+    def __init__(self, shards=16, max_keys=100_000, clock=time.monotonic):
+        self.clock = clock
+        self.shard_size = max(1, max_keys // shards)
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self.evicted = self.expired = 0
+
+    def take(self, key, policy, cost):
+        lock, buckets = self._shards[zlib.crc32(key.encode('utf-8')) % len(self._shards)]
+        with lock:
+            now = self.clock()
+            state = buckets.pop(key, None)
+            tokens = policy.capacity if state is None else min(policy.capacity, state[0] + (now - state[1]) * policy.rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / policy.rate
+            if not wait: tokens -= cost
+            # 오래된 순으로 만료 정리 (맨 앞이 만료되지 않았으면 중단 → 호출당 평균 O(1))
+            while buckets:
+                oldest = next(iter(buckets.values()))
+                if now - oldest[1] < policy.idle_ttl: break
+                buckets.popitem(last=False)
+                self.expired += 1
+            if len(buckets) >= self.shard_size:
+                buckets.popitem(last=False)
+                self.evicted += 1
+            buckets[key] = (tokens, now)
+            return wait
+
+    def size(self):
+        return sum(len(buckets) for _, buckets in self._shards)
+
+class SQLiteBucketStore:
+    """워커 간 공유 버킷 저장소 (DB rate_limits 테이블, purge_every번 호출마다 만료 버킷 삭제)"""
+
+    blocking = True  # DB 접근이 있으므로 이벤트 루프 밖(DB 스레드)에서 호출
+
+    def __init__(self, purge_every=1000, clock=time.time):
+        self.clock = clock
+        self.purge_every = purge_every
+        self._calls = 0
+        self.expired = self.evicted = 0
+
+    def take(self, key, policy, cost):
+        now = self.clock()
+        self._calls += 1
+        if self._calls % self.purge_every == 0:
+            self.expired += RateLimitRepository.purge(now - policy.idle_ttl)
+        return RateLimitRepository.take(key, policy.capacity, policy.rate, cost, now)
+
+    def size(self):
+        return None
+
+class RateLimiter:
+    """엔드포인트별 속도 제한 (키: 보통 클라이언트 IP)"""
+
+    def __init__(self, name, policy, store=None):
+        self.name = name
+        self.policy = policy
+        self.store = store or MemoryBucketStore()
+        self.allowed = self.rejected = 0
+
+    def check(self, key, cost=1.0):
+        """허용되면 0, 거부되면 다시 시도할 수 있을 때까지 남은 초"""
+        wait = self.store.take(f"{self.name}:{key}", self.policy, cost)
+        if wait:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self):
+        return {
+            "capacity": self.policy.capacity, "per": self.policy.per, "keys": self.store.size(),
+            "allowed": self.allowed, "rejected": self.rejected,
+            "expired": self.store.expired, "evicted": self.store.evicted,
+        }
@@ -1,59 +1,249 @@
-from .database import get_db
+import json
+import time
+
+from .database import DEFAULT_SYMBOL, get_db, write_tx
 
 class MessageRepository:
     @staticmethod
     def get_recent_messages(limit=50):
+        """최근 limit개 메시지 (오래된 순)"""
         with get_db() as conn:
             rows = conn.execute(
-                "SELECT sender, text, timestamp FROM messages ORDER BY id ASC LIMIT ?", 
+                "SELECT * FROM (SELECT id, sender, text, timestamp FROM messages ORDER BY id DESC LIMIT ?) ORDER BY id ASC", 
                 (limit,)
             ).fetchall()
             return [dict(row) for row in rows]
 
     @staticmethod
-    def add_message(sender, text, timestamp):
+    def get_messages_after(after_id, limit=500):
+        """after_id 이후 메시지 (오래된 순, 재접속 시 누락분 보충)"""
         with get_db() as conn:
+            rows = conn.execute(
+                "SELECT id, sender, text, timestamp FROM messages WHERE id > ? ORDER BY id ASC LIMIT ?",
+                (after_id, limit)
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    def add_message(sender, text, timestamp):
+        with write_tx() as conn:
             conn.execute(
                 "INSERT INTO messages (sender, text, timestamp) VALUES (?, ?, ?)",
                 (sender, text, timestamp)
             )
-            conn.commit()
+
+    @staticmethod
+    def add_messages(messages):
+        """id가 지정된 메시지 일괄 저장 (이미 있는 id는 무시)"""
+        with write_tx() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO messages (id, sender, text, timestamp) VALUES (:id, :sender, :text, :timestamp)",
+                messages
+            )
+
+def _json_default(o):
+    """NumPy 스칼라 등 JSON 기본 타입이 아닌 값 변환"""
+    return o.item() if hasattr(o, 'item') else str(o)
+
+def _symbol_filter(symbol):
+    """심볼 조건 (None이면 전체 심볼)"""
+    return ("", ()) if symbol is None else (" AND symbol=?", (symbol,))
 
 class StrategyRepository:
     @staticmethod
-    def get_latest_strategy(lang):
+    def get_latest_strategy(lang, symbol=DEFAULT_SYMBOL):
         with get_db() as conn:
             row = conn.execute(
-                "SELECT * FROM strategy_history WHERE lang = ? ORDER BY id DESC LIMIT 1",
-                (lang,)
+                "SELECT * FROM strategy_history WHERE symbol = ? AND lang = ? ORDER BY id DESC LIMIT 1",
+                (symbol, lang)
             ).fetchone()
             return dict(row) if row else None
 
     @staticmethod
-    def add_strategy(price, strategy, generated_at, funding_rate, open_interest, lang):
+    def get_latest_id(symbol=DEFAULT_SYMBOL):
+        """심볼의 마지막 전략 id (없으면 0, 언어 무관)"""
+        with get_db() as conn:
+            row = conn.execute("SELECT MAX(id) FROM strategy_history WHERE symbol = ?", (symbol,)).fetchone()
+            return row[0] or 0
+
+    @staticmethod
+    def get_strategies_after(after_id, symbol=DEFAULT_SYMBOL):
+        """after_id 이후 저장된 전략 (오래된 순, 언어 무관)"""
+        with get_db() as conn:
+            rows = conn.execute(
+                "SELECT id, lang, strategy FROM strategy_history WHERE symbol = ? AND id > ? ORDER BY id ASC",
+                (symbol, after_id)
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    def add_strategy(price, strategy, generated_at, funding_rate, open_interest, lang, symbol=DEFAULT_SYMBOL, snapshot_id=None):
+        with write_tx() as conn:
+            conn.execute(
+                "INSERT INTO strategy_history (price, strategy, generated_at, funding_rate, open_interest, lang, symbol, snapshot_id) VALUES (?,?,?,?,?,?,?,?)",
+                (price, strategy, generated_at, funding_rate, open_interest, lang, symbol, snapshot_id)
+            )
+
+class SnapshotRepository:
+    @staticmethod
+    def add_snapshot(symbol, created_at, data):
+        """시장 스냅샷 저장 (data: JSON 직렬화 가능한 dict), id 반환"""
+        payload = json.dumps(data, ensure_ascii=False, default=_json_default)
+        with write_tx() as conn:
+            return conn.execute(
+                "INSERT INTO market_snapshots (symbol, created_at, data) VALUES (?, ?, ?)",
+                (symbol, created_at, payload)
+            ).lastrowid
+
+    @staticmethod
+    def get_snapshot(snapshot_id):
+        with get_db() as conn:
+            row = conn.execute("SELECT * FROM market_snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+            return dict(row, data=json.loads(row['data'])) if row else None
+
+    @staticmethod
+    def get_latest_snapshot(symbol=DEFAULT_SYMBOL):
+        with get_db() as conn:
+            row = conn.execute(
+                "SELECT * FROM market_snapshots WHERE symbol = ? ORDER BY id DESC LIMIT 1", (symbol,)
+            ).fetchone()
+            return dict(row, data=json.loads(row['data'])) if row else None
+
+class LLMResultRepository:
+    @staticmethod
+    def get_result(prompt_hash, max_age=None):
+        """저장된 LLM 응답 (max_age초보다 오래됐으면 None)"""
+        with get_db() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_results WHERE prompt_hash = ?", (prompt_hash,)
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row['created_at'] > max_age):
+            return None
+        return row['response']
+
+    @staticmethod
+    def save_result(prompt_hash, model, response):
+        with write_tx() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_results (prompt_hash, model, response, created_at) VALUES (?, ?, ?, ?)",
+                (prompt_hash, model, response, time.time())
+            )
+
+    @staticmethod
+    def purge(older_than):
+        """older_than 이전에 저장된 응답 삭제"""
+        with write_tx() as conn:
+            return conn.execute("DELETE FROM llm_results WHERE created_at < ?", (older_than,)).rowcount
+
+class RateLimitRepository:
+    @staticmethod
+    def take(key, capacity, rate, cost, now):
+        """키의 토큰 버킷에서 cost만큼 차감 시도 (한 트랜잭션) → 부족하면 남은 대기 시간(초), 성공 시 0"""
+        with write_tx() as conn:
+            row = conn.execute("SELECT tokens, updated FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row['tokens'] + (now - row['updated']) * rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait: tokens -= cost
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now)
+            )
+            return wait
+
+    @staticmethod
+    def purge(older_than):
+        """older_than 이전에 마지막으로 쓰인 버킷 삭제 (이미 가득 찬 버킷)"""
+        with write_tx() as conn:
+            return conn.execute("DELETE FROM rate_limits WHERE updated < ?", (older_than,)).rowcount
+
+class LeaseRepository:
+    @staticmethod
+    def acquire(name, owner, now, ttl):
+        """리스가 비었거나 만료됐거나 이미 owner 것이면 now + ttl까지 연장 (획득/유지 여부 반환)"""
+        with write_tx() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            if row is not None and row['owner'] != owner and row['expires_at'] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)", (name, owner, now + ttl)
+            )
+            return True
+
+    @staticmethod
+    def release(name, owner):
+        with write_tx() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    @staticmethod
+    def get(name):
+        with get_db() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            return dict(row) if row else None
+
+class CacheRepository:
+    @staticmethod
+    def get(name, key):
+        """(JSON 값, fresh_until, stale_until) 또는 None"""
         with get_db() as conn:
+            row = conn.execute(
+                "SELECT value, fresh_until, stale_until FROM cache_entries WHERE name = ? AND key = ?", (name, key)
+            ).fetchone()
+            return (row['value'], row['fresh_until'], row['stale_until']) if row else None
+
+    @staticmethod
+    def put(name, key, value, fresh_until, stale_until):
+        with write_tx() as conn:
             conn.execute(
-                "INSERT INTO strategy_history (price, strategy, generated_at, funding_rate, open_interest, lang) VALUES (?,?,?,?,?,?)",
-                (price, strategy, generated_at, funding_rate, open_interest, lang)
+                "INSERT OR REPLACE INTO cache_entries (name, key, value, fresh_until, stale_until) VALUES (?, ?, ?, ?, ?)",
+                (name, key, value, fresh_until, stale_until)
             )
-            conn.commit()
+
+    @staticmethod
+    def delete(name, key=None):
+        with write_tx() as conn:
+            if key is None:
+                conn.execute("DELETE FROM cache_entries WHERE name = ?", (name,))
+            else:
+                conn.execute("DELETE FROM cache_entries WHERE name = ? AND key = ?", (name, key))
 
 class TradeRepository:
     @staticmethod
-    def get_pending_trades():
+    def get_pending_trades(symbol=None):
+        clause, params = _symbol_filter(symbol)
         with get_db() as conn:
-            rows = conn.execute("SELECT id, side, entry FROM virtual_trades WHERE status='PENDING'").fetchall()
+            rows = conn.execute("SELECT id, side, entry FROM virtual_trades WHERE status='PENDING'" + clause, params).fetchall()
             return [dict(row) for row in rows]
 
     @staticmethod
-    def get_open_trades():
+    def get_open_trades(symbol=None):
+        clause, params = _symbol_filter(symbol)
         with get_db() as conn:
-            rows = conn.execute("SELECT id, side, tp, sl FROM virtual_trades WHERE status='OPEN'").fetchall()
+            rows = conn.execute("SELECT id, side, tp, sl FROM virtual_trades WHERE status='OPEN'" + clause, params).fetchall()
             return [dict(row) for row in rows]
 
     @staticmethod
-    def update_trade_status(trade_id, status, close_price=None):
+    def get_active_trades(symbol=None):
+        """PENDING/OPEN 상태 매매 전체 (주문장 로딩용)"""
+        clause, params = _symbol_filter(symbol)
         with get_db() as conn:
+            rows = conn.execute(
+                "SELECT id, symbol, side, entry, tp, sl, status FROM virtual_trades "
+                "WHERE status IN ('PENDING', 'OPEN')" + clause + " ORDER BY id",
+                params
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    def apply_transitions(transitions):
+        """상태 전이 목록 [(id, status, close_price)]을 단일 트랜잭션으로 반영"""
+        with write_tx() as conn:
+            conn.executemany(
+                "UPDATE virtual_trades SET status=?, close_price=COALESCE(?, close_price) WHERE id=?",
+                [(status, close_price, trade_id) for trade_id, status, close_price in transitions]
+            )
+
+    @staticmethod
+    def update_trade_status(trade_id, status, close_price=None):
+        with write_tx() as conn:
             if close_price is not None:
                 conn.execute(
                     "UPDATE virtual_trades SET status=?, close_price=? WHERE id=?",
@@ -64,66 +254,114 @@ class TradeRepository:
                     "UPDATE virtual_trades SET status=? WHERE id=?",
                     (status, trade_id)
                 )
-            conn.commit()
 
     @staticmethod
-    def get_stats():
+    def get_status_counts(symbol=None):
+        """상태별 매매 건수 (trade_summary 요약 테이블, symbol=None이면 전체 합산)"""
+        clause, params = _symbol_filter(symbol)
         with get_db() as conn:
-            wins = conn.execute("SELECT COUNT(*) FROM virtual_trades WHERE status='WIN'").fetchone()[0]
-            losses = conn.execute("SELECT COUNT(*) FROM virtual_trades WHERE status='LOSS'").fetchone()[0]
-            total = wins + losses
-            win_rate = (wins / total * 100) if total > 0 else 0
-            return wins, losses, round(win_rate, 1)
+            rows = conn.execute(
+                "SELECT status, SUM(count) AS count FROM trade_summary WHERE 1=1" + clause + " GROUP BY status",
+                params
+            ).fetchall()
+            return {row['status']: row['count'] for row in rows}
+
+    @staticmethod
+    def get_stats(symbol=None):
+        counts = TradeRepository.get_status_counts(symbol)
+        wins, losses = counts.get('WIN', 0), counts.get('LOSS', 0)
+        total = wins + losses
+        win_rate = (wins / total * 100) if total > 0 else 0
+        return wins, losses, round(win_rate, 1)
 
     @staticmethod
-    def get_history(limit=10):
+    def get_history(limit=10, symbol=None):
+        clause, params = _symbol_filter(symbol)
         with get_db() as conn:
             rows = conn.execute(
-                "SELECT * FROM virtual_trades ORDER BY id DESC LIMIT ?",
-                (limit,)
+                "SELECT * FROM virtual_trades WHERE 1=1" + clause + " ORDER BY id DESC LIMIT ?",
+                (*params, limit)
             ).fetchall()
             return [dict(row) for row in rows]
 
     @staticmethod
-    def get_active_trade():
+    def get_active_trade(symbol=None):
         """현재 진행 중인(OPEN) 포지션 확인"""
+        clause, params = _symbol_filter(symbol)
         with get_db() as conn:
-            row = conn.execute("SELECT id FROM virtual_trades WHERE status='OPEN'").fetchone()
+            row = conn.execute("SELECT id FROM virtual_trades WHERE status='OPEN'" + clause, params).fetchone()
             return dict(row) if row else None
 
     @staticmethod
-    def upsert_pending_trade(side, entry, tp, sl):
-        """PENDING 주문 생성 또는 갱신"""
-        with get_db() as conn:
-            pending = conn.execute("SELECT id FROM virtual_trades WHERE status='PENDING'").fetchone()
+    def upsert_pending_trade(side, entry, tp, sl, symbol=DEFAULT_SYMBOL):
+        """PENDING 주문 생성 또는 갱신 (심볼당 1건, 주문 id 반환)"""
+        with write_tx() as conn:
+            pending = conn.execute(
+                "SELECT id FROM virtual_trades WHERE status='PENDING' AND symbol=?", (symbol,)
+            ).fetchone()
             if pending:
+                trade_id = pending['id']
                 conn.execute(
                     "UPDATE virtual_trades SET side=?, entry=?, tp=?, sl=? WHERE id=?",
-                    (side, entry, tp, sl, pending['id'])
+                    (side, entry, tp, sl, trade_id)
                 )
             else:
-                conn.execute(
-                    "INSERT INTO virtual_trades (side, entry, tp, sl, status) VALUES (?, ?, ?, ?, 'PENDING')",
-                    (side, entry, tp, sl)
-                )
-            conn.commit()
+                trade_id = conn.execute(
+                    "INSERT INTO virtual_trades (side, entry, tp, sl, status, symbol) VALUES (?, ?, ?, ?, 'PENDING', ?)",
+                    (side, entry, tp, sl, symbol)
+                ).lastrowid
+            return trade_id
 
     @staticmethod
-    def get_current_status():
+    def get_current_status(symbol=None):
         """현재 매매 상태 판단: OPEN > PENDING > IDLE"""
+        counts = TradeRepository.get_status_counts(symbol)
+        if counts.get('OPEN', 0) > 0: return "OPEN"
+        if counts.get('PENDING', 0) > 0: return "PENDING"
+        return "IDLE"
+
+    @staticmethod
+    def delete_pending_trades(symbol=None):
+        clause, params = _symbol_filter(symbol)
+        with write_tx() as conn:
+            conn.execute("DELETE FROM virtual_trades WHERE status='PENDING'" + clause, params)
+
+class CandleRepository:
+    @staticmethod
+    def get_bounds(symbol, timeframe):
+        """저장된 캔들의 (최초, 최종) 시가 시각 및 개수"""
         with get_db() as conn:
-            # 1. OPEN 확인
-            row = conn.execute("SELECT id FROM virtual_trades WHERE status='OPEN'").fetchone()
-            if row: return "OPEN"
-            
-            # 2. PENDING 확인
-            row = conn.execute("SELECT id FROM virtual_trades WHERE status='PENDING'").fetchone()
-            if row: return "PENDING"
-            
-            return "IDLE"
+            row = conn.execute(
+                "SELECT MIN(open_time), MAX(open_time), COUNT(*) FROM ohlcv WHERE symbol=? AND timeframe=?",
+                (symbol, timeframe)
+            ).fetchone()
+            return row[0], row[1], row[2]
+
+    @staticmethod
+    def upsert_candles(symbol, timeframe, rows):
+        """rows: (open_time, open, high, low, close, volume, taker_buy_vol) 목록"""
+        with write_tx() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ohlcv (symbol, timeframe, open_time, open, high, low, close, volume, taker_buy_vol) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(symbol, timeframe, *r) for r in rows]
+            )
+
+    @staticmethod
+    def delete_candles_before(symbol, timeframe, open_time):
+        """open_time보다 이전 캔들 삭제"""
+        with write_tx() as conn:
+            return conn.execute(
+                "DELETE FROM ohlcv WHERE symbol=? AND timeframe=? AND open_time < ?", (symbol, timeframe, open_time)
+            ).rowcount
 
     @staticmethod
-    def delete_pending_trades():
+    def get_candles(symbol, timeframe, limit=500):
+        """최근 limit개 캔들 (시간 오름차순)"""
         with get_db() as conn:
-            conn.execute("DELETE FROM virtual_trades WHERE status='PENDING'")
-            conn.commit()
+            rows = conn.execute(
+                "SELECT open_time, open, high, low, close, volume, taker_buy_vol FROM ohlcv "
+                "WHERE symbol=? AND timeframe=? ORDER BY open_time DESC LIMIT ?",
+                (symbol, timeframe, limit)
+            ).fetchall()
+            return [tuple(r) for r in reversed(rows)]
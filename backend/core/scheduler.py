@@ -0,0 +1,116 @@
+import asyncio
+import inspect
+import random
+import time
+from datetime import datetime
+
+class Job:
+    """주기 실행 작업 (fn: 동기 함수는 스레드에서, 코루틴 함수는 이벤트 루프에서 실행)
+
+    due_in: 첫 실행까지 남은 초를 돌려주는 함수 (예: 저장된 결과가 아직 유효하면 만료 직전까지 대기)
+    """
+
+    def __init__(self, name, fn, interval, jitter=0.0, retry_base=5.0, retry_max=300.0, due_in=None):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.due_in = due_in
+        self.runs = self.failures = self.consecutive_failures = 0
+        self.last_run = self.last_success = self.next_run = None
+        self.last_error = None
+        self.last_duration_ms = None
+        self.running = False
+        self._wake = None
+
+    def next_delay(self):
+        """성공 시 주기 + 지터, 실패 시 지수 백오프(상한 retry_max, 주기를 넘지 않음)"""
+        if self.consecutive_failures:
+            backoff = self.retry_base * 2 ** (self.consecutive_failures - 1)
+            return min(backoff, self.retry_max, self.interval) * random.uniform(0.8, 1.2)
+        return self.interval + random.uniform(0, self.jitter)
+
+    def status(self):
+        fmt = lambda ts: datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S') if ts else None
+        return {
+            "interval": self.interval, "running": self.running, "runs": self.runs,
+            "failures": self.failures, "consecutive_failures": self.consecutive_failures,
+            "last_run": fmt(self.last_run), "last_success": fmt(self.last_success),
+            "next_run": fmt(self.next_run), "last_error": self.last_error,
+            "last_duration_ms": self.last_duration_ms,
+        }
+
+class PrecomputeScheduler:
+    """요청 경로 밖에서 전략/브리핑/뉴스/심리 데이터를 만료 전에 미리 갱신"""
+
+    def __init__(self):
+        self.jobs = {}
+        self._tasks = {}
+
+    def add(self, job):
+        self.jobs[job.name] = job
+        return job
+
+    def start(self):
+        for name, job in self.jobs.items():
+            if name not in self._tasks or self._tasks[name].done():
+                self._tasks[name] = asyncio.create_task(self._loop(job))
+
+    async def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    def run_now(self, name):
+        """대기 중인 작업을 즉시 실행 (실행 중이면 무시)"""
+        job = self.jobs.get(name)
+        if job and job._wake and not job.running:
+            job._wake.set()
+
+    async def run_job(self, job):
+        job.running, job.last_run = True, time.time()
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(job.fn):
+                await job.fn()
+            else:
+                await asyncio.to_thread(job.fn)
+            job.consecutive_failures, job.last_error = 0, None
+            job.last_success = time.time()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.consecutive_failures += 1
+            job.last_error = str(e)
+            print(f"[SCHEDULER] {job.name} failed ({job.consecutive_failures}): {e}")
+        finally:
+            job.runs += 1
+            job.running = False
+            job.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _loop(self, job):
+        job._wake = asyncio.Event()
+        delay = 0.0
+        if job.due_in:
+            try:
+                delay = max(0.0, await asyncio.to_thread(job.due_in))
+            except Exception as e:
+                print(f"[SCHEDULER] {job.name} due_in failed: {e}")
+        # 여러 작업이 동시에 몰리지 않도록 첫 실행에도 지터 적용
+        delay += random.uniform(0, job.jitter)
+        while True:
+            job.next_run = time.time() + delay
+            try:
+                await asyncio.wait_for(job._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            job._wake.clear()
+            await self.run_job(job)
+            delay = job.next_delay()
+
+    def status(self):
+        return {name: job.status() for name, job in self.jobs.items()}
@@ -0,0 +1,132 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+from .backtest import run_backtest
+from .indicators import calculate_volume_profile, detect_divergences, detect_liquidity_sweep, detect_smc_structure
+
+# analyzer가 사용하는 기본값 (sweep 그리드에서 일부만 지정하면 나머지는 이 값)
+DEFAULT_PARAMS = {
+    "vp_bins": 50, "vp_lookback": 300, "va_ratio": 0.7, "div_window": 10,
+    "fvg_atr": 0.5, "ob_atr": 1.8, "ob_volume": 1.5, "sweep_window": 30, "sl_atr": 1.0,
+}
+COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'cvd', 'rsi', 'atr')
+
+def prepare_candles(df):
+    """지표 계산에 필요한 cvd/rsi/atr 컬럼을 한 번만 계산해 추가 (설정과 무관한 값)"""
+    df = df.copy()
+    if 'cvd' not in df.columns:
+        df['cvd'] = (2 * df['taker_buy_vol'] - df['volume']).cumsum()
+    if 'rsi' not in df.columns:
+        df['rsi'] = ta.rsi(df['close'], length=14)
+    if 'atr' not in df.columns:
+        df['atr'] = ta.atr(df['high'], df['low'], df['close'], length=14)
+    return df[list(COLUMNS)]
+
+def expand_grid(grid):
+    """{파라미터: 후보 목록} → 모든 조합의 설정 목록 (지정하지 않은 값은 DEFAULT_PARAMS)"""
+    names = list(grid)
+    return [dict(DEFAULT_PARAMS, **dict(zip(names, values))) for values in itertools.product(*grid.values())]
+
+def indicator_signal(window, params):
+    """지표만으로 만든 규칙 기반 신호 (LLM 전략 대용)
+
+    휩소/CVD/RSI 다이버전스의 우세한 방향으로, 가장 가까운 OB/FVG/Value Area 경계에 진입하고
+    반대쪽 Value Area 경계(없으면 2R)를 TP, ATR * sl_atr를 SL로 둔다. 방향이 없으면 NONE.
+    """
+    price, atr = window['close'].iloc[-1], window['atr'].iloc[-1]
+    if not atr > 0:
+        return None
+    vp = calculate_volume_profile(window, bins=params['vp_bins'], lookback=params['vp_lookback'], va_ratio=params['va_ratio'])
+    cvd_div, rsi_div = detect_divergences(window, window=params['div_window'])
+    fvgs, obs = detect_smc_structure(window, fvg_atr=params['fvg_atr'], ob_atr=params['ob_atr'], ob_volume=params['ob_volume'])
+    sweep = detect_liquidity_sweep(window, window=params['sweep_window'])
+    bull = sum("Bullish" in s for s in (sweep, cvd_div, rsi_div))
+    bear = sum("Bearish" in s for s in (sweep, cvd_div, rsi_div))
+    risk = atr * params['sl_atr']
+    if bull > bear:
+        levels = [z['top'] for z in fvgs + obs if z['type'].startswith('Bull') and z['top'] < price]
+        entry = max(levels + [vp['val']] if vp['val'] < price else levels, default=price)
+        tp = vp['vah'] if vp['vah'] > entry + risk else entry + 2 * risk
+        return {'side': 'LONG', 'entry': entry, 'tp': tp, 'sl': entry - risk}
+    if bear > bull:
+        levels = [z['bottom'] for z in fvgs + obs if z['type'].startswith('Bear') and z['bottom'] > price]
+        entry = min(levels + [vp['vah']] if vp['vah'] > price else levels, default=price)
+        tp = vp['val'] if vp['val'] < entry - risk else entry - 2 * risk
+        return {'side': 'SHORT', 'entry': entry, 'tp': tp, 'sl': entry + risk}
+    return {'side': 'NONE', 'entry': price, 'tp': price, 'sl': price}
+
+def generate_signals(df, params, step):
+    """step봉마다 직전 구간으로 신호 생성 (봉 마감 후 다음 봉부터 유효)"""
+    history = max(params['vp_lookback'], 200, params['div_window'] * 2, params['sweep_window'] + 5)
+    rows = []
+    for i in range(history - 1, len(df) - 1, step):
+        signal = indicator_signal(df.iloc[i - history + 1:i + 1], params)
+        if signal:
+            rows.append(dict(signal, time=df.index[i + 1]))
+    return pd.DataFrame(rows, columns=['time', 'side', 'entry', 'tp', 'sl'])
+
+def evaluate(df, params, step, intrabar='worst'):
+    signals = generate_signals(df, params, step)
+    _, stats = run_backtest(df, signals, intrabar=intrabar)
+    return dict(stats, signals=int((signals['side'] != 'NONE').sum()))
+
+class SharedCandles:
+    """지표 계산용 캔들 배열을 공유 메모리에 한 번 올려두고, 워커는 이름으로 붙어 복사 없이 사용"""
+
+    def __init__(self, df):
+        arr = np.column_stack([df.index.as_unit('ms').asi8.astype(np.float64)] + [df[c].to_numpy(np.float64) for c in COLUMNS])
+        self.shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+        np.ndarray(arr.shape, dtype=np.float64, buffer=self.shm.buf)[:] = arr
+        self.spec = (self.shm.name, arr.shape)
+
+    @staticmethod
+    def attach(spec):
+        """(공유 메모리 핸들, 그 버퍼를 그대로 쓰는 DataFrame)"""
+        name, shape = spec
+        shm = shared_memory.SharedMemory(name=name)
+        arr = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        df = pd.DataFrame(arr[:, 1:], columns=list(COLUMNS), index=pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'), copy=False)
+        return shm, df
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+_worker = {}
+
+def _init_worker(spec):
+    _worker['shm'], _worker['df'] = SharedCandles.attach(spec)
+
+def _evaluate_shared(params, step, intrabar):
+    return evaluate(_worker['df'], params, step, intrabar)
+
+def run_sweep(candles, grid, step=24, workers=None, metric='total_return_pct', min_trades=5, intrabar='worst'):
+    """지표 설정 그리드를 백테스트 지표로 평가해 순위표(DataFrame) 반환
+
+    workers=1이면 현재 프로세스에서 순서대로, 아니면 프로세스 풀에서 병렬 평가.
+    청산된 매매가 min_trades 미만인 설정은 metric과 관계없이 뒤로 보낸다.
+    """
+    configs = expand_grid(grid)
+    df = prepare_candles(candles)
+    workers = workers or min(len(configs), os.cpu_count() or 1)
+    if workers == 1:
+        results = [evaluate(df, params, step, intrabar) for params in configs]
+    else:
+        shared = SharedCandles(df)
+        try:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared.spec,)) as pool:
+                chunksize = max(1, len(configs) // (workers * 4))
+                results = list(pool.map(_evaluate_shared, configs, itertools.repeat(step),
+                                        itertools.repeat(intrabar), chunksize=chunksize))
+        finally:
+            shared.close()
+
+    table = pd.DataFrame([dict(params, **stats) for params, stats in zip(configs, results)])
+    table['eligible'] = table['wins'] + table['losses'] >= min_trades
+    return table.sort_values(['eligible', metric], ascending=False, kind='stable').reset_index(drop=True)
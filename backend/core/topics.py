@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import time
+
+from .metrics import QUEUE_DROPS
+
+def etag_of(data):
+    """응답 내용 기반 ETag (키 순서와 무관)"""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return f'"{hashlib.sha1(raw).hexdigest()[:20]}"'
+
+class TopicHub:
+    """토픽별 최신 스냅샷(버전, ETag)을 유지하고 내용이 바뀔 때만 구독자에게 전송
+
+    loader(topic)로 서버에서 한 번만 다시 읽으므로 조회 비용은 구독자 수가 아니라 갱신 주기에 비례한다.
+    구독 중이거나 idle_ttl 이내에 조회된 토픽만 갱신하고, poke()로 주기를 기다리지 않고 즉시 갱신할 수 있다.
+    """
+
+    def __init__(self, loader, interval=5.0, idle_ttl=120.0):
+        self.loader = loader
+        self.interval = interval
+        self.idle_ttl = idle_ttl
+        self._state = {}
+        self._subscribers = {}
+        self._wanted = {}
+        self._wake = None
+        self._loop = None
+        self._task = None
+
+    def subscribe(self, topics, maxsize=50):
+        q = asyncio.Queue(maxsize=maxsize)
+        self._subscribers[q] = set(topics)
+        for topic in topics:
+            self.touch(topic)
+        return q
+
+    def unsubscribe(self, q):
+        self._subscribers.pop(q, None)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def touch(self, topic):
+        """토픽을 갱신 대상으로 유지 (구독이 끊겨도 idle_ttl 동안은 계속 갱신해 재연결 시 바로 전송)"""
+        self._wanted[topic] = time.monotonic()
+
+    def current(self, topic):
+        """최신 스냅샷 {topic, version, etag, data} (아직 없으면 None)"""
+        return self._state.get(topic)
+
+    def active_topics(self):
+        now = time.monotonic()
+        subscribed = set().union(*self._subscribers.values()) if self._subscribers else set()
+        for topic, seen in list(self._wanted.items()):
+            if topic not in subscribed and now - seen > self.idle_ttl:
+                del self._wanted[topic]
+        return subscribed | set(self._wanted)
+
+    def publish(self, topic, data):
+        """내용이 달라졌을 때만 버전을 올리고 구독자에게 전송 (변경 여부 반환)"""
+        etag = etag_of(data)
+        prev = self._state.get(topic)
+        if prev is not None and prev['etag'] == etag:
+            return False
+        snapshot = {'topic': topic, 'version': (prev['version'] + 1) if prev else 1, 'etag': etag, 'data': data}
+        self._state[topic] = snapshot
+        for q, topics in list(self._subscribers.items()):
+            if topic not in topics:
+                continue
+            if q.full():
+                # 느린 구독자는 가장 오래된 업데이트를 버림
+                try:
+                    q.get_nowait()
+                    QUEUE_DROPS.inc("topics")
+                except asyncio.QueueEmpty:
+                    pass
+            q.put_nowait(snapshot)
+        return True
+
+    async def refresh(self, topic):
+        data = await self.loader(topic)
+        if data is not None:
+            self.publish(topic, data)
+        return self._state.get(topic)
+
+    async def _safe_refresh(self, topic):
+        try:
+            await self.refresh(topic)
+        except Exception as e:
+            print(f"[TOPIC ERROR] {topic}: {e}")
+
+    async def refresh_all(self):
+        await asyncio.gather(*(self._safe_refresh(t) for t in sorted(self.active_topics())))
+
+    def poke(self):
+        """즉시 갱신 요청 (다른 스레드에서도 호출 가능)"""
+        if self._loop is None or self._wake is None:
+            return
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                self._wake.set()
+                return
+        except RuntimeError:
+            pass
+        self._loop.call_soon_threadsafe(self._wake.set)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self):
+        while True:
+            await self.refresh_all()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
@@ -1,100 +1,237 @@
 import asyncio
+import functools
 import json
-from datetime import datetime, timedelta
+import math
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
 
 import requests
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
 
 from analyzer import (
+    SYMBOL,
+    SYMBOLS,
+    brief_cache,
     fetch_ai_daily_brief,
     fetch_crypto_news,
     fetch_long_short_ratio,
     get_ai_strategy,
     get_economic_events,
+    get_long_short_ratio,
+    llm,
+    news_cache,
+    refresh_ai_digest,
+    refresh_crypto_news,
+    refresh_market_scan,
+    scan_result_cache,
+    sentiment_cache,
+    stream_ai_strategy,
+    warm_up,
 )
+from core.async_repository import AsyncStrategyRepository, AsyncTradeRepository, run_db
+from core.cache import SQLiteCacheStore, TTLCache, cache_stats, share_caches
+from core.chat import ChatBroker, LocalPubSub, UnixSocketPubSub
 from core.database import init_db
-from core.repository import MessageRepository, StrategyRepository, TradeRepository
+from core.leader import LeaderElection
+from core.market_stream import BinanceStreamSource, MarketDataHub, ReplaySource
+from core.metrics import EXCHANGE_LATENCY, HttpMetricsMiddleware, counter, histogram, register_collector, render, timed
+from core.order_book import VirtualOrderBook
+from core.rate_limit import MemoryBucketStore, RateLimiter, RateLimitPolicy, SQLiteBucketStore
+from core.repository import StrategyRepository
+from core.scheduler import Job, PrecomputeScheduler
+from core.topics import TopicHub, etag_of
 
-# 설정 및 캐시 데이터
-clients = set()
-rate_limits = {}
+CHART_TIMEFRAMES = ['1m', '5m', '15m', '1h', '4h', '1d']
 
-# 투표 및 캐시 (메모리 저장)
-fng_cache = {"data": None, "expiry": None}
-ls_cache = {"data": None, "expiry": None}
-trade_stats_cache = {"data": None, "needs_update": True}
+# 여러 워커 실행 모드 (QUANT_MULTI_WORKER=1, 기본값은 uvicorn --workers 기본값인 WEB_CONCURRENCY > 1)
+# 캐시/속도 제한/채팅을 워커 간 공유하고, 가상 매매 감시와 선계산은 DB 리스로 선출된 워커 하나에서만 실행
+MULTI_WORKER = os.getenv("QUANT_MULTI_WORKER", "1" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else "0") == "1"
+
+# 엔드포인트별 속도 제한 (QUANT_RATE_<이름>="최대/충전초", "0"이면 해제)
+# QUANT_RATE_LIMIT_SHARED=1이면 버킷을 DB에 두어 여러 워커가 같은 한도를 공유 (여러 워커 모드 기본값)
+_rate_shared = os.getenv("QUANT_RATE_LIMIT_SHARED", "1" if MULTI_WORKER else "0") == "1"
+_rate_store = SQLiteBucketStore if _rate_shared else MemoryBucketStore
+_rate_policies = {
+    name: RateLimitPolicy.parse(os.getenv(f"QUANT_RATE_{name.upper()}", default))
+    for name, default in {"chat_send": "5/10"}.items()
+}
+rate_limiters = {name: RateLimiter(name, policy, _rate_store()) for name, policy in _rate_policies.items() if policy}
+
+# 채팅 중계 (QUANT_CHAT_SOCKET_DIR 지정 시 같은 서버의 여러 워커가 유닉스 소켓으로 메시지 공유)
+_chat_socket_dir = os.getenv("QUANT_CHAT_SOCKET_DIR") or (
+    os.path.join(tempfile.gettempdir(), "quant-chat") if MULTI_WORKER else None)
+chat_broker = ChatBroker(UnixSocketPubSub(_chat_socket_dir) if _chat_socket_dir else LocalPubSub())
+
+# 캐시 (만료 직후에는 이전 값을 반환하며 백그라운드 갱신)
+fng_cache = TTLCache("fear_greed", ttl=4 * 3600, stale_ttl=3600, maxsize=1)
+trade_stats_cache = TTLCache("trade_stats", ttl=3600, maxsize=64)  # 키: 심볼 (None=전체), 매매 상태 변경 시 무효화
+# 리더만 갱신/무효화하는 캐시는 여러 워커 모드에서 DB로 공유 (스냅샷/스캔처럼 JSON이 아니거나 워커별로 충분한 캐시는 제외)
+SHARED_CACHES = ["fear_greed", "trade_stats", "sentiment", "news", "brief", "market_scan"]
+if MULTI_WORKER:
+    share_caches(SQLiteCacheStore(), SHARED_CACHES)
+
+# 선계산 스케줄러 (QUANT_SCHEDULER=0이면 비활성, 주기는 QUANT_REFRESH_<작업> 환경 변수로 초 단위 조정)
+# 각 주기는 캐시/전략 유효 시간(1시간, 심리 1분)보다 짧게 잡아 만료 전에 갱신
+SCHEDULER_ENABLED = os.getenv("QUANT_SCHEDULER", "1") != "0"
+REFRESH_INTERVALS = {
+    name: float(os.getenv(f"QUANT_REFRESH_{name.upper()}", default))
+    for name, default in {"strategy": 3300, "brief": 3000, "news": 3000, "sentiment": 50, "scan": 120, "llm_purge": 3600}.items()
+}
+scheduler = PrecomputeScheduler()
+
+# 데이터 토픽 푸시 허브 (구독 중인 토픽만 QUANT_TOPIC_INTERVAL초마다 다시 읽어 바뀐 경우에만 전송)
+TOPIC_INTERVAL = float(os.getenv("QUANT_TOPIC_INTERVAL", "5"))
+
+# 공유 시세 허브 (MARKET_REPLAY_FILE 지정 시 로컬 재생 소스 사용)
+_replay_file = os.getenv("MARKET_REPLAY_FILE")
+market_hub = MarketDataHub(
+    ReplaySource.from_file(_replay_file, interval=0.1) if _replay_file
+    else BinanceStreamSource(SYMBOL, CHART_TIMEFRAMES, price_symbols=SYMBOLS)
+)
+
+# 가상 매매 감시 지표 (체결 수신 → 평가 완료까지의 지연, 평가 실패)
+MONITOR_LAG = histogram("quant_monitor_tick_lag_seconds", "체결 시각부터 가상 매매 평가 완료까지의 지연")
+MONITOR_ERRORS = counter("quant_monitor_errors_total", "가상 매매 평가 실패", ("symbol",))
+
+# 기동 상태 (/는 생존 확인, /api/ready는 startup과 무거운 의존성 예열이 끝난 뒤에만 200)
+readiness = {"started": False, "warmed_up": False, "warmup_ms": None, "warmup_error": None}
+
+# 심볼별 가상 매매 트리거 인덱스 (startup에서 DB로부터 로딩)
+order_books = {s: VirtualOrderBook(s) for s in SYMBOLS}
+
+def normalize_symbol(symbol):
+    """'btcusdt', 'BTC-USDT' 등을 'BTC/USDT'로 정규화 (지원하지 않는 심볼이면 400)"""
+    raw = symbol.upper().replace('-', '/').replace('_', '/')
+    if '/' not in raw:
+        for s in SYMBOLS:
+            if s.replace('/', '') == raw: return s
+    if raw not in SYMBOLS:
+        raise HTTPException(400, f"Unsupported symbol: {symbol}")
+    return raw
 
 class ChatMessage(BaseModel):
     sender: str; text: str; timestamp: str
 
 app = FastAPI(title="QuantAI API", version="1.6.0")
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(HttpMetricsMiddleware)
 
 @app.on_event("startup")
 async def startup(): 
-    init_db()
-    trade_stats_cache["needs_update"] = True  # 캐시 갱신 강제
-    asyncio.create_task(monitor_trades())
+    await run_db(init_db)
+    await chat_broker.start()
+    market_hub.start()
+    topic_hub.start()
+    if leader:
+        leader.start()
+    else:
+        await start_background()
+    readiness["started"] = True
+    asyncio.create_task(warm_up_dependencies())
+
+async def warm_up_dependencies():
+    """pandas_ta/ccxt/google-genai/feedparser 로딩을 기동 후 DB 스레드 밖에서 미리 수행"""
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(warm_up)
+    except Exception as e:
+        # 실패해도 첫 사용 시 다시 로딩하므로 준비 상태는 막지 않음
+        readiness["warmup_error"] = str(e)
+        print(f"[Error] 의존성 예열 실패: {e}")
+    readiness["warmup_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    readiness["warmed_up"] = True
+
+_background_tasks = []
+# 다른 워커가 저장한 전략 신호를 리더가 확인하는 주기 (초)
+SIGNAL_POLL_INTERVAL = float(os.getenv("QUANT_SIGNAL_POLL", "2"))
+
+async def start_background():
+    """가상 매매 감시와 선계산 시작 (리더가 바뀌었을 수 있으므로 주문장은 DB에서 다시 로딩)"""
+    for symbol, book in order_books.items():
+        await run_db(book.load)
+        _applied_strategy_ids[symbol] = await AsyncStrategyRepository.get_latest_id(symbol)
+    await trade_stats_cache.ainvalidate()  # 캐시 갱신 강제
+    _background_tasks.append(asyncio.create_task(monitor_trades()))
+    if MULTI_WORKER:
+        _background_tasks.append(asyncio.create_task(follow_strategy_signals()))
+    if SCHEDULER_ENABLED:
+        register_precompute_jobs()
+        scheduler.start()
+
+async def stop_background():
+    await scheduler.stop()
+    tasks = list(_background_tasks)
+    _background_tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+leader = LeaderElection("background", start_background, stop_background) if MULTI_WORKER else None
+
+def runs_background():
+    """이 워커가 가상 매매 감시/주문장 변경을 담당하는지 (단일 워커면 항상)"""
+    return leader is None or leader.is_leader
+
+@app.on_event("shutdown")
+async def shutdown():
+    if leader:
+        await leader.stop()
+    else:
+        await stop_background()
+    await topic_hub.stop()
+    await chat_broker.stop()
+
+def check_virtual_trades(curr_price, symbol=SYMBOL):
+    """현재가 기준 가상 매매 체결/청산 처리 (해당 심볼 주문장에서 넘어선 레벨만 평가)"""
+    for trade_id, status, _ in order_books[symbol].on_price(curr_price):
+        if status == 'OPEN':
+            print(f"[TRADE] # {trade_id} Triggered at {curr_price}")
+        else:
+            trade_stats_cache.invalidate()
+            topic_hub.poke()
+            print(f"[TRADE] Closed #{trade_id} as {status} at {curr_price}")
 
 async def monitor_trades():
-    """가상 매매 실시간 감시 및 처리 (1초 주기)"""
-    import ccxt
-    exchange = ccxt.binance({'options': {'defaultType': 'future'}})
-    symbol = "BTC/USDT"
-    
-    while True:
-        try:
-            # 1. 현재가 가져오기
-            ticker = exchange.fetch_ticker(symbol)
-            curr_price = float(ticker['last'])
-            
-            # A. 대기 중(PENDING)인 매매 체결 확인
-            pending_trades = TradeRepository.get_pending_trades()
-            for pt in pending_trades:
-                triggered = False
-                if pt['side'] == 'LONG' and curr_price <= pt['entry']: triggered = True
-                elif pt['side'] == 'SHORT' and curr_price >= pt['entry']: triggered = True
-                
-                if triggered:
-                    TradeRepository.update_trade_status(pt['id'], 'OPEN')
-                    print(f"[TRADE] # {pt['id']} Triggered at {curr_price} (Target: {pt['entry']})")
-
-            # B. 진행 중(OPEN)인 매매 승패 확인
-            open_trades = TradeRepository.get_open_trades()
-            for trade in open_trades:
-                status = None
-                if trade['side'] == 'LONG':
-                    if curr_price >= trade['tp']: status = 'WIN'
-                    elif curr_price <= trade['sl']: status = 'LOSS'
-                elif trade['side'] == 'SHORT':
-                    if curr_price <= trade['tp']: status = 'WIN'
-                    elif curr_price >= trade['sl']: status = 'LOSS'
-                    
-                if status:
-                    TradeRepository.update_trade_status(trade['id'], status, curr_price)
-                    trade_stats_cache["needs_update"] = True 
-                    print(f"[TRADE] Closed #{trade['id']} as {status} at {curr_price}")
-                
-        except Exception as e:
-            print(f"[MONITOR ERROR] {e}")
-            
-        await asyncio.sleep(1) # 1초마다 정밀 체크
+    """가상 매매 실시간 감시 및 처리 (시세 허브 구독)"""
+    q = market_hub.subscribe(kinds={'price'}, throttled=False, maxsize=1000)
+    try:
+        while True:
+            # 밀린 체결은 심볼별 최신가 하나로 합쳐서 처리
+            latest = {}
+            event = await q.get()
+            latest[event['symbol']] = event
+            while not q.empty():
+                event = q.get_nowait()
+                latest[event['symbol']] = event
+            for symbol, event in latest.items():
+                if symbol not in order_books: continue
+                try:
+                    await run_db(check_virtual_trades, float(event['price']), symbol)
+                except Exception as e:
+                    MONITOR_ERRORS.inc(symbol)
+                    print(f"[MONITOR ERROR] {symbol}: {e}")
+                    continue
+                if event.get('ts'):
+                    MONITOR_LAG.observe(max(0.0, time.time() - event['ts'] / 1000))
+    finally:
+        market_hub.unsubscribe(q)
 
 # reset_votes_periodically function removed
 
-@app.get("/api/trades/stats")
-async def get_trade_stats():
-    """가상 매매 통계 및 최근 기록 조회 (캐시 적용)"""
-    if not trade_stats_cache["needs_update"] and trade_stats_cache["data"]:
-        return trade_stats_cache["data"]
-
-    wins, losses, win_rate = TradeRepository.get_stats()
-    history = TradeRepository.get_history(10)
-    current_status = TradeRepository.get_current_status()
+async def _load_trade_stats(symbol):
+    (wins, losses, win_rate), history, current_status = await asyncio.gather(
+        AsyncTradeRepository.get_stats(symbol),
+        AsyncTradeRepository.get_history(10, symbol),
+        AsyncTradeRepository.get_current_status(symbol),
+    )
     
     data = {
         "wins": wins, 
@@ -103,133 +240,521 @@ async def get_trade_stats():
         "history": history,
         "current_status": current_status
     }
-    
-    trade_stats_cache["data"] = data
-    trade_stats_cache["needs_update"] = False
     return data
 
+def load_trade_stats(symbol=None):
+    return trade_stats_cache.aget_or_load(symbol, functools.partial(_load_trade_stats, symbol))
+
+@app.get("/api/trades/stats")
+async def get_trade_stats(request: Request, symbol: str = None):
+    """가상 매매 통계 및 최근 기록 조회 (심볼 미지정 시 전체, 캐시 적용)"""
+    if symbol: symbol = normalize_symbol(symbol)
+    return etag_response(request, await load_trade_stats(symbol))
+
+STRATEGY_LANGS = ["ko", "en"]
+
+def _strategy_age(row):
+    gen_at = datetime.strptime(row['generated_at'], "%Y-%m-%d %H:%M:%S")
+    return (datetime.now() - gen_at).total_seconds()
+
+def strategy_due_in(lang, symbol):
+    """저장된 최신 전략의 다음 갱신까지 남은 시간 (초)"""
+    row = StrategyRepository.get_latest_strategy(lang, symbol)
+    if not row: return 0.0
+    return REFRESH_INTERVALS["strategy"] - _strategy_age(row)
+
+def parse_signal(text):
+    """리포트 끝의 SIGNAL_JSON 블록 추출 (없거나 형식 오류면 None)"""
+    if "SIGNAL_JSON:" not in text: return None
+    try:
+        json_part = text.split("SIGNAL_JSON:")[1].strip()
+        json_part = json_part.replace('```json', '').replace('```', '').strip()
+        return json.loads(json_part)
+    except Exception:
+        return None
+
+# 심볼별로 주문장에 마지막으로 반영한 전략 id (백그라운드 담당 워커 기준)
+_applied_strategy_ids = {}
+_signal_lock = threading.Lock()
+
+def _apply_signal(order_book, signal):
+    if not signal:
+        return
+    if signal['side'] == 'NONE':
+        order_book.delete_pending()
+    elif not order_book.has_open():
+        order_book.upsert_pending(signal['side'], signal['entry'], signal['tp'], signal['sl'])
+
+def apply_strategy_signals(symbol):
+    """아직 반영하지 않은 저장된 전략의 신호를 순서대로 주문장에 반영 (DB 스레드에서, 반영한 전략 수 반환)"""
+    with _signal_lock:
+        rows = StrategyRepository.get_strategies_after(_applied_strategy_ids.get(symbol, 0), symbol)
+        for row in rows:
+            try:
+                _apply_signal(order_books[symbol], parse_signal(row['strategy']))
+            except Exception as e:
+                print(f"[Error] 전략 신호 반영 실패 (#{row['id']} {symbol}): {e}")
+            _applied_strategy_ids[symbol] = row['id']
+        return len(rows)
+
+async def follow_strategy_signals():
+    """(여러 워커 실행, 리더) 다른 워커가 저장한 전략의 신호를 주기적으로 주문장에 반영"""
+    while True:
+        await asyncio.sleep(SIGNAL_POLL_INTERVAL)
+        for symbol in order_books:
+            try:
+                if await run_db(apply_strategy_signals, symbol):
+                    await trade_stats_cache.ainvalidate()
+                    topic_hub.poke()
+            except Exception as e:
+                print(f"[Error] 전략 신호 확인 실패 ({symbol}): {e}")
+
+async def save_strategy(res, lang, symbol):
+    """생성된 전략 저장 + 신호를 가상 주문에 반영 (신호 반환, 생성 실패 시 RuntimeError)
+
+    주문장은 백그라운드 담당 워커(리더)만 바꾼다. 다른 워커는 저장만 하고 리더가 follow_strategy_signals로 반영한다.
+    """
+    signal = None
+    if res.get("error"):
+        # 기존 전략이 있으면 덮어쓰지 않고 백오프 후 재시도
+        if await AsyncStrategyRepository.get_latest_strategy(lang, symbol):
+            raise RuntimeError(res['strategy'])
+    else:
+        # 신호 추출 (정상적인 경우에만)
+        signal = parse_signal(res['strategy'])
+
+    await AsyncStrategyRepository.add_strategy(
+        res['price'], res['strategy'], res['generated_at'], 
+        res['funding_rate'], res['open_interest'], lang, symbol, res.get('snapshot_id')
+    )
+    if runs_background() and await run_db(apply_strategy_signals, symbol):
+        await trade_stats_cache.ainvalidate()
+    topic_hub.poke()
+    if res.get("error"):
+        raise RuntimeError(res['strategy'])
+    return signal
+
+async def refresh_strategy(lang, symbol):
+    """전략 생성 + 가상 주문 반영 + 저장 (스케줄러에서 실행)"""
+    res = await asyncio.to_thread(get_ai_strategy, lang=lang, symbol=symbol)
+    await save_strategy(res, lang, symbol)
+
 @app.get("/api/strategy")
-async def strategy(lang: str = "ko"):
-    if lang not in ["ko", "en"]: lang = "ko"
+async def strategy(request: Request, lang: str = "ko", symbol: str = SYMBOL):
+    """미리 생성된 최신 전략 조회 (요청 경로에서는 AI 호출 없음)"""
+    if lang not in STRATEGY_LANGS: lang = "ko"
+    symbol = normalize_symbol(symbol)
     
-    prev_row = StrategyRepository.get_latest_strategy(lang)
+    prev_row = await AsyncStrategyRepository.get_latest_strategy(lang, symbol)
     if prev_row:
-        gen_at = datetime.strptime(prev_row['generated_at'], "%Y-%m-%d %H:%M:%S")
-        if datetime.now() - gen_at < timedelta(hours=1):
-            return prev_row
-            
+        return etag_response(request, prev_row)
+    # 아직 생성 전이면 즉시 생성하도록 스케줄러를 깨우고 안내 문구 반환
+    scheduler.run_now(f"strategy:{symbol}:{lang}")
+    return {"strategy": "⏳ 전략 생성 중..." if lang == "ko" else "⏳ Generating strategy...", "symbol": symbol}
+
+def _fresh_strategy(lang, symbol):
+    """갱신 주기 안의 저장된 최신 전략 (없으면 None)"""
+    row = StrategyRepository.get_latest_strategy(lang, symbol)
+    return row if row and _strategy_age(row) < REFRESH_INTERVALS["strategy"] else None
+
+class _StrategyFlight:
+    """(심볼, 언어)별 진행 중인 전략 스트림 생성 하나를 여러 클라이언트가 공유 (이벤트 루프에서만 사용)
+
+    늦게 들어온 구독자도 지금까지의 조각부터 받도록 이벤트를 모두 보관한다.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.events = []
+        self.queues = set()
+
+    def emit(self, item):
+        self.events.append(item)
+        for q in self.queues:
+            q.put_nowait(item)
+        if item[0] != "chunk":
+            _strategy_flights.pop(self.key, None)
+
+    def subscribe(self):
+        q = asyncio.Queue()
+        for item in self.events:
+            q.put_nowait(item)
+        self.queues.add(q)
+        return q
+
+_strategy_flights = {}
+
+@app.get("/api/strategy/stream")
+async def strategy_stream(request: Request, lang: str = "ko", symbol: str = SYMBOL):
+    """전략 리포트 SSE: 생성 중인 텍스트 조각(chunk) → 매매 신호(signal) → 완료(done)
+
+    저장된 전략이 아직 유효하면 새로 생성하지 않고 바로 전송한다.
+    같은 심볼·언어의 동시 요청은 생성 한 번을 공유하고, 결과는 클라이언트 연결이 끊겨도 끝까지 받아 한 번만 저장한다.
+    """
+    if lang not in STRATEGY_LANGS: lang = "ko"
+    symbol = normalize_symbol(symbol)
+    prev_row = await AsyncStrategyRepository.get_latest_strategy(lang, symbol)
+    loop = asyncio.get_running_loop()
+
+    def produce(flight):
+        put = lambda *item: loop.call_soon_threadsafe(flight.emit, item)
+        # 잠금을 기다리는 동안 다른 생성이 끝났으면 그 결과를 그대로 전달
+        gen = stream_ai_strategy(lang, symbol, reuse=lambda: _fresh_strategy(lang, symbol))
+        try:
+            while True:
+                put("chunk", next(gen))
+        except StopIteration as stop:
+            res = stop.value
+        except Exception as e:
+            print(f"[ERROR] Strategy stream failed: {e}")
+            return put("error", str(e))
+        if 'id' in res:
+            return put("done", res, parse_signal(res['strategy']))  # 이미 저장된 전략
+        try:
+            signal = asyncio.run_coroutine_threadsafe(save_strategy(res, lang, symbol), loop).result()
+        except RuntimeError:
+            signal = None
+        put("done", res, signal)
+
+    async def event_generator():
+        if prev_row and _strategy_age(prev_row) < REFRESH_INTERVALS["strategy"]:
+            yield {"event": "chunk", "data": json.dumps({"text": prev_row['strategy']})}
+            yield {"event": "signal", "data": json.dumps(parse_signal(prev_row['strategy']))}
+            yield {"event": "done", "data": json.dumps(prev_row)}
+            return
+
+        flight = _strategy_flights.get((symbol, lang))
+        if flight is None:
+            flight = _strategy_flights[(symbol, lang)] = _StrategyFlight((symbol, lang))
+            loop.run_in_executor(None, produce, flight)
+        q = flight.subscribe()
+        try:
+            while True:
+                kind, *payload = await q.get()
+                if kind == "chunk":
+                    yield {"event": "chunk", "data": json.dumps({"text": payload[0]})}
+                elif kind == "error":
+                    yield {"event": "error", "data": json.dumps({"error": payload[0]})}
+                    break
+                else:
+                    res, signal = payload
+                    yield {"event": "signal", "data": json.dumps(signal)}
+                    yield {"event": "done", "data": json.dumps(res)}
+                    break
+        finally:
+            flight.queues.discard(q)
+    return EventSourceResponse(event_generator())
+
+@timed(EXCHANGE_LATENCY, "fear_greed")
+def _load_fear_greed():
+    res = requests.get("https://api.alternative.me/fng/", timeout=5).json()
+    return res['data'][0]
+
+def get_fear_greed():
+    """탐욕/공포 지수 (4시간 캐시 적용, 실패 시 이전 값 또는 중립)"""
     try:
-        res = get_ai_strategy(lang=lang)
-        # 에러 발생 여부와 상관없이 무조건 저장하여 1시간 동안 재시도 방지
-        if res:
-             # 신호 추출 (정상적인 경우에만)
-            if "SIGNAL_JSON:" in res['strategy']:
-                try:
-                    json_part = res['strategy'].split("SIGNAL_JSON:")[1].strip()
-                    json_part = json_part.replace('```json', '').replace('```', '').strip()
-                    signal = json.loads(json_part)
-                    
-                    active = TradeRepository.get_active_trade()
-                    if not active and signal['side'] != 'NONE':
-                        TradeRepository.upsert_pending_trade(signal['side'], signal['entry'], signal['tp'], signal['sl'])
-                    elif signal['side'] == 'NONE':
-                        TradeRepository.delete_pending_trades()
-                except: pass
-
-            StrategyRepository.add_strategy(
-                res['price'], res['strategy'], res['generated_at'], 
-                res['funding_rate'], res['open_interest'], lang
-            )
-        return res
-    except Exception as e:
-        print(f"[ERROR] Strategy fetch failed: {e}")
-        fallback = prev_row if prev_row else {"strategy": "⚠️ 시스템 점검 중..."}
-        return fallback
+        return fng_cache.get_or_load("latest", _load_fear_greed)
+    except Exception:
+        return fng_cache.peek("latest", {"value": "50", "value_classification": "Neutral"})
 
 @app.get("/api/fear_greed")
-def fear_greed():
+def fear_greed(request: Request):
     """탐욕/공포 지수 조회 (4시간 캐시 적용)"""
-    now = datetime.now()
-    if fng_cache["data"] and fng_cache["expiry"] > now:
-        return fng_cache["data"]
-    
-    try:
-        res = requests.get("https://api.alternative.me/fng/").json()
-        fng_cache["data"] = res['data'][0]
-        fng_cache["expiry"] = now + timedelta(hours=4)
-        return fng_cache["data"]
-    except: 
-        if fng_cache["data"]: return fng_cache["data"]
-        return {"value": "50", "value_classification": "Neutral"}
+    return etag_response(request, get_fear_greed())
 
 @app.get("/api/sentiment")
-def get_sentiment():
-    """시장 심리 조회 (5분 캐시 적용)"""
-    now = datetime.now()
-    if ls_cache["data"] and ls_cache["expiry"] > now:
-        return {"binance": ls_cache["data"]}
-        
-    ls = fetch_long_short_ratio()
-    ls_cache["data"] = ls
-    ls_cache["expiry"] = now + timedelta(minutes=1)
-    return {"binance": ls}
+def get_sentiment(request: Request, symbol: str = SYMBOL):
+    """시장 심리 조회 (1분 캐시 적용)"""
+    symbol = normalize_symbol(symbol)
+    return etag_response(request, {"binance": get_long_short_ratio(symbol)})
+
+def _cache_due_in(cache, key, interval):
+    """캐시 값의 남은 유효 시간에서 (TTL - 주기)만큼 앞당긴 갱신 시점"""
+    return cache.expires_in(key) - (cache.ttl - interval)
+
+def register_precompute_jobs():
+    """전략(심볼×언어), 뉴스 원문, 번역+브리핑 묶음, 롱/숏 심리, 전체 심볼 스캔 선계산 작업과 만료된 LLM 응답 정리 작업 등록"""
+    def job(name, kind, fn, due_in=None):
+        interval = REFRESH_INTERVALS[kind]
+        scheduler.add(Job(name, fn, interval, jitter=min(interval * 0.1, 60.0),
+                          retry_max=min(interval, 300.0), due_in=due_in))
+
+    for symbol in SYMBOLS:
+        for lang in STRATEGY_LANGS:
+            job(f"strategy:{symbol}:{lang}", "strategy", functools.partial(refresh_strategy, lang, symbol),
+                functools.partial(strategy_due_in, lang, symbol))
+        job(f"sentiment:{symbol}", "sentiment",
+            functools.partial(sentiment_cache.refresh, symbol, functools.partial(fetch_long_short_ratio, symbol)))
+    for lang, translate in [("en", True), ("en", False)]:
+        job(f"news:{lang}:{translate}", "news", functools.partial(refresh_crypto_news, lang, translate),
+            functools.partial(_cache_due_in, news_cache, f"{lang}_{translate}", REFRESH_INTERVALS["news"]))
+    # 한국어 뉴스 번역과 언어별 브리핑은 한 번의 LLM 호출로 함께 갱신
+    job("digest", "brief", refresh_ai_digest, lambda: min(
+        _cache_due_in(news_cache, "ko_True", REFRESH_INTERVALS["brief"]),
+        *(_cache_due_in(brief_cache, lang, REFRESH_INTERVALS["brief"]) for lang in STRATEGY_LANGS),
+    ))
+    job("market_scan", "scan", refresh_market_scan,
+        functools.partial(_cache_due_in, scan_result_cache, "all", REFRESH_INTERVALS["scan"]))
+    job("llm_results:purge", "llm_purge", llm.purge_results)
+
+@app.get("/api/scheduler/status")
+def get_scheduler_status():
+    """선계산 작업별 최근 실행/실패/다음 실행 시각"""
+    return {"enabled": SCHEDULER_ENABLED, "jobs": scheduler.status()}
+
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    """캐시별 적중/미스/로딩 시간 통계"""
+    return cache_stats()
+
+@app.get("/api/workers")
+def get_worker_status():
+    """실행 모드와 이 워커의 백그라운드 작업 담당 여부"""
+    status = {"multi_worker": MULTI_WORKER, "pid": os.getpid(), "background": leader is None or leader.is_leader}
+    if leader:
+        status["leader"] = leader.status()
+    return status
+
+@app.get("/api/rate_limits")
+def get_rate_limit_stats():
+    """속도 제한 정책별 허용/거부 횟수와 보관 중인 키 수"""
+    return {name: limiter.stats() for name, limiter in rate_limiters.items()}
+
+@app.get("/api/chat/stats")
+def get_chat_stats():
+    """채팅 구독자 수, 링 버퍼/저장 대기 메시지 수, 느린 구독자 끊김 횟수"""
+    return chat_broker.stats()
+
+@register_collector
+def _runtime_metrics():
+    """조회 시점의 캐시/LLM/스케줄러/스트림/속도 제한 상태를 Prometheus 지표로 변환"""
+    caches = cache_stats()
+    gateway = llm.stats()
+    jobs = scheduler.status()
+    chat = chat_broker.stats()
+    return [
+        ("quant_cache_requests_total", "counter", "캐시 조회 결과별 횟수", ("cache", "result"),
+         {(name, result): s[key] for name, s in caches.items()
+          for result, key in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses"))}),
+        ("quant_cache_load_errors_total", "counter", "캐시 로딩 실패", ("cache",),
+         {(name,): s["load_errors"] for name, s in caches.items()}),
+        ("quant_cache_entries", "gauge", "캐시 항목 수", ("cache",), {(name,): s["size"] for name, s in caches.items()}),
+        ("quant_llm_requests_total", "counter", "LLM 게이트웨이 요청 처리 결과", ("result",), {
+            ("request",): gateway["requests"], ("store_hit",): gateway["store_hits"],
+            ("backend_call",): gateway["backend_calls"], ("budget_rejection",): gateway["budget_rejections"],
+        }),
+        ("quant_scheduler_job_failures_total", "counter", "선계산 작업 실패", ("job",),
+         {(name,): j["failures"] for name, j in jobs.items()}),
+        ("quant_scheduler_job_duration_seconds", "gauge", "선계산 작업의 마지막 실행 시간", ("job",),
+         {(name,): j["last_duration_ms"] / 1000 if j["last_duration_ms"] is not None else None for name, j in jobs.items()}),
+        ("quant_stream_subscribers", "gauge", "스트림별 구독자 수", ("stream",), {
+            ("market",): market_hub.subscriber_count(), ("topics",): topic_hub.subscriber_count(),
+            ("chat",): chat["subscribers"],
+        }),
+        ("quant_background_leader", "gauge", "이 워커가 가상 매매 감시/선계산을 실행 중인지", (),
+         {(): int(leader is None or leader.is_leader)}),
+        ("quant_chat_pending_messages", "gauge", "DB 저장 대기 중인 채팅 메시지", (), {(): chat["pending"]}),
+        ("quant_rate_limit_checks_total", "counter", "속도 제한 검사 결과", ("policy", "result"),
+         {(name, result): limiter.stats()[result] for name, limiter in rate_limiters.items() for result in ("allowed", "rejected")}),
+    ]
+
+@app.get("/api/metrics")
+def get_metrics():
+    """Prometheus 수집용 지표 (텍스트 형식)"""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
 
 # post_vote endpoint removed
 
 @app.get("/api/daily_brief")
-def get_brief(lang: str = "ko"):
+def get_brief(request: Request, lang: str = "ko"):
     if lang not in ["ko", "en"]: lang = "ko"
-    return fetch_ai_daily_brief(lang=lang)
+    return etag_response(request, fetch_ai_daily_brief(lang=lang))
 
 @app.get("/api/news")
-def get_news(lang: str = "ko"):
+def get_news(request: Request, lang: str = "ko"):
     if lang not in ["ko", "en"]: lang = "ko"
-    return fetch_crypto_news(lang=lang)
+    return etag_response(request, fetch_crypto_news(lang=lang))
 
 @app.get("/api/events")
-def get_events(lang: str = "ko"):
+def get_events(request: Request, lang: str = "ko"):
     if lang not in ["ko", "en"]: lang = "ko"
-    return get_economic_events(lang=lang)
+    return etag_response(request, get_economic_events(lang=lang))
+
+def etag_response(request, data):
+    """내용 기반 ETag 응답 (If-None-Match가 같으면 본문 없이 304)"""
+    etag = etag_of(data)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(data, headers=headers)
+
+def parse_topic(topic):
+    """'strategy:BTC/USDT:ko', 'news:en', 'trades' 등 토픽 이름 해석 → (종류, 인자 목록)
+
+    지원하지 않는 토픽이면 ValueError
+    """
+    kind, *args = topic.split(":")
+    if kind in ("news", "brief", "events") and len(args) == 1 and args[0] in STRATEGY_LANGS:
+        return kind, args
+    if kind == "strategy" and len(args) == 2 and args[0] in SYMBOLS and args[1] in STRATEGY_LANGS:
+        return kind, args
+    if kind == "sentiment" and len(args) == 1 and args[0] in SYMBOLS:
+        return kind, args
+    if kind == "trades" and (not args or (len(args) == 1 and args[0] in SYMBOLS)):
+        return kind, args
+    if kind == "fear_greed" and not args:
+        return kind, args
+    raise ValueError(topic)
+
+async def load_topic(topic):
+    """토픽의 현재 데이터 (REST 엔드포인트와 같은 캐시/저장소에서 읽음)"""
+    kind, args = parse_topic(topic)
+    if kind == "strategy":
+        return await AsyncStrategyRepository.get_latest_strategy(args[1], args[0])
+    if kind == "trades":
+        return await load_trade_stats(args[0] if args else None)
+    if kind == "news":
+        return await asyncio.to_thread(fetch_crypto_news, lang=args[0])
+    if kind == "brief":
+        return await asyncio.to_thread(fetch_ai_daily_brief, lang=args[0])
+    if kind == "events":
+        return await asyncio.to_thread(get_economic_events, lang=args[0])
+    if kind == "sentiment":
+        return {"binance": await asyncio.to_thread(get_long_short_ratio, args[0])}
+    return await asyncio.to_thread(get_fear_greed)
+
+topic_hub = TopicHub(load_topic, interval=TOPIC_INTERVAL)
+
+@app.get("/api/topics/stream")
+async def topics_stream(request: Request, topics: str):
+    """여러 데이터 토픽을 하나의 SSE로 구독 (쉼표로 구분)
+
+    연결 직후 각 토픽의 현재 스냅샷을, 이후에는 내용이 바뀐 토픽만 update 이벤트로 보낸다.
+    이벤트 데이터: {topic, version, etag, data}
+    """
+    names = [t for t in dict.fromkeys(t.strip() for t in topics.split(",")) if t]
+    for name in names:
+        try:
+            parse_topic(name)
+        except ValueError:
+            raise HTTPException(400, f"Unsupported topic: {name}")
+
+    async def event_generator():
+        q = topic_hub.subscribe(names)
+        sent = {}
+
+        def update(snapshot):
+            if sent.get(snapshot['topic'], 0) >= snapshot['version']: return None
+            sent[snapshot['topic']] = snapshot['version']
+            return {"event": "update", "id": f"{snapshot['topic']}@{snapshot['version']}",
+                    "data": json.dumps(snapshot, default=str)}
+
+        try:
+            for name in names:
+                snapshot = topic_hub.current(name)
+                if snapshot is None:
+                    # 처음 구독된 토픽은 주기를 기다리지 않고 바로 읽음
+                    try:
+                        snapshot = await topic_hub.refresh(name)
+                    except Exception as e:
+                        print(f"[TOPIC ERROR] {name}: {e}")
+                event = update(snapshot) if snapshot else None
+                if event: yield event
+            while True:
+                if await request.is_disconnected(): break
+                try:
+                    snapshot = await asyncio.wait_for(q.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    yield {"comment": "hb"}
+                    continue
+                event = update(snapshot)
+                if event: yield event
+        finally: topic_hub.unsubscribe(q)
+    return EventSourceResponse(event_generator())
 
 @app.get("/api/chat/stream")
-async def chat_stream(request: Request):
+async def chat_stream(request: Request, last_id: int = None):
+    """채팅 SSE (재접속 시 Last-Event-ID 이후 메시지만 이어서 전송)"""
+    header = request.headers.get("last-event-id", "")
+    if header.isdigit(): last_id = int(header)
+
     async def event_generator():
-        q = asyncio.Queue(maxsize=20); clients.add(q)
+        q = chat_broker.subscribe()
         try:
-            messages = MessageRepository.get_recent_messages(50)
-            for msg in messages:
-                yield {"data": json.dumps(msg)}
+            sent = last_id or 0
+            for msg in await chat_broker.replay(last_id):
+                sent = msg['id']
+                yield {"id": str(msg["id"]), "data": json.dumps(msg)}
             while True:
                 if await request.is_disconnected(): break
                 try:
-                    msg = await asyncio.wait_for(q.get(), timeout=15.0)
-                    yield {"data": json.dumps(msg)}
+                    item = await asyncio.wait_for(q.get(), timeout=15.0)
                 except asyncio.TimeoutError:
                     yield {"comment": "hb"}
-        finally: clients.remove(q)
+                    continue
+                if item is None: break  # 느린 구독자로 끊김 → 클라이언트가 Last-Event-ID로 재접속
+                msg_id, data = item
+                if msg_id <= sent: continue  # 재전송분과 중복
+                yield {"id": str(msg_id), "data": data}
+        finally: chat_broker.unsubscribe(q)
     return EventSourceResponse(event_generator())
 
+@app.get("/api/market/stream")
+async def market_stream(request: Request, tf: str = "5m"):
+    """공유 시세 허브 구독 (현재가 + 선택한 타임프레임 kline)"""
+    if tf not in CHART_TIMEFRAMES: tf = "5m"
+    async def event_generator():
+        q = market_hub.subscribe(kinds={'price', 'kline'})
+        try:
+            if tf in market_hub.last_klines:
+                yield {"event": "kline", "data": json.dumps(market_hub.last_klines[tf])}
+            while True:
+                if await request.is_disconnected(): break
+                try:
+                    event = await asyncio.wait_for(q.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    yield {"comment": "hb"}
+                    continue
+                if event['symbol'] != SYMBOL: continue
+                if event['type'] == 'kline' and event['tf'] != tf: continue
+                yield {"event": event['type'], "data": json.dumps(event)}
+        finally: market_hub.unsubscribe(q)
+    return EventSourceResponse(event_generator())
+
+@app.get("/api/market/scan")
+async def market_scan(request: Request, symbols: str = None):
+    """미리 계산된 전체 심볼 스캔 결과 조회 (쉼표로 일부 심볼만 선택, 요청 경로에서는 거래소 호출 없음)"""
+    targets = list(dict.fromkeys(normalize_symbol(s) for s in symbols.split(",") if s.strip())) if symbols else SYMBOLS
+    scan = await scan_result_cache.apeek("all")
+    if scan is None:
+        # 아직 스캔 전이면 스케줄러를 깨우고 빈 결과 반환
+        scheduler.run_now("market_scan")
+        return {"results": {}, "pending": True}
+    return etag_response(request, {**scan, "results": {s: scan["results"].get(s, {}) for s in targets}})
+
+async def enforce_rate_limit(name, request):
+    """클라이언트 IP 기준 속도 제한 (초과 시 429 + Retry-After, 정책이 없으면 통과)"""
+    limiter = rate_limiters.get(name)
+    if limiter is None: return
+    ip = request.client.host
+    wait = await run_db(limiter.check, ip) if limiter.store.blocking else limiter.check(ip)
+    if wait: raise HTTPException(429, "Too many messages", headers={"Retry-After": str(math.ceil(wait))})
+
 @app.post("/api/chat/send")
 async def send_message(msg: ChatMessage, request: Request):
-    ip, now = request.client.host, datetime.now().timestamp()
-    if ip not in rate_limits:
-        rate_limits[ip] = {"tokens": 5, "last_update": now}
-    limit = rate_limits[ip]
-    limit["tokens"] = min(5, limit["tokens"] + int((now - limit["last_update"]) / 10))
-    limit["last_update"] = now
-    if limit["tokens"] <= 0: raise HTTPException(429, "Too many messages")
-    limit["tokens"] -= 1
-
-    MessageRepository.add_message(msg.sender, msg.text, msg.timestamp)
-    for q in list(clients):
-        try:
-            q.put_nowait(msg.dict())
-        except asyncio.QueueFull:
-            pass
-    return {"status": "ok"}
+    await enforce_rate_limit("chat_send", request)
+
+    sent = await chat_broker.publish(msg.sender, msg.text, msg.timestamp)
+    return {"status": "ok", "id": sent['id']}
 
 @app.get("/")
 def root(): return {"status": "ok"}
 
+@app.get("/api/ready")
+def ready():
+    """준비 상태 (startup 또는 의존성 예열 중이면 503)"""
+    ok = readiness["started"] and readiness["warmed_up"]
+    return JSONResponse(dict(readiness, ready=ok), status_code=200 if ok else 503)
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8001, reload=True)
@@ -0,0 +1,44 @@
+import time
+
+import pandas as pd
+import pytest
+
+import analyzer
+import core.database as database
+
+DELAY = 0.2
+
+@pytest.fixture
+def slow_sources(tmp_path, monkeypatch):
+    """거래소/뉴스/분석을 각각 DELAY초 걸리는 가짜로 바꿈"""
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'snapshot.db'))
+    database.init_db()
+    frame = pd.DataFrame({'close': [100.0]})
+
+    def slow(value):
+        def fn(*args, **kwargs):
+            time.sleep(DELAY)
+            return value
+        return fn
+
+    monkeypatch.setattr(analyzer, 'fetch_market_info', slow((0.01, 1234.0)))
+    monkeypatch.setattr(analyzer, 'get_long_short_ratio', slow({"ratio": 1.1}))
+    monkeypatch.setattr(analyzer, 'fetch_crypto_news', slow(["headline"]))
+    monkeypatch.setattr(analyzer, 'fetch_data', slow(frame))
+    monkeypatch.setattr(analyzer, 'analyze_data_advanced', lambda df: time.sleep(DELAY) or {'close': df['close'].iloc[-1]})
+
+def test_snapshot_gathers_sources_concurrently_and_reports_timings(slow_sources):
+    start = time.perf_counter()
+    snapshot = analyzer._build_snapshot('BTC/USDT')
+    elapsed = time.perf_counter() - start
+
+    # 순차 실행이면 3 + 2 × 타임프레임 수 만큼의 DELAY, 동시 실행이면 fetch + analyze 두 번 정도
+    sequential = DELAY * (3 + 2 * len(analyzer.TIMEFRAMES))
+    assert elapsed < sequential / 2
+    timings = snapshot["timings"]
+    stages = {"market_info", "long_short", "news", "gather"}
+    stages |= {f"{step}_{tf}" for tf in analyzer.TIMEFRAMES for step in ("fetch", "analyze")}
+    assert set(timings) == stages
+    assert all(timings[s] >= DELAY * 1000 * 0.9 for s in stages - {"gather"})
+    assert timings["gather"] < sequential * 1000 / 2
+    assert snapshot["price"] == 100.0 and snapshot["funding_rate"] == 0.01 and snapshot["id"] is not None
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import analyzer
+import core.database as database
+import main
+from core.llm import StubBackend
+from core.repository import TradeRepository
+
+def call(method, path, **kwargs):
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path, **kwargs)
+    return asyncio.run(run())
+
+def sse_events(text):
+    """SSE 응답 본문 → [(event, data dict)]"""
+    events = []
+    for block in text.replace("\r\n", "\n").strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+@pytest.fixture
+def symbols(monkeypatch):
+    monkeypatch.setattr(main, 'SYMBOLS', ['BTC/USDT', 'ETH/USDT'])
+    monkeypatch.setattr(analyzer, 'SYMBOLS', ['BTC/USDT', 'ETH/USDT'])
+
+def test_normalize_symbol_accepts_common_spellings(symbols):
+    for raw in ('btcusdt', 'BTC-USDT', 'btc_usdt', 'BTC/USDT'):
+        assert main.normalize_symbol(raw) == 'BTC/USDT'
+    assert main.normalize_symbol('ethusdt') == 'ETH/USDT'
+    for raw in ('DOGEUSDT', 'BTC/EUR', ''):
+        with pytest.raises(HTTPException) as e:
+            main.normalize_symbol(raw)
+        assert e.value.status_code == 400
+
+def test_market_scan_serves_precomputed_results_only(symbols, monkeypatch):
+    calls = []
+
+    def fake_fetch_and_analyze(tf, timings, symbol):
+        calls.append((symbol, tf))
+        return {"close": 1.0, "symbol": symbol, "tf": tf}
+
+    monkeypatch.setattr(analyzer, '_fetch_and_analyze', fake_fetch_and_analyze)
+    monkeypatch.setattr(analyzer, 'scan_result_cache', analyzer.TTLCache("market_scan_test", ttl=300))
+    monkeypatch.setattr(main, 'scan_result_cache', analyzer.scan_result_cache)
+    analyzer._scan_cache.invalidate()
+    # 스캔 전: 거래소를 부르지 않고 대기 상태만 알림
+    assert call("GET", "/api/market/scan").json() == {"results": {}, "pending": True}
+    assert calls == []
+
+    analyzer.refresh_market_scan()
+    assert sorted(calls) == sorted((s, tf) for s in ('BTC/USDT', 'ETH/USDT') for tf in analyzer.TIMEFRAMES)
+    # 중복 지정한 심볼은 한 번만, 요청 경로에서는 저장된 결과만 읽음
+    res = call("GET", "/api/market/scan", params={"symbols": "ethusdt,ETH-USDT,eth_usdt"})
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert list(results) == ['ETH/USDT']
+    assert all(results['ETH/USDT'][tf]["tf"] == tf for tf in analyzer.TIMEFRAMES)
+    assert set(call("GET", "/api/market/scan").json()["results"]) == {'BTC/USDT', 'ETH/USDT'}
+    assert len(calls) == 2 * len(analyzer.TIMEFRAMES)
+    assert call("GET", "/api/market/scan", params={"symbols": "DOGEUSDT"}).status_code == 400
+    analyzer._scan_cache.invalidate()
+
+REPORT = 'Summary... SIGNAL_JSON: ```json {"side": "LONG", "entry": 100.0, "tp": 110.0, "sl": 95.0} ```'
+
+@pytest.fixture
+def stub_strategy(tmp_path, monkeypatch):
+    """임시 DB + 고정 스냅샷 + 천천히 조각을 내보내는 스텁 LLM"""
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'api.db'))
+    database.init_db()
+    snapshot = {"id": None, "price": 100.0, "funding_rate": 0.01, "open_interest": 1.0, "news": [],
+                "analyses": {tf: {} for tf in analyzer.TIMEFRAMES}, "timings": {}}
+    monkeypatch.setattr(analyzer, 'get_market_snapshot', lambda symbol: snapshot)
+    monkeypatch.setattr(analyzer, 'get_economic_events', lambda lang: [])
+    backend = StubBackend(lambda prompt, json_mode: REPORT, chunk_size=8, chunk_delay=0.01)
+    monkeypatch.setattr(analyzer.llm, 'backend', backend)
+    monkeypatch.setattr(analyzer.llm, '_memory', analyzer.TTLCache("llm_test", ttl=60))
+    monkeypatch.setattr(main, 'order_books', {'BTC/USDT': main.VirtualOrderBook('BTC/USDT')})
+    return backend
+
+def test_concurrent_strategy_streams_share_one_generation(stub_strategy):
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            get = lambda: client.get("/api/strategy/stream", params={"lang": "en"})
+            responses = await asyncio.gather(*(get() for _ in range(5)))
+            # 생성이 끝난 뒤의 요청은 저장된 전략을 바로 받음
+            responses.append(await get())
+            return responses
+
+    responses = asyncio.run(run())
+    for res in responses:
+        events = sse_events(res.text)
+        assert "".join(data["text"] for kind, data in events if kind == "chunk") == REPORT
+        assert events[-2] == ("signal", {"side": "LONG", "entry": 100.0, "tp": 110.0, "sl": 95.0})
+        assert events[-1][0] == "done"
+    assert len(stub_strategy.calls) == 1
+    with database.get_db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM strategy_history").fetchone()[0] == 1
+    assert TradeRepository.get_status_counts('BTC/USDT') == {'PENDING': 1}
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from core.backtest import first_cross, run_backtest
+from core.order_book import _resolve
+
+def make_candles(n=3000, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.4, n))
+    open_ = np.concatenate([[100.0], close[:-1]]) + rng.normal(0, 0.1, n)
+    high = np.maximum(open_, close) + rng.exponential(0.3, n)
+    low = np.minimum(open_, close) - rng.exponential(0.3, n)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close},
+                        index=pd.date_range('2026-01-01', periods=n, freq='1min'))
+
+def make_signals(candles, m=400, seed=5):
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.integers(0, len(candles) - 1, m))
+    rows = []
+    for i in idx:
+        side = rng.choice(['LONG', 'SHORT'])
+        ref = candles['close'].iloc[i]
+        entry = ref - rng.uniform(0, 1.5) if side == 'LONG' else ref + rng.uniform(0, 1.5)
+        d_tp, d_sl = rng.uniform(0.3, 4), rng.uniform(0.3, 4)
+        tp, sl = (entry + d_tp, entry - d_sl) if side == 'LONG' else (entry - d_tp, entry + d_sl)
+        rows.append({'time': candles.index[i] + pd.Timedelta(seconds=30), 'side': side, 'entry': entry, 'tp': tp, 'sl': sl})
+    return pd.DataFrame(rows)
+
+def reference(candles, signal):
+    """봉마다 양봉 O→L→H→C, 음봉 O→H→L→C 틱을 실시간 규칙(_resolve)으로 하나씩 평가"""
+    trade = dict(signal, status='PENDING')
+    for t, o, h, l, c in candles[candles.index >= signal['time']].itertuples():
+        for price in ((o, l, h, c) if c >= o else (o, h, l, c)):
+            if trade['status'] == 'PENDING' and _resolve(trade, price) == 'OPEN':
+                trade['status'] = 'OPEN'
+            if trade['status'] == 'OPEN':
+                status = _resolve(trade, price)
+                if status: return status
+    return trade['status']
+
+def test_first_cross_matches_linear_scan():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 1, 5000)
+    starts, levels = rng.integers(0, 5200, 300), rng.uniform(-3.5, 0, 300)
+    expected = [next((j for j in range(s, len(values)) if values[j] <= lv), len(values)) for s, lv in zip(starts, levels)]
+    assert first_cross(values, starts, levels, below=True, block=64).tolist() == expected
+
+def test_ohlc_policy_matches_tick_replay():
+    candles = make_candles()
+    signals = make_signals(candles)
+    trades, _ = run_backtest(candles, signals, intrabar='ohlc', exclusive=False)
+    expected = [reference(candles, s) for s in signals.to_dict('records')]
+    assert trades['status'].tolist() == expected
+
+def test_stats_and_exclusive_mode():
+    candles = make_candles()
+    signals = make_signals(candles)
+    worst, worst_stats = run_backtest(candles, signals, intrabar='worst', exclusive=False)
+    best, best_stats = run_backtest(candles, signals, intrabar='best', exclusive=False)
+    assert best_stats['wins'] >= worst_stats['wins']
+    closed = worst[worst['status'].isin(['WIN', 'LOSS'])]
+    assert worst_stats['win_rate'] == round((closed['status'] == 'WIN').mean() * 100, 1)
+    assert 0 <= worst_stats['max_drawdown_pct'] <= 100
+    # 실시간과 같이 포지션 보유 중 신호는 무시, 다음 신호가 대기 주문 대체
+    exclusive, stats = run_backtest(candles, signals, intrabar='worst')
+    assert stats['skipped'] > 0 and stats['expired'] > 0
+    held = exclusive[exclusive['status'].isin(['WIN', 'LOSS'])].sort_values('fill_time')
+    assert (held['fill_time'].to_numpy()[1:] >= held['exit_time'].to_numpy()[:-1]).all()
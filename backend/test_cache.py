@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+from core.cache import TTLCache
+
+class Clock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+def test_single_flight_across_threads():
+    cache = TTLCache("t_threads", ttl=60)
+    calls, gate = [], threading.Event()
+
+    def loader():
+        calls.append(1)
+        gate.wait(2)
+        return "v"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(8)]
+    for t in threads: t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads: t.join()
+    assert results == ["v"] * 8 and len(calls) == 1
+    assert cache.get_or_load("k", loader) == "v" and len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+def test_stale_value_served_while_refreshing():
+    clock = Clock()
+    cache = TTLCache("t_swr", ttl=10, stale_ttl=30, clock=clock)
+    cache.set("k", "old")
+    clock.now += 15
+    refreshed = threading.Event()
+
+    def loader():
+        refreshed.set()
+        return "new"
+
+    assert cache.get_or_load("k", loader) == "old"  # 기다리지 않고 이전 값
+    assert refreshed.wait(2)
+    for _ in range(50):
+        if cache.peek("k") == "new": break
+        time.sleep(0.01)
+    assert cache.get_or_load("k", loader) == "new"
+
+    # stale 구간을 넘기면 새로 로딩될 때까지 대기
+    clock.now += 100
+    assert cache.get_or_load("k", lambda: "newest") == "newest"
+
+def test_lru_eviction_and_errors():
+    cache = TTLCache("t_lru", ttl=60, maxsize=2)
+    cache.set("a", 1); cache.set("b", 2)
+    assert cache.get("a") == 1  # a를 최근 사용으로
+    cache.set("c", 3)
+    assert cache.peek("b") is None and cache.peek("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+    def boom(): raise RuntimeError("upstream down")
+    try:
+        cache.get_or_load("d", boom)
+        assert False
+    except RuntimeError:
+        pass
+    assert cache.peek("d") is None and cache.stats()["load_errors"] == 1
+
+def test_async_single_flight_and_invalidate_during_load():
+    cache = TTLCache("t_async", ttl=60)
+    calls = []
+
+    async def run():
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        first = await asyncio.gather(*(cache.aget_or_load("k", loader) for _ in range(10)))
+        # 로딩 중 무효화되면 그 결과는 저장하지 않음
+        pending = asyncio.create_task(cache.aget_or_load("x", loader))
+        await asyncio.sleep(0.01)
+        cache.invalidate()
+        await pending
+        return first
+
+    assert asyncio.run(run()) == [1] * 10
+    assert cache.peek("x") is None and cache.peek("k") is None
+
+def test_persisted_entries_survive_restart(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    TTLCache("t_file", ttl=60, persist=True).set("ko", ["a", "b"])
+    assert (tmp_path / "t_file_cache_ko.json").exists()
+    assert TTLCache("t_file", ttl=60, persist=True).get_or_load("ko", lambda: ["z"]) == ["a", "b"]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from core.candles import Candles
+from core.fetcher import MarketDataFetcher
+
+def kline(t, o, h, l, c, v, buy):
+    return [t, str(o), str(h), str(l), str(c), str(v), t + 59_999, "0", 10, str(buy), "0", "0"]
+
+KLINES = [
+    kline(1_700_000_000_000, 100.5, 101.0, 99.0, 100.0, 12.5, 7.5),
+    kline(1_700_000_060_000, 100.0, 102.25, 99.5, 102.0, 20.0, 15.0),
+    kline(1_700_000_120_000, 102.0, 102.5, 100.0, 100.5, 8.0, 2.0),
+]
+
+def legacy_frame(rows):
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'taker_buy_vol'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df = df.set_index('timestamp').sort_index()
+    df['taker_sell_vol'] = df['volume'] - df['taker_buy_vol']
+    df['delta'] = df['taker_buy_vol'] - df['taker_sell_vol']
+    return df
+
+def test_klines_and_rows_decode_to_same_frame_as_pandas():
+    candles = Candles.from_klines(KLINES)
+    assert candles.open_time.dtype == np.int64 and candles.values.dtype == np.float64
+    assert candles.close.tolist() == [100.0, 102.0, 100.5]
+    rows = candles.rows()
+    assert rows[0] == (1_700_000_000_000, 100.5, 101.0, 99.0, 100.0, 12.5, 7.5)
+    expected = legacy_frame(rows)
+    pd.testing.assert_frame_equal(candles.to_frame(), expected)
+    pd.testing.assert_frame_equal(Candles.from_rows(rows).to_frame(), expected)
+    # 역순 입력은 정렬, 정렬된 입력은 그대로
+    assert candles.sorted() is candles
+    pd.testing.assert_frame_equal(Candles.from_klines(KLINES[::-1]).to_frame(), expected)
+    assert Candles.from_klines([]).to_frame().empty and Candles.from_rows([]).to_frame().empty
+
+def test_fetch_ohlcv_without_store_uses_decoder():
+    class Exchange:
+        def fapiPublicGetKlines(self, params):
+            assert params == {'symbol': 'BTCUSDT', 'interval': '1m', 'limit': 3}
+            return KLINES
+
+    df = MarketDataFetcher('BTC/USDT', use_store=False, exchange=Exchange()).fetch_ohlcv('1m', 3)
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume', 'taker_buy_vol', 'taker_sell_vol', 'delta']
+    assert df['delta'].tolist() == [2.5, 10.0, -4.0]
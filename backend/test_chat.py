@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+import core.database as database
+from core.chat import ChatBroker, UnixSocketPubSub
+from core.repository import MessageRepository
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'chat.db'))
+    database.init_db()
+
+def test_recent_messages_returns_newest_in_order():
+    for i in range(5):
+        MessageRepository.add_message("u", f"m{i}", "00:00")
+    assert [m['text'] for m in MessageRepository.get_recent_messages(3)] == ["m2", "m3", "m4"]
+
+def test_replay_after_last_event_id_and_batched_persistence():
+    async def run():
+        broker = ChatBroker(history=3, flush_interval=3600)
+        await broker.start()
+        sent = [await broker.publish("u", f"m{i}", "00:00") for i in range(5)]
+        assert MessageRepository.get_recent_messages(10) == []  # 아직 저장 전
+        recent = await broker.replay()
+        resumed = await broker.replay(sent[2]['id'])
+        # 링 버퍼(3개)보다 오래된 id는 DB에서 보충 (대기 중인 메시지를 먼저 저장)
+        from_db = await broker.replay(sent[0]['id'])
+        await broker.stop()
+        return sent, recent, resumed, from_db, broker.stats()
+
+    sent, recent, resumed, from_db, stats = asyncio.run(run())
+    assert [m['text'] for m in recent] == ["m2", "m3", "m4"]
+    assert [m['text'] for m in resumed] == ["m3", "m4"]
+    assert [m['text'] for m in from_db] == ["m1", "m2", "m3", "m4"]
+    assert stats["persisted"] == 5 and stats["pending"] == 0
+    assert [m['id'] for m in MessageRepository.get_recent_messages(10)] == [m['id'] for m in sent]
+
+def test_slow_subscriber_is_disconnected():
+    async def run():
+        broker = ChatBroker(queue_size=2, flush_interval=3600)
+        await broker.start()
+        slow, fast = broker.subscribe(), broker.subscribe()
+        for i in range(3):
+            await broker.publish("u", f"m{i}", "00:00")
+            while not fast.empty(): fast.get_nowait()
+        await broker.stop()
+        return slow.get_nowait(), broker.stats()
+
+    signal, stats = asyncio.run(run())
+    assert signal is None
+    assert stats["dropped_subscribers"] == 1 and stats["subscribers"] == 1
+
+def test_unix_socket_pubsub_fans_out_between_brokers(tmp_path):
+    async def run():
+        a, b = ChatBroker(UnixSocketPubSub(str(tmp_path / "a"))), ChatBroker(UnixSocketPubSub(str(tmp_path / "a")))
+        b.pubsub.path = str(tmp_path / "a" / "chat-other.sock")  # 같은 프로세스에서 두 워커 흉내
+        await a.start(); await b.start()
+        q = b.subscribe()
+        msg = await a.publish("u", "hello", "00:00")
+        msg_id, _ = await asyncio.wait_for(q.get(), timeout=2)
+        await a.stop(); await b.stop()
+        return msg, msg_id, b.stats()
+
+    msg, msg_id, stats = asyncio.run(run())
+    assert msg_id == msg['id']
+    assert stats["persisted"] == 0  # 저장은 발행한 워커만
+
+def test_ids_stay_below_js_safe_integer_and_unique_across_workers(monkeypatch):
+    async def run():
+        a, b = ChatBroker(flush_interval=3600), ChatBroker(flush_interval=3600)
+        await a.start(); await b.start()
+        # 같은 밀리초에 두 워커가 순번을 넘칠 만큼 발행
+        monkeypatch.setattr("core.chat.time.time_ns", lambda: 1_700_000_000_000_000_000)
+        ids = [broker.next_id() for _ in range(100) for broker in (a, b)]
+        nodes = a.node, b.node
+        await a.stop(); await b.stop()
+        return ids, nodes
+
+    ids, nodes = asyncio.run(run())
+    assert nodes[0] != nodes[1]
+    assert len(set(ids)) == len(ids)
+    assert max(ids) < 2 ** 53
+    a_ids = ids[::2]
+    assert a_ids == sorted(a_ids)
+
+def test_migration_rewrites_legacy_microsecond_ids(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'legacy.db'))
+    database.init_db()
+    legacy = [1_700_000_000_000_000 * 16 + 3, 1_700_000_000_000_500 * 16 + 5, 1_700_000_000_001_000 * 16 + 3]
+    with database.write_tx() as conn:
+        conn.executemany("INSERT INTO messages (id, sender, text, timestamp) VALUES (?, 'u', ?, '00:00')",
+                         [(i, f"m{n}") for n, i in enumerate(legacy)])
+        conn.execute("PRAGMA user_version = 7")
+    database.init_db()
+    rows = MessageRepository.get_recent_messages(10)
+    assert [m['text'] for m in rows] == ["m0", "m1", "m2"]
+    assert all(m['id'] < 2 ** 53 for m in rows)
+    assert [m['id'] >> 10 for m in rows] == [1_700_000_000_000, 1_700_000_000_000, 1_700_000_000_001]
@@ -0,0 +1,62 @@
+import sqlite3
+
+import core.database as database
+from core.repository import TradeRepository
+
+def test_migrations_backfill_summary_and_track_status_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / 'legacy.db')
+    monkeypatch.setattr(database, 'DB_NAME', path)
+
+    # 마이그레이션 이전 스키마에 기록이 쌓여 있는 DB
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE virtual_trades (id INTEGER PRIMARY KEY AUTOINCREMENT, side TEXT, entry REAL, tp REAL, sl REAL, "
+                 "status TEXT DEFAULT 'OPEN', close_price REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.executemany("INSERT INTO virtual_trades (side, status) VALUES ('LONG', ?)",
+                     [('WIN',), ('WIN',), ('LOSS',), ('OPEN',)])
+    conn.commit(); conn.close()
+
+    database.init_db()
+    database.init_db()  # 재실행해도 중복 적용되지 않음
+    with database.get_db() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(database.MIGRATIONS)
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM strategy_history WHERE symbol = 'BTC/USDT' AND lang = 'ko' ORDER BY id DESC LIMIT 1").fetchall()
+        assert any('idx_strategy_history_symbol_lang_id' in row[-1] for row in plan)
+
+    assert TradeRepository.get_stats() == (2, 1, 66.7)
+    assert TradeRepository.get_current_status() == "OPEN"
+
+    trade_id = TradeRepository.get_active_trades()[0]['id']
+    TradeRepository.apply_transitions([(trade_id, 'LOSS', 1.0)])
+    TradeRepository.upsert_pending_trade('SHORT', 1.0, 0.5, 1.5)
+    assert TradeRepository.get_stats() == (2, 2, 50.0)
+    assert TradeRepository.get_current_status() == "PENDING"
+
+    TradeRepository.delete_pending_trades()
+    assert TradeRepository.get_status_counts() == {'WIN': 2, 'LOSS': 2, 'OPEN': 0, 'PENDING': 0}
+
+    # 심볼별 주문/집계 분리 (기존 기록은 기본 심볼로 이관)
+    TradeRepository.upsert_pending_trade('LONG', 1.0, 2.0, 0.5, symbol='ETH/USDT')
+    TradeRepository.upsert_pending_trade('LONG', 1.0, 2.0, 0.5)
+    assert TradeRepository.get_current_status('ETH/USDT') == "PENDING"
+    assert TradeRepository.get_stats('ETH/USDT') == (0, 0, 0)
+    assert TradeRepository.get_stats(database.DEFAULT_SYMBOL) == (2, 2, 50.0)
+    assert TradeRepository.get_status_counts()['PENDING'] == 2
+    TradeRepository.delete_pending_trades('ETH/USDT')
+    assert TradeRepository.get_current_status('ETH/USDT') == "IDLE"
+    assert [t['symbol'] for t in TradeRepository.get_active_trades()] == [database.DEFAULT_SYMBOL]
+
+def test_snapshot_shared_by_strategies(tmp_path, monkeypatch):
+    import numpy as np
+    from core.repository import SnapshotRepository, StrategyRepository
+
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'snap.db'))
+    database.init_db()
+    snapshot_id = SnapshotRepository.add_snapshot('BTC/USDT', '2026-01-01 00:00:00',
+                                                  {'price': np.float64(100.5), 'analyses': {'1h': {'rsi': np.float32(55.0)}}})
+    for lang in ('ko', 'en'):
+        StrategyRepository.add_strategy(100.5, f'report-{lang}', '2026-01-01 00:00:00', 0.01, 1.0, lang, snapshot_id=snapshot_id)
+
+    assert {StrategyRepository.get_latest_strategy(lang)['snapshot_id'] for lang in ('ko', 'en')} == {snapshot_id}
+    snap = SnapshotRepository.get_latest_snapshot('BTC/USDT')
+    assert snap['id'] == snapshot_id and snap['data'] == {'price': 100.5, 'analyses': {'1h': {'rsi': 55.0}}}
+    assert SnapshotRepository.get_snapshot(snapshot_id + 1) is None
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+import core.database as database
+from core.fetcher import KLINE_PAGE_LIMIT, MarketDataFetcher
+from core.repository import CandleRepository
+
+HOUR_MS = 3_600_000
+START_MS = 1_700_000_000_000 // HOUR_MS * HOUR_MS
+
+class FakeExchange:
+    """1시간봉만 제공하는 바이낸스 klines 흉내 (now까지의 봉, 종가 = 봉 번호)"""
+
+    def __init__(self):
+        self.now = START_MS
+        self.requests = []
+
+    def parse_timeframe(self, tf):
+        return 3600
+
+    def fapiPublicGetKlines(self, params):
+        self.requests.append(params)
+        limit = params['limit']
+        last = (self.now - START_MS) // HOUR_MS
+        if 'startTime' in params:
+            lo = -(-(params['startTime'] - START_MS) // HOUR_MS)
+            index = range(max(0, lo), min(last + 1, max(0, lo) + limit))
+        else:
+            hi = min(last, (params['endTime'] - START_MS) // HOUR_MS) if 'endTime' in params else last
+            index = range(max(0, hi - limit + 1), hi + 1)
+        return [[START_MS + i * HOUR_MS, "1", "2", "0.5", str(i), "10", 0, "0", 1, "4", "0", "0"] for i in index]
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'candles.db'))
+    exchange = FakeExchange()
+    # 시계는 거래소의 현재 시각을 따름
+    monkeypatch.setattr("core.fetcher.time.time", lambda: exchange.now / 1000)
+    return MarketDataFetcher(exchange=exchange)
+
+def advance(fetcher, bars):
+    fetcher.exchange.now += bars * HOUR_MS
+    fetcher.exchange.requests.clear()
+
+def assert_contiguous(df, last_bar, n):
+    assert len(df) == n
+    assert df['close'].tolist() == list(range(last_bar - n + 1, last_bar + 1))
+    assert (df.index.to_series().diff().iloc[1:] == pd.Timedelta(hours=1)).all()
+
+def test_cold_start_pages_backwards_for_long_requests(fetcher):
+    advance(fetcher, 5000)
+    df = fetcher.fetch_ohlcv('1h', limit=2000)
+    assert_contiguous(df, 5000, 2000)
+    # 최신 1500개 + 과거 방향 백필 500개
+    assert [r['limit'] for r in fetcher.exchange.requests] == [KLINE_PAGE_LIMIT, 500]
+
+def test_delta_fetch_requests_only_new_bars_and_pages_forward(fetcher):
+    advance(fetcher, 3000)
+    fetcher.fetch_ohlcv('1h', limit=2000)
+    advance(fetcher, 3)
+    assert_contiguous(fetcher.fetch_ohlcv('1h', limit=2000), 3003, 2000)
+    assert len(fetcher.exchange.requests) == 1
+    assert fetcher.exchange.requests[0]['startTime'] == START_MS + 3000 * HOUR_MS
+    # 저장분 이후 공백이 한 페이지보다 길면 이어서 여러 페이지 요청
+    advance(fetcher, 1600)
+    assert_contiguous(fetcher.fetch_ohlcv('1h', limit=2000), 4603, 2000)
+    assert ['startTime' in r for r in fetcher.exchange.requests] == [True, True]
+
+def test_large_gap_refetch_leaves_no_hole(fetcher):
+    advance(fetcher, 3000)
+    fetcher.fetch_ohlcv('1h', limit=2000)
+    # 요청 길이보다 긴 공백: 최신 구간을 새로 받고 옛 캔들은 버린 뒤 백필
+    advance(fetcher, 4000)
+    assert_contiguous(fetcher.fetch_ohlcv('1h', limit=2000), 7000, 2000)
+    first, last, count = CandleRepository.get_bounds('BTC/USDT', '1h')
+    assert count == 2000 and last - first == 1999 * HOUR_MS
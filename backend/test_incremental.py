@@ -0,0 +1,46 @@
+import numpy as np
+import pandas_ta as ta
+
+from core.incremental import IncrementalIndicators
+from core.indicators import calculate_volume_profile, calculate_vwap
+
+def batch_values(df):
+    return {
+        'rsi': ta.rsi(df['close'], length=14).iloc[-1],
+        'atr': ta.atr(df['high'], df['low'], df['close'], length=14).iloc[-1],
+        'adx': ta.adx(df['high'], df['low'], df['close'], length=14)['ADX_14'].iloc[-1],
+        'vwap': calculate_vwap(df).iloc[-1],
+        'cvd': df['delta'].cumsum().iloc[-1],
+        'vp': calculate_volume_profile(df),
+    }
+
+def assert_matches(snap, expected):
+    for k in ('rsi', 'atr', 'adx', 'vwap', 'cvd'):
+        assert np.isclose(snap[k], expected[k], rtol=1e-9, atol=1e-9), (k, snap[k], expected[k])
+    for k in ('poc', 'vah', 'val'):
+        assert np.isclose(snap['vp'][k], expected['vp'][k], rtol=1e-12), (k, snap['vp'], expected['vp'])
+    assert snap['vp']['lookback'] == expected['vp']['lookback']
+
+def test_incremental_matches_batch(make_candles):
+    df = make_candles()
+    state, start = IncrementalIndicators(), 0
+    for end in (30, 120, 301, 450, len(df)):
+        state.ingest_frame(df.iloc[start:end])
+        assert_matches(state.snapshot(), batch_values(df.iloc[:end]))
+        start = end
+
+def test_live_candle_updates_replace_last_bar(make_candles):
+    df = make_candles(400)
+    state = IncrementalIndicators()
+    state.ingest_frame(df.iloc[:-1])
+
+    # 진행 중인 봉이 여러 번 갱신되어도 최종 값만 반영되어야 함
+    last = df.iloc[-1]
+    for frac in (0.3, 0.7):
+        state.update(df.index[-1], last['open'], last['high'] * (1 + frac / 100), last['low'],
+                     last['close'] * (1 - frac / 100), last['volume'] * frac, last['taker_buy_vol'] * frac)
+    state.update(df.index[-1], *last[['open', 'high', 'low', 'close', 'volume', 'taker_buy_vol']])
+    assert_matches(state.snapshot(), batch_values(df))
+
+    # 과거 캔들은 무시
+    assert state.update(df.index[0], 1, 1, 1, 1, 1, 1) is False
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+from core.indicators import detect_smc_structure
+
+def legacy_detect_smc_structure(df, lookback=200):
+    """배열 스캐너 도입 전 행 단위 구현 (결과 비교용 고정 사본)"""
+    df_recent = df.iloc[-lookback:].copy()
+    if len(df_recent) < 20:
+        return [], []
+    if 'atr' not in df_recent.columns:
+        df_recent['atr'] = ta.atr(df_recent['high'], df_recent['low'], df_recent['close'], length=14)
+    df_recent['vol_sma'] = df_recent['volume'].rolling(20).mean()
+
+    unmit_fvgs, unmit_obs = [], []
+    for i in range(2, len(df_recent) - 1):
+        c1_h, c1_l = df_recent['high'].iloc[i-2], df_recent['low'].iloc[i-2]
+        c3_h, c3_l = df_recent['high'].iloc[i], df_recent['low'].iloc[i]
+        gap = abs(c1_h - c3_l) if c1_h < c3_l else abs(c1_l - c3_h)
+        atr_i = df_recent['atr'].iloc[i]
+        if c1_h < c3_l and gap > atr_i * 0.5:
+            unmit_fvgs.append({'type': 'BullFVG', 'top': c3_l, 'bottom': c1_h, 'idx': i})
+        elif c1_l > c3_h and gap > atr_i * 0.5:
+            unmit_fvgs.append({'type': 'BearFVG', 'top': c1_l, 'bottom': c3_h, 'idx': i})
+
+        body = abs(df_recent['close'].iloc[i] - df_recent['open'].iloc[i])
+        if body > (atr_i * 1.8) and df_recent['volume'].iloc[i] > (df_recent['vol_sma'].iloc[i] * 1.5):
+            if df_recent['close'].iloc[i] > df_recent['open'].iloc[i]:
+                for j in range(i-1, max(0, i-5), -1):
+                    if df_recent['close'].iloc[j] < df_recent['open'].iloc[j]:
+                        unmit_obs.append({'type': 'BullOB', 'top': df_recent['high'].iloc[j], 'bottom': df_recent['low'].iloc[j], 'idx': j})
+                        break
+            else:
+                for j in range(i-1, max(0, i-5), -1):
+                    if df_recent['close'].iloc[j] > df_recent['open'].iloc[j]:
+                        unmit_obs.append({'type': 'BearOB', 'top': df_recent['high'].iloc[j], 'bottom': df_recent['low'].iloc[j], 'idx': j})
+                        break
+
+    v_fvgs, v_obs = [], []
+    for f in unmit_fvgs:
+        sub = df_recent.iloc[f['idx']+1:]
+        if f['type'] == 'BullFVG' and sub['low'].min() < f['bottom']: continue
+        if f['type'] == 'BearFVG' and sub['high'].max() > f['top']: continue
+        v_fvgs.append(f)
+    for o in unmit_obs:
+        sub = df_recent.iloc[o['idx']+1:]
+        if o['type'] == 'BullOB' and sub['low'].min() < o['bottom']: continue
+        if o['type'] == 'BearOB' and sub['high'].max() > o['top']: continue
+        v_obs.append(o)
+    return v_fvgs[-2:], v_obs[-2:]
+
+def random_frame(rng):
+    """급등락 봉과 거래량 급증이 섞인 랜덤 캔들 (FVG/OB가 자주 생기도록)"""
+    n = int(rng.integers(15, 320))
+    step = rng.normal(0, 1, n) * rng.choice([20, 60, 400], n, p=[0.6, 0.3, 0.1])
+    close = 30000 + np.cumsum(step)
+    open_ = close - step * rng.uniform(0.5, 1.2, n)
+    high = np.maximum(open_, close) + rng.exponential(15, n)
+    low = np.minimum(open_, close) - rng.exponential(15, n)
+    volume = rng.lognormal(4, 0.8, n)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+                        index=pd.date_range('2026-01-01', periods=n, freq='1h'))
+
+def test_smc_scanner_matches_legacy_row_loop():
+    rng = np.random.default_rng(2024)
+    fvgs = obs = 0
+    for _ in range(200):
+        df = random_frame(rng)
+        expected = legacy_detect_smc_structure(df)
+        assert detect_smc_structure(df) == expected
+        fvgs, obs = fvgs + len(expected[0]), obs + len(expected[1])
+    assert fvgs > 100 and obs > 20  # 빈 결과끼리만 비교하지 않았는지
@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+
+import pytest
+
+import core.database as database
+from core.llm import LLMBudgetExceeded, LLMGateway, StubBackend
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'llm.db'))
+    database.init_db()
+
+def gateway(backend, **kwargs):
+    kwargs.setdefault('qps', 1000)
+    return LLMGateway(backend, **kwargs)
+
+def test_results_are_content_addressed_and_persisted():
+    backend = StubBackend()
+    first = gateway(backend).generate("  Translate:\n    headline one\n\n")
+    # 새 인스턴스(메모리 캐시 없음)에서도 정규화가 같은 프롬프트는 저장된 결과 사용
+    again = gateway(backend).generate("Translate:\nheadline   one")
+    assert first == again and len(backend.calls) == 1
+    gateway(backend).generate("Translate:\nheadline one", cache=False)
+    assert len(backend.calls) == 2
+
+def test_concurrent_identical_requests_are_coalesced():
+    def slow(prompt, json_mode):
+        time.sleep(0.1)
+        return "ok"
+
+    backend = StubBackend(slow)
+    gw = gateway(backend)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(gw.generate("same prompt"))) for _ in range(6)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert results == ["ok"] * 6 and len(backend.calls) == 1
+
+def test_batch_combines_tasks_and_fills_individual_cache():
+    def responder(prompt, json_mode):
+        if json_mode:
+            return json.dumps({"news_ko": "번역", "brief_en": "brief"})
+        return "single"
+
+    backend = StubBackend(responder)
+    gw = gateway(backend)
+    out = gw.generate_batch({"news_ko": "translate these", "brief_en": "brief en", "brief_ko": "brief ko"})
+    # brief_ko는 묶음 응답에 없어서 개별 호출로 보완
+    assert out == {"news_ko": "번역", "brief_en": "brief", "brief_ko": "single"}
+    assert len(backend.calls) == 2 and gw.stats()["batched_tasks"] == 3
+    assert gateway(backend).generate("translate these") == "번역" and len(backend.calls) == 2
+
+def test_budget_rejects_when_wait_exceeds_limit():
+    gw = gateway(StubBackend(), qps=0.01, max_wait=0.0)
+    gw.generate("first")
+    with pytest.raises(LLMBudgetExceeded):
+        gw.generate("second")
+    assert gw.stats()["budget_rejections"] == 1
+
+def test_stream_yields_chunks_then_serves_stored_result():
+    backend = StubBackend(lambda prompt, json_mode: "abcdefghij", chunk_size=3)
+    gw = gateway(backend)
+    assert list(gw.generate_stream("report")) == ["abc", "def", "ghi", "j"]
+    # 완료된 응답은 저장되어 같은 프롬프트는 한 번에 전달
+    assert list(gateway(backend).generate_stream("report")) == ["abcdefghij"]
+    assert gw.generate("report") == "abcdefghij" and len(backend.calls) == 1
+
+def test_zero_budget_means_unlimited():
+    gw = gateway(StubBackend(), qps=0, tokens_per_minute=0, max_wait=0.0)
+    for i in range(5):
+        gw.generate(f"prompt {i}")
+    assert gw.stats()["backend_calls"] == 5 and gw.stats()["budget_rejections"] == 0
+    with pytest.raises(ValueError):
+        gateway(StubBackend(), qps=-1)
+
+def test_expired_results_are_refetched_and_purged(monkeypatch):
+    backend = StubBackend()
+    gw = gateway(backend, result_ttl=60)
+    gw.generate("old prompt")
+    now = time.time()
+    monkeypatch.setattr("core.llm.time.time", lambda: now + 61)
+    monkeypatch.setattr("core.repository.time.time", lambda: now + 61)
+    assert gw.purge_results() == 1
+    gateway(backend, result_ttl=60).generate("old prompt")
+    assert len(backend.calls) == 2
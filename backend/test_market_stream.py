@@ -0,0 +1,49 @@
+import asyncio
+
+from core.market_stream import MarketDataHub, ReplaySource
+
+def kline(tf, t, c, closed=False):
+    return {'type': 'kline', 'symbol': 'TEST/USDT', 'tf': tf, 't': t,
+            'o': c, 'h': c + 1, 'l': c - 1, 'c': c, 'v': 10.0, 'tb': 6.0, 'closed': closed}
+
+def price(p):
+    return {'type': 'price', 'symbol': 'TEST/USDT', 'price': p, 'ts': 0}
+
+def test_hub_fans_out_replay_events():
+    events = [price(100.0), kline('1m', 0, 100.0), price(101.0), price(102.0), kline('1m', 60000, 102.0, True)]
+
+    async def run():
+        hub = MarketDataHub(ReplaySource(events), price_interval=3600)
+        monitor_q = hub.subscribe(kinds={'price'}, throttled=False)
+        client_q = hub.subscribe()
+        await hub.run()  # 재생 소스는 끝나면 종료
+        drain = lambda q: [q.get_nowait() for _ in range(q.qsize())]
+        return hub, drain(monitor_q), drain(client_q)
+
+    hub, monitor_events, client_events = asyncio.run(run())
+    assert [e['price'] for e in monitor_events] == [100.0, 101.0, 102.0]
+    # 클라이언트는 시세가 price_interval로 제한되고 kline은 모두 수신
+    assert [e['type'] for e in client_events] == ['price', 'kline', 'kline']
+    assert hub.last_price == 102.0
+    assert hub.last_klines['1m']['t'] == 60000
+
+def test_hub_reconnects_after_source_error():
+    class FlakySource:
+        live = True
+        attempts = 0
+
+        async def stream(self):
+            FlakySource.attempts += 1
+            if FlakySource.attempts == 1:
+                raise ConnectionError("boom")
+            yield price(1.0)
+            self.live = False
+
+    async def run():
+        hub = MarketDataHub(FlakySource(), max_backoff=0.01)
+        hub_q = hub.subscribe(throttled=False)
+        await asyncio.wait_for(hub.run(), timeout=5)
+        return hub_q.get_nowait()
+
+    assert asyncio.run(run())['price'] == 1.0
+    assert FlakySource.attempts == 2
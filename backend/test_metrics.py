@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from core.metrics import counter, histogram, register_collector, render, timed, unregister_collector
+
+def test_histogram_renders_cumulative_buckets():
+    h = histogram("test_latency_seconds", "테스트 지연", ("endpoint",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 3.0):
+        h.observe(v, "klines")
+    c = counter("test_errors_total", "테스트 실패", ("endpoint",))
+    c.inc("klines")
+    c.inc("klines", amount=2)
+    text = render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{endpoint="klines",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{endpoint="klines",le="1.0"} 3' in text
+    assert 'test_latency_seconds_bucket{endpoint="klines",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{endpoint="klines"} 4' in text
+    assert 'test_errors_total{endpoint="klines"} 3' in text
+    # 같은 이름으로 다시 만들면 같은 객체
+    assert histogram("test_latency_seconds", "테스트 지연", ("endpoint",)) is h
+
+def test_timed_records_sync_and_async_calls_including_errors():
+    h = histogram("test_timed_seconds", "테스트", ("fn",))
+
+    @timed(h, "sync")
+    def work(x):
+        if x < 0: raise ValueError(x)
+        return x * 2
+
+    @timed(h, "async")
+    async def async_work(x):
+        await asyncio.sleep(0)
+        return x + 1
+
+    assert work(2) == 4
+    try:
+        work(-1)
+    except ValueError:
+        pass
+    assert asyncio.run(async_work(1)) == 2
+    assert h.count("sync") == 2 and h.count("async") == 1
+
+@pytest.fixture
+def collectors():
+    registered = []
+    yield lambda fn: registered.append(register_collector(fn))
+    for fn in registered:
+        unregister_collector(fn)
+
+def test_collector_values_and_failures(collectors):
+    collectors(lambda: [("test_queue_depth", "gauge", "테스트 대기열", ("stream",), {("chat",): 3, ("market",): None})])
+
+    def broken():
+        raise RuntimeError("down")
+    collectors(broken)
+    text = render()
+    assert 'test_queue_depth{stream="chat"} 3' in text
+    assert 'test_queue_depth{stream="market"}' not in text  # 값이 없는 항목은 생략
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+
+import core.database as database
+from core.cache import SQLiteCacheStore, TTLCache
+from core.leader import LeaderElection
+
+class Clock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+def test_shared_cache_values_and_invalidation_reach_other_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'shared.db'))
+    database.init_db()
+    clock = Clock()
+    # 같은 이름의 캐시를 가진 두 워커
+    leader = TTLCache("stats", ttl=60, clock=clock, store=SQLiteCacheStore(), sync_interval=1.0)
+    follower = TTLCache("stats", ttl=60, clock=clock, store=SQLiteCacheStore(), sync_interval=1.0)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"wins": 1}
+
+    assert leader.get_or_load(None, load) == {"wins": 1}
+    assert follower.get_or_load(None, load) == {"wins": 1}
+    assert len(loads) == 1
+    # 리더가 값을 바꾸면 동기화 주기 뒤 팔로워도 새 값을 봄
+    leader.set(None, {"wins": 2})
+    assert follower.get(None) == {"wins": 1}
+    clock.now += 1
+    assert follower.get(None) == {"wins": 2}
+    # 무효화도 공유
+    leader.invalidate()
+    clock.now += 1
+    assert follower.get(None) is None
+
+class RecordingStore(SQLiteCacheStore):
+    """저장소 호출 시점의 스레드와 캐시 잠금 보유 여부 기록"""
+
+    def __init__(self, cache_ref):
+        self.cache_ref = cache_ref
+        self.calls = []
+
+    def _record(self, op):
+        self.calls.append((op, threading.current_thread() is threading.main_thread(), self.cache_ref[0]._lock._is_owned()))
+
+    def get(self, name, key):
+        self._record("get")
+        return super().get(name, key)
+
+    def put(self, name, key, value, fresh_until, stale_until):
+        self._record("put")
+        super().put(name, key, value, fresh_until, stale_until)
+
+    def delete(self, name, key=None):
+        self._record("delete")
+        super().delete(name, key)
+
+def test_async_shared_cache_io_runs_off_loop_and_outside_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'async.db'))
+    database.init_db()
+    ref = [None]
+    store = RecordingStore(ref)
+    cache = ref[0] = TTLCache("trades", ttl=60, store=store, sync_interval=0.0)
+
+    async def load():
+        return {"wins": 3}
+
+    async def run():
+        assert await cache.aget_or_load(None, load) == {"wins": 3}
+        assert await cache.aget_or_load(None, load) == {"wins": 3}
+        await cache.ainvalidate()
+
+    asyncio.run(run())
+    assert [op for op, _, _ in store.calls] == ["get", "put", "get", "delete"]
+    # 이벤트 루프(메인 스레드)에서도, 캐시 잠금을 쥔 채로도 저장소를 건드리지 않음
+    assert not any(on_loop or locked for _, on_loop, locked in store.calls)
+
+def test_only_one_worker_runs_background_tasks(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'lease.db'))
+    database.init_db()
+    clock = Clock()
+    running = []
+
+    def worker(name):
+        async def elected(): running.append(name)
+        async def demoted(): running.remove(name)
+        return LeaderElection("background", elected, demoted, ttl=15, owner=name, clock=clock)
+
+    async def run():
+        a, b = worker("a"), worker("b")
+        assert await a.step() and not await b.step()
+        clock.now += 10
+        assert await a.step() and not await b.step()  # 리더가 연장 중이면 그대로
+        # 리더가 멈추고 ttl이 지나면 다른 워커가 넘겨받음
+        clock.now += 16
+        assert await b.step()
+        assert not await a.step()
+        assert running == ["b"]
+        # 정상 종료 시 리스를 반납해 바로 넘겨받을 수 있음
+        await b.stop()
+        assert await a.step() and running == ["a"]
+
+    asyncio.run(run())
+
+def test_strategy_signals_are_applied_only_by_the_leader(tmp_path, monkeypatch):
+    import main
+    from core.order_book import VirtualOrderBook
+    from core.repository import TradeRepository
+
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'signals.db'))
+    database.init_db()
+    symbol = 'BTC/USDT'
+    # 같은 DB를 쓰는 두 워커: 각자 주문장과 리더 여부를 가짐
+    workers = {
+        "leader": ({symbol: VirtualOrderBook(symbol)}, type("Lease", (), {"is_leader": True})()),
+        "follower": ({symbol: VirtualOrderBook(symbol)}, type("Lease", (), {"is_leader": False})()),
+    }
+    monkeypatch.setattr(main, '_applied_strategy_ids', {})
+
+    def on(name):
+        books, lease = workers[name]
+        monkeypatch.setattr(main, 'order_books', books)
+        monkeypatch.setattr(main, 'leader', lease)
+        return books[symbol]
+
+    def report(side, entry):
+        text = f'SIGNAL_JSON: ```json {{"side": "{side}", "entry": {entry}, "tp": {entry + 10}, "sl": {entry - 5}}} ```'
+        return {"price": entry, "strategy": text, "generated_at": "2026-01-01 00:00:00",
+                "funding_rate": 0.0, "open_interest": 0.0}
+
+    async def run():
+        book = on("leader")
+        await main.start_background()
+        await main.stop_background()
+        # 팔로워에서 생성된 전략은 저장만 되고 주문은 만들지 않음
+        on("follower")
+        assert (await main.save_strategy(report("LONG", 100.0), "en", symbol))["side"] == "LONG"
+        assert TradeRepository.get_status_counts(symbol) == {}
+        # 리더가 새 전략을 읽어 자신의 주문장에 반영 → 트리거 인덱스도 알고 있음
+        on("leader")
+        assert main.apply_strategy_signals(symbol) == 1
+        assert TradeRepository.get_status_counts(symbol) == {'PENDING': 1}
+        assert [status for _, status, _ in book.on_price(99.0)] == ['OPEN']
+        # 포지션이 열려 있으면 팔로워의 새 신호로 PENDING을 만들지 않음
+        on("follower")
+        await main.save_strategy(report("SHORT", 120.0), "ko", symbol)
+        on("leader")
+        assert main.apply_strategy_signals(symbol) == 1
+        counts = TradeRepository.get_status_counts(symbol)
+        assert counts['OPEN'] == 1 and not counts.get('PENDING')
+        assert main.apply_strategy_signals(symbol) == 0  # 이미 반영한 전략은 다시 반영하지 않음
+
+    monkeypatch.setattr(main, 'SCHEDULER_ENABLED', False)
+    asyncio.run(run())
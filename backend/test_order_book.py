@@ -0,0 +1,67 @@
+import random
+
+import core.database as database
+from core.order_book import VirtualOrderBook, _resolve
+from core.repository import TradeRepository
+
+def reference_tick(trades, price):
+    """기존 monitor_trades의 선형 검사 (PENDING 먼저, 이후 OPEN)"""
+    for t in trades:
+        if t['status'] == 'PENDING' and _resolve(t, price):
+            t['status'] = 'OPEN'
+    for t in trades:
+        if t['status'] == 'OPEN':
+            status = _resolve(t, price)
+            if status: t['status'], t['close_price'] = status, price
+
+def test_order_book_matches_linear_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'test.db'))
+    database.init_db()
+    rng = random.Random(3)
+
+    book = VirtualOrderBook()
+    book.load()
+    expected = []
+    for _ in range(300):
+        side, entry = rng.choice(['LONG', 'SHORT']), rng.uniform(90, 110)
+        tp, sl = (entry + rng.uniform(1, 8), entry - rng.uniform(1, 8)) if side == 'LONG' else \
+                 (entry - rng.uniform(1, 8), entry + rng.uniform(1, 8))
+        with database.get_db() as conn:
+            trade_id = conn.execute(
+                "INSERT INTO virtual_trades (side, entry, tp, sl, status) VALUES (?, ?, ?, ?, 'PENDING')",
+                (side, entry, tp, sl)
+            ).lastrowid
+            conn.commit()
+        expected.append({'id': trade_id, 'side': side, 'entry': entry, 'tp': tp, 'sl': sl, 'status': 'PENDING'})
+    book.load()
+
+    price = 100.0
+    for _ in range(2000):
+        price += rng.gauss(0, 0.8)
+        book.on_price(price)
+        reference_tick(expected, price)
+
+    with database.get_db() as conn:
+        rows = {r['id']: dict(r) for r in conn.execute("SELECT id, status, close_price FROM virtual_trades")}
+    for t in expected:
+        assert rows[t['id']]['status'] == t['status']
+        assert rows[t['id']]['close_price'] == t.get('close_price')
+
+def test_upsert_and_delete_pending(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'test.db'))
+    database.init_db()
+    book = VirtualOrderBook()
+    book.load()
+
+    first = book.upsert_pending('LONG', 100.0, 110.0, 95.0)
+    assert book.upsert_pending('SHORT', 105.0, 95.0, 110.0) == first
+    assert book.on_price(101.0) == []          # 갱신된 SHORT 진입가(105) 미도달
+    assert book.on_price(105.0) == [(first, 'OPEN', None)]
+    assert book.has_open()
+    assert book.on_price(94.0) == [(first, 'WIN', 94.0)]
+    assert TradeRepository.get_stats() == (1, 0, 100.0)
+
+    book.upsert_pending('LONG', 90.0, 99.0, 85.0)
+    book.delete_pending()
+    assert book.on_price(80.0) == []
+    assert TradeRepository.get_current_status() == "IDLE"
@@ -0,0 +1,46 @@
+import pytest
+
+import core.database as database
+from core.rate_limit import MemoryBucketStore, RateLimiter, RateLimitPolicy, SQLiteBucketStore
+
+class Clock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+def test_fractional_refill_is_not_lost_between_calls():
+    clock = Clock()
+    limiter = RateLimiter("chat_send", RateLimitPolicy(1, 10), MemoryBucketStore(clock=clock))
+    assert limiter.check("1.2.3.4") == 0
+    # 6초 + 6초: 정수 단위로 버리면 두 번 모두 0개 충전
+    clock.now += 6
+    assert limiter.check("1.2.3.4") == pytest.approx(4)
+    clock.now += 6
+    assert limiter.check("1.2.3.4") == 0
+
+def test_idle_keys_expire_and_memory_is_capped():
+    clock = Clock()
+    store = MemoryBucketStore(shards=4, max_keys=400, clock=clock)
+    limiter = RateLimiter("chat_send", RateLimitPolicy(5, 10), store)
+    for i in range(300):
+        limiter.check(f"10.0.{i // 256}.{i % 256}")
+    assert store.size() == 300
+    clock.now += 50  # idle_ttl(5*10초) 경과 → 가득 찬 버킷과 같으므로 삭제
+    for i in range(4):
+        limiter.check(f"fresh-{i}")
+    assert store.size() < 300 and store.expired > 0
+    for i in range(10_000):
+        limiter.check(f"churn-{i}")
+    assert store.size() <= 400 and store.evicted > 0
+
+def test_sqlite_store_shares_buckets_between_limiters(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'rate.db'))
+    database.init_db()
+    clock = Clock()
+    policy = RateLimitPolicy(2, 10)
+    # 서로 다른 워커의 limiter라도 같은 DB 버킷을 사용
+    a = RateLimiter("chat_send", policy, SQLiteBucketStore(clock=clock))
+    b = RateLimiter("chat_send", policy, SQLiteBucketStore(clock=clock))
+    assert a.check("ip") == 0 and b.check("ip") == 0
+    assert a.check("ip") == pytest.approx(10)
+    clock.now += 5
+    assert b.check("ip") == pytest.approx(5)
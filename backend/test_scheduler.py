@@ -0,0 +1,50 @@
+import asyncio
+
+from core.scheduler import Job, PrecomputeScheduler
+
+def test_job_retries_with_backoff_then_resumes_interval():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("upstream down")
+
+    async def run():
+        scheduler = PrecomputeScheduler()
+        job = scheduler.add(Job("flaky", flaky, interval=3600, retry_base=0.01, retry_max=0.05))
+        scheduler.start()
+        for _ in range(200):
+            if job.runs >= 3: break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert len(calls) == 3
+    assert job.failures == 2 and job.consecutive_failures == 0
+    assert job.last_error is None and job.status()["last_success"]
+    assert job.next_delay() >= 3600
+
+def test_due_in_defers_first_run_until_woken():
+    calls = []
+
+    async def refresh():
+        calls.append(1)
+
+    async def run():
+        scheduler = PrecomputeScheduler()
+        scheduler.add(Job("strategy", refresh, interval=3600, due_in=lambda: 3000))
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        before = len(calls)
+        scheduler.run_now("strategy")
+        for _ in range(100):
+            if calls: break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+        return before, scheduler.status()["strategy"]
+
+    before, status = asyncio.run(run())
+    assert before == 0 and len(calls) == 1
+    assert status["runs"] == 1 and status["next_run"] is not None
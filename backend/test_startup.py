@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+
+# 워커 콜드 스타트 예산 (초, 느린 CI에서는 QUANT_IMPORT_BUDGET으로 조정)
+IMPORT_BUDGET = float(os.getenv("QUANT_IMPORT_BUDGET", "1.5"))
+DEFERRED = ('ccxt', 'google.genai', 'feedparser', 'pandas_ta')
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {DEFERRED!r} if m in sys.modules]}}))
+"""
+
+def import_main():
+    env = dict(os.environ, GEMINI_API_KEY=os.getenv("GEMINI_API_KEY", "test"))
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, env=env,
+                         cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def test_import_main_defers_heavy_dependencies_within_budget():
+    runs = [import_main() for _ in range(2)]
+    assert runs[0]["loaded"] == []
+    assert min(r["seconds"] for r in runs) < IMPORT_BUDGET
+
+def test_ready_reports_503_until_warm_up_finishes():
+    import main
+
+    assert main.ready().status_code == 503
+    main.readiness.update(started=True, warmed_up=True)
+    try:
+        assert main.ready().status_code == 200
+    finally:
+        main.readiness.update(started=False, warmed_up=False)
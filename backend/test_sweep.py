@@ -0,0 +1,26 @@
+import numpy as np
+
+from core.sweep import SharedCandles, expand_grid, prepare_candles, run_sweep
+
+def test_shared_candles_round_trip_without_copy(make_candles):
+    df = prepare_candles(make_candles(400))
+    shared = SharedCandles(df)
+    try:
+        shm, view = SharedCandles.attach(shared.spec)
+        assert view.index.equals(df.index)
+        np.testing.assert_array_equal(view.to_numpy(), df.to_numpy())
+        assert np.shares_memory(view['close'].to_numpy(), np.ndarray(shared.spec[1], buffer=shm.buf))
+        shm.close()
+    finally:
+        shared.close()
+
+def test_pool_and_serial_sweeps_agree(make_candles):
+    candles = make_candles(900)
+    grid = {"sweep_window": [20, 30], "sl_atr": [1.0, 2.0]}
+    assert len(expand_grid(grid)) == 4 and expand_grid(grid)[0]["vp_bins"] == 50
+    serial = run_sweep(candles, grid, step=6, workers=1, min_trades=1)
+    pooled = run_sweep(candles, grid, step=6, workers=2, min_trades=1)
+    assert serial.equals(pooled)
+    assert serial['signals'].sum() > 0
+    eligible = serial[serial['eligible']]
+    assert eligible['total_return_pct'].is_monotonic_decreasing
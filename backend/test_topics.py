@@ -0,0 +1,40 @@
+import asyncio
+
+from core.topics import TopicHub, etag_of
+
+def test_publish_bumps_version_only_on_change():
+    hub = TopicHub(loader=None)
+    assert hub.publish("news:en", [{"title": "a"}])
+    assert not hub.publish("news:en", [{"title": "a"}])
+    assert hub.publish("news:en", [{"title": "b"}])
+    snapshot = hub.current("news:en")
+    assert snapshot["version"] == 2 and snapshot["etag"] == etag_of([{"title": "b"}])
+    # 키 순서가 달라도 같은 내용이면 같은 ETag
+    assert etag_of({"a": 1, "b": 2}) == etag_of({"b": 2, "a": 1})
+
+def test_subscribers_receive_only_their_topics_on_change():
+    values = {"fear_greed": {"value": "50"}, "trades": {"wins": 1}}
+
+    async def loader(topic):
+        return values[topic]
+
+    async def run():
+        hub = TopicHub(loader)
+        fng, both = hub.subscribe(["fear_greed"]), hub.subscribe(["fear_greed", "trades"])
+        await hub.refresh_all()
+        await hub.refresh_all()  # 변경 없음 → 전송 없음
+        values["trades"] = {"wins": 2}
+        await hub.refresh_all()
+        drain = lambda q: [(s["topic"], s["version"]) for s in iter(lambda: None if q.empty() else q.get_nowait(), None)]
+        return drain(fng), sorted(drain(both))
+
+    fng, both = asyncio.run(run())
+    assert fng == [("fear_greed", 1)]
+    assert both == [("fear_greed", 1), ("trades", 1), ("trades", 2)]
+
+def test_unsubscribed_topics_expire_after_idle_ttl():
+    hub = TopicHub(loader=None, idle_ttl=0.0)
+    q = hub.subscribe(["brief:ko"])
+    assert hub.active_topics() == {"brief:ko"}
+    hub.unsubscribe(q)
+    assert hub.active_topics() == set()
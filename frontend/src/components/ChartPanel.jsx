@@ -2,6 +2,7 @@ import { useEffect, useRef, useState } from 'react'
 import { createChart } from 'lightweight-charts'
 import styles from './ChartPanel.module.css'
 import { useLanguage } from '../contexts/LanguageContext'
+import { API, CONFIG } from '../config'
 
 const COLORS = {
     bg: '#0d1117',
@@ -201,19 +202,19 @@ export function ChartPanel() {
         }
 
         function connectWs() {
-            if (wsRef.current) { wsRef.current.onclose = null; wsRef.current.close() }
-            const wsUrl = `wss://fstream.binance.com/ws/btcusdt@kline_${timeframe}`
-            wsRef.current = new WebSocket(wsUrl)
+            if (wsRef.current) wsRef.current.close()
+            // 백엔드 공유 시세 허브(SSE) 구독 - 브라우저별 거래소 웹소켓 연결 없음
+            wsRef.current = new EventSource(`${API.MARKET_STREAM}?tf=${timeframe}`)
 
             wsRef.current.onopen = () => {
                 dispatchWsStatus(`${t('chart.live')} (${timeframe})`, true)
                 if (timerRef.current) { clearTimeout(timerRef.current); timerRef.current = null }
             }
 
-            wsRef.current.onmessage = (event) => {
+            wsRef.current.addEventListener('kline', (event) => {
                 try {
-                    const msg = JSON.parse(event.data); const k = msg.k; const t = toSec(k.t)
-                    const open = parseFloat(k.o); const high = parseFloat(k.h); const low = parseFloat(k.l); const close = parseFloat(k.c); const vol = parseFloat(k.v)
+                    const k = JSON.parse(event.data); const t = toSec(k.t)
+                    const open = k.o; const high = k.h; const low = k.l; const close = k.c; const vol = k.v
                     const candles = candlesRef.current
                     if (candles.length > 0 && t < candles[candles.length - 1].time) return
 
@@ -230,11 +231,12 @@ export function ChartPanel() {
                     setOhlcv({ o: formatPrice(open), h: formatPrice(high), l: formatPrice(low), c: formatPrice(close), v: formatVol(vol) })
                     setLastUpdate(new Date().toTimeString().slice(0, 8))
                 } catch (err) { }
-            }
+            })
 
-            wsRef.current.onclose = () => {
+            wsRef.current.onerror = () => {
                 dispatchWsStatus(t('chart.connecting'), false)
-                timerRef.current = setTimeout(connectWs, 5000)
+                wsRef.current.close()
+                timerRef.current = setTimeout(connectWs, CONFIG.SSE_RETRY_INTERVAL)
             }
         }
 
@@ -264,7 +266,7 @@ export function ChartPanel() {
             .catch(() => dispatchWsStatus(t('chart.fail'), false))
 
         return () => {
-            if (wsRef.current) { wsRef.current.onclose = null; wsRef.current.close() }
+            if (wsRef.current) wsRef.current.close()
             if (timerRef.current) clearTimeout(timerRef.current)
         }
     }, [timeframe, lang, t])
@@ -1,23 +1,15 @@
 import { useState, useEffect } from 'react'
 import styles from './MarketWidgets.module.css'
-import { API } from '../config'
+import { CONFIG } from '../config'
 import { useLanguage } from '../contexts/LanguageContext'
+import { useTopic } from '../hooks/useTopic'
 
 // 1. SentimentPanel
 export function SentimentPanel() {
-    const { t, lang } = useLanguage()
-    const [data, setData] = useState(null)
-    const [loading, setLoading] = useState(true)
-
-    useEffect(() => {
-        setLoading(true)
-        fetch(`${API.SENTIMENT}?lang=${lang}`)
-            .then(res => res.json())
-            .then(d => { setData(d); setLoading(false); })
-            .catch(() => setLoading(false))
-    }, [lang])
+    const { t } = useLanguage()
+    const data = useTopic(`sentiment:${CONFIG.SYMBOL}`)
 
-    if (loading || !data) return <div className={styles.loading}>{t('common.loading')}</div>
+    if (!data) return <div className={styles.loading}>{t('common.loading')}</div>
 
     return (
         <div className={styles.sentimentContainer}>
@@ -45,19 +37,10 @@ export function SentimentPanel() {
 
 // 2. FearGreed
 export function FearGreed() {
-    const { t, lang } = useLanguage()
-    const [data, setData] = useState(null)
-    const [loading, setLoading] = useState(true)
-
-    useEffect(() => {
-        setLoading(true)
-        fetch(`${API.FEAR_GREED}?lang=${lang}`)
-            .then(res => res.json())
-            .then(d => { setData(d); setLoading(false); })
-            .catch(() => setLoading(false))
-    }, [lang])
+    const { t } = useLanguage()
+    const data = useTopic('fear_greed')
 
-    if (loading || !data) return <div className={styles.loading}>{t('common.loading')}</div>
+    if (!data) return <div className={styles.loading}>{t('common.loading')}</div>
 
     const value = parseInt(data.value);
     const classification = t(`fearGreed.${data.value_classification.replace(/\s+/g, '')}`) || data.value_classification;
@@ -106,18 +89,9 @@ export function FearGreed() {
 // 3. EventCalendar
 export function EventCalendar() {
     const { t, lang } = useLanguage()
-    const [events, setEvents] = useState([])
-    const [loading, setLoading] = useState(true)
-
-    useEffect(() => {
-        setLoading(true)
-        fetch(`${API.EVENTS}?lang=${lang}`)
-            .then(res => res.json())
-            .then(d => { setEvents(d); setLoading(false); })
-            .catch(() => setLoading(false))
-    }, [lang])
+    const events = useTopic(`events:${lang}`)
 
-    if (loading) return <div className={styles.loading}>{t('common.loading')}</div>
+    if (!events) return <div className={styles.loading}>{t('common.loading')}</div>
 
     return (
         <div className={styles.calendarContainer}>
@@ -141,23 +115,11 @@ export function EventCalendar() {
 // 4. DailyBriefing
 export function DailyBriefing() {
     const { t, lang } = useLanguage()
-    const [briefs, setBriefs] = useState([])
-    const [loading, setLoading] = useState(true)
+    const data = useTopic(`brief:${lang}`)
+    // 백엔드에서 배열로 오는지 확인 후 사용
+    const briefs = Array.isArray(data) ? data : (data?.briefs || [])
 
-    useEffect(() => {
-        setLoading(true)
-        fetch(`${API.DAILY_BRIEF}?lang=${lang}`)
-            .then(res => res.json())
-            .then(d => {
-                // 백엔드에서 배열로 오는지 확인 후 저장
-                if (Array.isArray(d)) setBriefs(d);
-                else if (d.briefs) setBriefs(d.briefs);
-                setLoading(false);
-            })
-            .catch(() => setLoading(false))
-    }, [lang])
-
-    if (loading) return (
+    if (!data) return (
         <div className={styles.briefingContainer}>
             <div className={styles.briefingHeader}>{t('briefing.title')}</div>
             <div className={styles.loading}>{t('briefing.loading')}</div>
@@ -1,23 +1,10 @@
-import { useState, useEffect } from 'react'
 import styles from './NewsTicker.module.css'
-import { API } from '../config'
 import { useLanguage } from '../contexts/LanguageContext'
+import { useTopic } from '../hooks/useTopic'
 
 export function NewsTicker() {
     const { lang } = useLanguage()
-    const [news, setNews] = useState([])
-
-    useEffect(() => {
-        const fetchNews = () => {
-            fetch(`${API.NEWS}?lang=${lang}`)
-                .then(res => res.json())
-                .then(data => setNews(data))
-                .catch(() => { })
-        }
-        fetchNews()
-        const timer = setInterval(fetchNews, 60000)
-        return () => clearInterval(timer)
-    }, [lang])
+    const news = useTopic(`news:${lang}`) || []
 
     if (news.length === 0) return null
 
@@ -1,25 +1,12 @@
-import { useState, useEffect } from 'react'
 import styles from './TradePerformance.module.css'
-import { API } from '../config'
 import { useLanguage } from '../contexts/LanguageContext'
+import { useTopic } from '../hooks/useTopic'
 
 export function TradePerformance() {
-    const { t, lang } = useLanguage()
-    const [stats, setStats] = useState(null)
-    const [loading, setLoading] = useState(true)
+    const { t } = useLanguage()
+    const stats = useTopic('trades')
 
-    useEffect(() => {
-        setLoading(true)
-        fetch(`${API.TRADES_STATS}?lang=${lang}`)
-            .then(res => res.json())
-            .then(d => {
-                setStats(d)
-                setLoading(false)
-            })
-            .catch(() => setLoading(false))
-    }, [lang])
-
-    if (loading || !stats) return <div className={styles.loading}>{t('performance.loading')}</div>
+    if (!stats) return <div className={styles.loading}>{t('performance.loading')}</div>
 
     return (
         <div className={styles.container}>
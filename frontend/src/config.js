@@ -11,10 +11,13 @@ const BASE_URL = IS_PROD
 export const API = {
     BASE_URL,
     STRATEGY: `${BASE_URL}/api/strategy`,
+    STRATEGY_STREAM: `${BASE_URL}/api/strategy/stream`,
     FEAR_GREED: `${BASE_URL}/api/fear_greed`,
     CHAT_MESSAGES: `${BASE_URL}/api/chat/messages`,
     CHAT_SEND: `${BASE_URL}/api/chat/send`,
     CHAT_STREAM: `${BASE_URL}/api/chat/stream`,
+    MARKET_STREAM: `${BASE_URL}/api/market/stream`,
+    TOPICS_STREAM: `${BASE_URL}/api/topics/stream`,
     NEWS: `${BASE_URL}/api/news`,
     DAILY_BRIEF: `${BASE_URL}/api/daily_brief`,
     SENTIMENT: `${BASE_URL}/api/sentiment`,
@@ -27,5 +30,6 @@ export const CONFIG = {
     REFRESH_INTERVAL: 1000 * 60 * 15, // 15분 (차트 갱신 주기)
     RETRY_DELAY: 3000, // 3초 (재요청 대기 시간)
     CHAT_POLLING_INTERVAL: 1000, // (SSE 적용 전 임시 사용)
-    SSE_RETRY_INTERVAL: 5000 // SSE 연결 재시도 간격 (5초)
+    SSE_RETRY_INTERVAL: 5000, // SSE 연결 재시도 간격 (5초)
+    SYMBOL: 'BTC/USDT' // 기본 심볼 (토픽 이름에 사용)
 };
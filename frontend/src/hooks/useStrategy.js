@@ -1,20 +1,54 @@
-import { useState, useEffect, useCallback } from 'react'
-import { API } from '../config'
+import { useState, useEffect, useCallback, useRef } from 'react'
+import { API, CONFIG } from '../config'
+import { useTopic } from './useTopic'
 
 export function useStrategy(lang = 'ko') {
     const [state, setState] = useState({ data: null, loading: true, error: null })
+    const streamRef = useRef(null)
+    const latest = useTopic(`strategy:${CONFIG.SYMBOL}:${lang}`)
+
     const fetchStrategy = useCallback(async () => {
-        setState(s => ({ ...s, loading: true, error: null }))
         try {
             const res = await fetch(`${API.STRATEGY}?lang=${lang}`)
             if (!res.ok) throw new Error(`${res.status}`)
             setState({ data: await res.json(), loading: false, error: null })
         } catch (e) { setState(s => ({ ...s, loading: false, error: e.message })) }
     }, [lang])
+
+    // 리포트를 생성되는 대로 받아 표시 (chunk → signal → done), 실패 시 일반 조회로 대체
+    const streamStrategy = useCallback(() => {
+        if (streamRef.current) streamRef.current.close()
+        setState(s => ({ ...s, loading: true, error: null }))
+        const es = new EventSource(`${API.STRATEGY_STREAM}?lang=${lang}`)
+        streamRef.current = es
+        let text = ''
+        es.addEventListener('chunk', (e) => {
+            text += JSON.parse(e.data).text
+            setState(s => ({ data: { ...(s.data || {}), strategy: text }, loading: false, error: null }))
+        })
+        es.addEventListener('done', (e) => {
+            es.close()
+            streamRef.current = null
+            setState({ data: JSON.parse(e.data), loading: false, error: null })
+        })
+        es.addEventListener('error', () => {
+            es.close()
+            streamRef.current = null
+            fetchStrategy()
+        })
+    }, [lang, fetchStrategy])
+
+    useEffect(() => {
+        streamStrategy();
+        return () => {
+            if (streamRef.current) streamRef.current.close();
+            streamRef.current = null;
+        };
+    }, [streamStrategy]);
+
+    // 이후 새로 생성된 전략은 토픽 스트림으로 수신 (스트리밍 중에는 무시)
     useEffect(() => {
-        fetchStrategy();
-        const interval = setInterval(fetchStrategy, 60000); // 1분마다 폴링
-        return () => clearInterval(interval);
-    }, [fetchStrategy]);
-    return { ...state, refetch: fetchStrategy }
+        if (latest && !streamRef.current) setState({ data: latest, loading: false, error: null })
+    }, [latest]);
+    return { ...state, refetch: streamStrategy }
 }
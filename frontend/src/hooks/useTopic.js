@@ -0,0 +1,58 @@
+import { useState, useEffect } from 'react'
+import { API, CONFIG } from '../config'
+
+// 모든 위젯이 하나의 토픽 SSE 연결을 공유합니다.
+// 서버는 구독한 토픽의 현재 스냅샷을 먼저 보내고, 이후에는 내용이 바뀐 토픽만 보냅니다.
+const listeners = new Map() // 토픽 → 구독 콜백 Set
+const latest = new Map() // 토픽 → 마지막 스냅샷 {version, etag, data}
+let source = null
+let connectTimer = null
+
+function connect() {
+    connectTimer = null
+    if (source) { source.close(); source = null }
+    if (listeners.size === 0) return
+    const topics = [...listeners.keys()].sort().join(',')
+    source = new EventSource(`${API.TOPICS_STREAM}?topics=${encodeURIComponent(topics)}`)
+    source.addEventListener('update', (e) => {
+        const snapshot = JSON.parse(e.data)
+        const prev = latest.get(snapshot.topic)
+        if (prev && prev.etag === snapshot.etag) return
+        latest.set(snapshot.topic, snapshot)
+        listeners.get(snapshot.topic)?.forEach(cb => cb(snapshot.data))
+    })
+    source.onerror = () => {
+        source.close()
+        source = null
+        scheduleConnect(CONFIG.SSE_RETRY_INTERVAL)
+    }
+}
+
+// 같은 렌더링에서 일어난 구독 변경은 한 번의 재연결로 묶음
+function scheduleConnect(delay = 0) {
+    if (connectTimer) return
+    connectTimer = setTimeout(connect, delay)
+}
+
+export function useTopic(topic) {
+    const [data, setData] = useState(() => latest.get(topic)?.data ?? null)
+
+    useEffect(() => {
+        setData(latest.get(topic)?.data ?? null)
+        if (!listeners.has(topic)) {
+            listeners.set(topic, new Set())
+            scheduleConnect()
+        }
+        const callbacks = listeners.get(topic)
+        callbacks.add(setData)
+        return () => {
+            callbacks.delete(setData)
+            if (callbacks.size === 0) {
+                listeners.delete(topic)
+                scheduleConnect()
+            }
+        }
+    }, [topic])
+
+    return data
+}